@@ -6,14 +6,49 @@ Permet de scanner, classifier et extraire des documents et pièces jointes
 __version__ = "1.0.0"
 __author__ = "AnalystHelper"
 
-from .core.scanner import FolderScanner
+from .core.scanner import FolderScanner, LazyFileInfo
 from .core.extractor import AttachmentExtractor
 from .core.classifier import FileClassifier
+from .core.journal import CopyJournal
 from .core.reporter import HTMLReporter
+from .core.manifest import ScanManifest, RescanResult
+from .core.duplicates import DuplicateFinder
+from .core.table import FileTable
+from .core.tree_index import DirectoryIndex
+from .core.file_index import FileIndex
+from .core.catalog import ScanCatalog
+from .core.shards import ScanShard
+from .core.estimator import ScanEstimate
+from .core.sniffer import ContentSniffer
+from .core.archives import ArchiveLister
+from .core.watcher import FolderWatcher, ChangeBatch
+from .core.profiler import ScanProfiler
+from .utils.filters import ScanFilter
+from .utils.ignore import IgnoreRules
+from .utils.names import NameRegistry
 
 __all__ = [
     'FolderScanner',
+    'LazyFileInfo',
     'AttachmentExtractor',
     'FileClassifier',
-    'HTMLReporter'
+    'CopyJournal',
+    'HTMLReporter',
+    'ScanManifest',
+    'RescanResult',
+    'DuplicateFinder',
+    'FileTable',
+    'DirectoryIndex',
+    'FileIndex',
+    'ScanCatalog',
+    'ScanShard',
+    'ScanEstimate',
+    'ContentSniffer',
+    'ArchiveLister',
+    'FolderWatcher',
+    'ChangeBatch',
+    'ScanProfiler',
+    'IgnoreRules',
+    'NameRegistry',
+    'ScanFilter'
 ]
@@ -0,0 +1,182 @@
+"""
+Module de listage du contenu des archives, sans extraction
+Lit le répertoire central des ZIP et les en-têtes des TAR
+"""
+
+import os
+import struct
+import tarfile
+import time
+import zipfile
+from typing import IO, Iterator, Optional, Tuple
+
+# Taille maximale (compressée) d'une archive imbriquée à ouvrir : au-delà,
+# atteindre son répertoire central obligerait à décompresser trop de données
+NESTED_MAX_BYTES = 64 * 1024 * 1024
+
+# Type de lecteur selon la fin du nom de fichier
+ARCHIVE_SUFFIXES = (
+    ('.tar.gz', 'tar-stream'),
+    ('.tgz', 'tar-stream'),
+    ('.tar', 'tar'),
+    ('.zip', 'zip'),
+    ('.gz', 'gzip'),
+)
+
+
+def archive_kind(name: str) -> Optional[str]:
+    """
+    Détermine le lecteur à utiliser pour une archive
+
+    Args:
+        name: Nom du fichier
+
+    Returns:
+        'zip', 'tar', 'tar-stream' (TAR compressé), 'gzip' ou None si non pris en charge
+    """
+    lowered = name.lower()
+    for suffix, kind in ARCHIVE_SUFFIXES:
+        if lowered.endswith(suffix):
+            return kind
+    return None
+
+
+def _zip_timestamp(date_time: Tuple[int, ...]) -> float:
+    try:
+        return time.mktime(date_time + (0, 0, -1))
+    except (OverflowError, ValueError):
+        return 0.0
+
+
+class ArchiveLister:
+    """Liste les membres des archives ZIP, TAR et GZIP sans décompresser leur contenu
+
+    ZIP : seul le répertoire central est lu. TAR : les en-têtes sont lus et les
+    contenus sautés par seek ; un TAR compressé (.tar.gz, .tgz) doit en revanche
+    être décompressé en flux pour atteindre les en-têtes (rien n'est écrit).
+    GZIP simple : le nom et la taille viennent de l'en-tête et de la fin du fichier.
+    """
+
+    def __init__(self, max_depth: int = 1, nested_max_bytes: int = NESTED_MAX_BYTES):
+        """
+        Initialise le lecteur
+
+        Args:
+            max_depth: Niveaux d'archives listés (1 = contenu des archives,
+                       2 = contenu des archives contenues, etc.)
+            nested_max_bytes: Taille maximale d'une archive imbriquée compressée
+        """
+        self.max_depth = max_depth
+        self.nested_max_bytes = nested_max_bytes
+
+    def iter_members(self, path: str) -> Iterator[Tuple[str, int, float]]:
+        """
+        Liste les fichiers d'une archive, y compris ceux des archives imbriquées
+
+        Args:
+            path: Chemin de l'archive
+
+        Returns:
+            Itérateur de tuples (chemin du membre avec '/', taille décompressée, mtime).
+            Les membres d'une archive imbriquée sont préfixés par le chemin de celle-ci.
+        """
+        kind = archive_kind(os.path.basename(path))
+        if kind is None:
+            return
+        with open(path, 'rb') as f:
+            yield from self._iter_fileobj(f, kind, os.path.basename(path), 1)
+
+    def _iter_fileobj(self, f: IO[bytes], kind: str, name: str,
+                      level: int) -> Iterator[Tuple[str, int, float]]:
+        """
+        Liste une archive ouverte
+
+        Args:
+            f: Fichier (ou membre d'archive) ouvert en binaire
+            kind: Type d'archive (voir archive_kind)
+            name: Nom de l'archive
+            level: Niveau d'imbrication (1 = archive sur disque)
+        """
+        if kind == 'zip':
+            yield from self._iter_zip(f, level)
+        elif kind in ('tar', 'tar-stream'):
+            yield from self._iter_tar(f, kind, level)
+        elif kind == 'gzip':
+            yield self._gzip_member(f, name)
+
+    def _iter_zip(self, f: IO[bytes], level: int):
+        with zipfile.ZipFile(f) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                yield info.filename, info.file_size, _zip_timestamp(info.date_time)
+
+                nested = self._nested_kind(info.filename, info.compress_size,
+                                           info.compress_type == zipfile.ZIP_STORED, level)
+                if nested:
+                    with archive.open(info) as member:
+                        yield from self._prefixed(info.filename, member, nested, level)
+
+    def _iter_tar(self, f: IO[bytes], kind: str, level: int):
+        mode = 'r|*' if kind == 'tar-stream' else 'r:'
+        with tarfile.open(fileobj=f, mode=mode) as archive:
+            for info in archive:
+                if not info.isfile():
+                    continue
+                yield info.name, info.size, float(info.mtime)
+
+                # En flux, un membre ne peut pas être relu : pas d'archive imbriquée
+                nested = kind == 'tar' and self._nested_kind(info.name, info.size, True, level)
+                if nested:
+                    member = archive.extractfile(info)
+                    if member is not None:
+                        yield from self._prefixed(info.name, member, nested, level)
+
+    def _gzip_member(self, f: IO[bytes], name: str) -> Tuple[str, int, float]:
+        """
+        Nom, taille et date du fichier unique d'un GZIP, sans décompression
+
+        Le nom d'origine (champ FNAME) et la date viennent de l'en-tête ; la
+        taille vient des 4 derniers octets (ISIZE, modulo 4 Gio).
+        """
+        header = f.read(10)
+        if len(header) < 10 or header[:2] != b'\x1f\x8b':
+            raise ValueError("en-tête GZIP invalide")
+        flags = header[3]
+        mtime, = struct.unpack_from('<I', header, 4)
+
+        member_name = name[:-3] if name.lower().endswith('.gz') else name
+        if flags & 0x04:                    # FEXTRA
+            extra_length, = struct.unpack('<H', f.read(2))
+            f.seek(extra_length, os.SEEK_CUR)
+        if flags & 0x08:                    # FNAME
+            raw = bytearray()
+            while len(raw) < 1024:
+                byte = f.read(1)
+                if byte in (b'', b'\x00'):
+                    break
+                raw += byte
+            member_name = os.path.basename(raw.decode('latin-1')) or member_name
+
+        f.seek(-4, os.SEEK_END)
+        size, = struct.unpack('<I', f.read(4))
+        return member_name, size, float(mtime)
+
+    def _nested_kind(self, member_name: str, compressed_size: int, seekable: bool,
+                     level: int) -> Optional[str]:
+        """Type d'une archive imbriquée à ouvrir, ou None si elle ne doit pas l'être"""
+        if level >= self.max_depth:
+            return None
+        kind = archive_kind(member_name)
+        if kind is None or (not seekable and compressed_size > self.nested_max_bytes):
+            return None
+        return kind
+
+    def _prefixed(self, prefix: str, member: IO[bytes], kind: str, level: int):
+        """Liste une archive imbriquée en préfixant ses membres par son chemin"""
+        try:
+            for name, size, mtime in self._iter_fileobj(member, kind, os.path.basename(prefix),
+                                                        level + 1):
+                yield f"{prefix}/{name}", size, mtime
+        except (OSError, EOFError, ValueError, zipfile.BadZipFile, tarfile.TarError) as e:
+            print(f"⚠️  Archive imbriquée illisible {prefix}: {e}")
@@ -0,0 +1,423 @@
+"""
+Module de catalogue SQLite des scans et des pièces jointes
+Insertion en masse, mode WAL et recherche plein texte (FTS5) sur noms, chemins et sujets
+"""
+
+import json
+import os
+import sqlite3
+import time
+from dataclasses import astuple, fields
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from .extractor import AttachmentInfo
+from .scanner import FileInfo, FileRecord
+
+SCHEMA_VERSION = 1
+
+# Colonnes de la table files : champs de FileRecord sans le chemin absolu,
+# reconstruit depuis la racine du scan
+FILE_COLUMNS = tuple(name for name in FileRecord.FIELDS if name != 'path')
+ATTACHMENT_COLUMNS = tuple(field.name for field in fields(AttachmentInfo))
+
+# Lignes lues par appel à fetchmany()
+FETCH_SIZE = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    root_path TEXT NOT NULL,
+    label TEXT,
+    created REAL NOT NULL,
+    file_count INTEGER NOT NULL DEFAULT 0,
+    stats TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    name TEXT NOT NULL,
+    relative_path TEXT NOT NULL,
+    extension TEXT,
+    size_bytes INTEGER,
+    created_ts REAL,
+    modified_ts REAL,
+    file_type TEXT,
+    depth INTEGER,
+    parent_folder TEXT,
+    is_email INTEGER,
+    email_source TEXT,
+    quick_hash TEXT,
+    content_hash TEXT,
+    content_type TEXT,
+    archive_path TEXT
+);
+CREATE INDEX IF NOT EXISTS files_scan ON files(scan_id);
+CREATE TABLE IF NOT EXISTS attachments (
+    id INTEGER PRIMARY KEY,
+    scan_id INTEGER REFERENCES scans(id),
+    original_filename TEXT,
+    saved_filename TEXT,
+    saved_path TEXT,
+    size_kb REAL,
+    email_source TEXT,
+    email_date TEXT,
+    email_subject TEXT,
+    extraction_date TEXT,
+    is_nested_email INTEGER
+);
+"""
+
+# Index plein texte à contenu externe : seul l'index est stocké, le texte reste dans files/attachments
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+    name, relative_path, content='files', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS attachments_fts USING fts5(
+    original_filename, email_subject, email_source, content='attachments', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+"""
+
+
+def fts_query(text: str) -> str:
+    """
+    Convertit une saisie libre en requête FTS5
+
+    Chaque mot est cherché tel quel (ponctuation comprise, ex: 'plan.dwg') ;
+    tous les mots sont requis et un '*' final cherche un préfixe.
+
+    Args:
+        text: Mots recherchés
+
+    Returns:
+        Requête FTS5
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+
+class ScanCatalog:
+    """Catalogue persistant des scans et des pièces jointes (SQLite)
+
+    Chaque enregistrement de scan est inséré en une seule transaction, par
+    executemany sur un flux de lignes : un iter_scan() peut être catalogué sans
+    être gardé en mémoire. La base est en mode WAL, donc lisible par d'autres
+    outils pendant l'écriture. Les noms et chemins des fichiers, ainsi que les
+    noms, sujets et sources des pièces jointes, sont indexés en plein texte (FTS5).
+    Si SQLite n'a pas été compilé avec FTS5, la recherche utilise LIKE.
+    """
+
+    def __init__(self, db_path: Union[str, os.PathLike]):
+        """
+        Ouvre (ou crée) un catalogue
+
+        Args:
+            db_path: Chemin de la base SQLite
+        """
+        self.db_path = str(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Cache de pages de 64 Mo : les index restent en mémoire pendant les insertions en masse
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.fts = self._create_schema()
+
+    def _create_schema(self) -> bool:
+        """
+        Crée les tables si nécessaire
+
+        Returns:
+            True si la recherche plein texte (FTS5) est disponible
+        """
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"Catalogue de version {version} non pris en charge: {self.db_path}")
+
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        try:
+            with self.conn:
+                self.conn.executescript(FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  FTS5 indisponible ({e}), recherche par LIKE")
+            return False
+
+    def add_scan(self, files: Iterable[FileRecord], root_path: Union[str, os.PathLike],
+                 stats: Optional[Dict] = None, label: Optional[str] = None) -> int:
+        """
+        Enregistre un scan
+
+        Args:
+            files: Fichiers (liste, FileTable ou flux, par exemple scanner.iter_scan())
+            root_path: Dossier racine du scan
+            stats: Statistiques du scan (enregistrées en JSON)
+            label: Libellé libre
+
+        Returns:
+            Identifiant du scan
+        """
+        conn = self.conn
+        values = attrgetter(*FILE_COLUMNS)
+
+        with conn:
+            scan_id = conn.execute(
+                "INSERT INTO scans (root_path, label, created) VALUES (?, ?, ?)",
+                (str(root_path), label, time.time())
+            ).lastrowid
+            first_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM files").fetchone()[0]
+
+            count = conn.executemany(
+                f"INSERT INTO files (scan_id, {', '.join(FILE_COLUMNS)}) "
+                f"VALUES (?{', ?' * len(FILE_COLUMNS)})",
+                ((scan_id,) + values(file) for file in files)
+            ).rowcount
+
+            if self.fts:
+                conn.execute(
+                    "INSERT INTO files_fts (rowid, name, relative_path) "
+                    "SELECT id, name, relative_path FROM files WHERE id > ?", (first_id,)
+                )
+            # Statistiques enregistrées en dernier : iter_scan() les complète pendant le flux
+            conn.execute("UPDATE scans SET file_count = ?, stats = ? WHERE id = ?",
+                         (count, json.dumps(stats or {}, default=str), scan_id))
+        return scan_id
+
+    def add_attachments(self, attachments: Iterable[AttachmentInfo],
+                        scan_id: Optional[int] = None) -> int:
+        """
+        Enregistre des pièces jointes extraites
+
+        Args:
+            attachments: Pièces jointes (AttachmentExtractor.attachments)
+            scan_id: Scan dont proviennent les emails (optionnel)
+
+        Returns:
+            Nombre de pièces jointes enregistrées
+        """
+        conn = self.conn
+        with conn:
+            first_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM attachments").fetchone()[0]
+            count = conn.executemany(
+                f"INSERT INTO attachments (scan_id, {', '.join(ATTACHMENT_COLUMNS)}) "
+                f"VALUES (?{', ?' * len(ATTACHMENT_COLUMNS)})",
+                ((scan_id,) + astuple(attachment) for attachment in attachments)
+            ).rowcount
+            if self.fts:
+                conn.execute(
+                    "INSERT INTO attachments_fts (rowid, original_filename, email_subject, email_source) "
+                    "SELECT id, original_filename, email_subject, email_source FROM attachments "
+                    "WHERE id > ?", (first_id,)
+                )
+        return count
+
+    def scans(self) -> List[Dict]:
+        """
+        Liste les scans enregistrés
+
+        Returns:
+            Liste de dictionnaires (id, root_path, label, created, file_count), du plus ancien au plus récent
+        """
+        cursor = self.conn.execute(
+            "SELECT id, root_path, label, created, file_count FROM scans ORDER BY id")
+        return [dict(zip(('id', 'root_path', 'label', 'created', 'file_count'), row))
+                for row in cursor]
+
+    def latest_scan(self, root_path: Optional[Union[str, os.PathLike]] = None) -> Optional[int]:
+        """
+        Identifiant du dernier scan enregistré
+
+        Args:
+            root_path: Se limiter aux scans de ce dossier
+
+        Returns:
+            Identifiant, ou None si le catalogue est vide
+        """
+        if root_path is None:
+            row = self.conn.execute("SELECT MAX(id) FROM scans").fetchone()
+        else:
+            row = self.conn.execute("SELECT MAX(id) FROM scans WHERE root_path = ?",
+                                    (str(root_path),)).fetchone()
+        return row[0]
+
+    def root_path(self, scan_id: int) -> str:
+        """Dossier racine d'un scan"""
+        row = self.conn.execute("SELECT root_path FROM scans WHERE id = ?", (scan_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Scan inconnu: {scan_id}")
+        return row[0]
+
+    def load_stats(self, scan_id: int) -> Dict:
+        """
+        Statistiques d'un scan
+
+        Args:
+            scan_id: Identifiant du scan
+
+        Returns:
+            Dictionnaire des statistiques
+        """
+        row = self.conn.execute("SELECT stats FROM scans WHERE id = ?", (scan_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Scan inconnu: {scan_id}")
+        return json.loads(row[0] or '{}')
+
+    def iter_files(self, scan_id: int) -> Iterator[FileInfo]:
+        """
+        Relit les fichiers d'un scan, en flux
+
+        Args:
+            scan_id: Identifiant du scan
+
+        Returns:
+            Itérateur de FileInfo, dans l'ordre d'enregistrement
+        """
+        root = self.root_path(scan_id)
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(FILE_COLUMNS)} FROM files WHERE scan_id = ? ORDER BY id", (scan_id,))
+        return self._file_infos(cursor, root)
+
+    def load_files(self, scan_id: int):
+        """
+        Relit les fichiers d'un scan dans une FileTable
+
+        La table s'utilise comme une liste de FileInfo : reporter,
+        classificateur, exports et FileIndex l'acceptent directement.
+
+        Args:
+            scan_id: Identifiant du scan
+
+        Returns:
+            FileTable
+        """
+        from .table import FileTable
+
+        return FileTable.from_files(self.iter_files(scan_id), self.root_path(scan_id))
+
+    def load_attachments(self, scan_id: Optional[int] = None) -> List[AttachmentInfo]:
+        """
+        Relit les pièces jointes enregistrées
+
+        Args:
+            scan_id: Se limiter aux pièces jointes rattachées à ce scan
+
+        Returns:
+            Liste d'AttachmentInfo (pour HTMLReporter.generate_report)
+        """
+        sql = f"SELECT {', '.join(ATTACHMENT_COLUMNS)} FROM attachments"
+        params = ()
+        if scan_id is not None:
+            sql += " WHERE scan_id = ?"
+            params = (scan_id,)
+        return [self._attachment(row) for row in self.conn.execute(sql + " ORDER BY id", params)]
+
+    def search_files(self, text: str, scan_id: Optional[int] = None,
+                     limit: int = 100) -> List[FileInfo]:
+        """
+        Recherche plein texte dans les noms et chemins des fichiers
+
+        Args:
+            text: Mots recherchés (tous requis, '*' final pour un préfixe)
+            scan_id: Se limiter à un scan
+            limit: Nombre maximal de résultats
+
+        Returns:
+            FileInfo, les plus pertinents d'abord
+        """
+        columns = ', '.join(f"f.{name}" for name in FILE_COLUMNS)
+        scope = " AND f.scan_id = ?" if scan_id is not None else ""
+        scope_params = (scan_id,) if scan_id is not None else ()
+
+        if self.fts:
+            query = fts_query(text)
+            if not query:
+                return []
+            sql = (f"SELECT {columns}, s.root_path FROM files_fts "
+                   f"JOIN files f ON f.id = files_fts.rowid JOIN scans s ON s.id = f.scan_id "
+                   f"WHERE files_fts MATCH ?{scope} ORDER BY files_fts.rank LIMIT ?")
+            params = (query,) + scope_params + (limit,)
+        else:
+            words = text.replace('*', '').split()
+            if not words:
+                return []
+            conditions = ' AND '.join("(f.name LIKE ? OR f.relative_path LIKE ?)" for _ in words)
+            sql = (f"SELECT {columns}, s.root_path FROM files f JOIN scans s ON s.id = f.scan_id "
+                   f"WHERE {conditions}{scope} ORDER BY f.id LIMIT ?")
+            params = tuple(p for w in words for p in (f"%{w}%",) * 2) + scope_params + (limit,)
+
+        return [self._file_info(row[:-1], row[-1]) for row in self.conn.execute(sql, params)]
+
+    def search_attachments(self, text: str, limit: int = 100) -> List[AttachmentInfo]:
+        """
+        Recherche plein texte dans les noms, sujets et sources des pièces jointes
+
+        Args:
+            text: Mots recherchés (tous requis, '*' final pour un préfixe)
+            limit: Nombre maximal de résultats
+
+        Returns:
+            AttachmentInfo, les plus pertinentes d'abord
+        """
+        columns = ', '.join(f"a.{name}" for name in ATTACHMENT_COLUMNS)
+        if self.fts:
+            query = fts_query(text)
+            if not query:
+                return []
+            sql = (f"SELECT {columns} FROM attachments_fts "
+                   f"JOIN attachments a ON a.id = attachments_fts.rowid "
+                   f"WHERE attachments_fts MATCH ? ORDER BY attachments_fts.rank LIMIT ?")
+            params = (query, limit)
+        else:
+            words = text.replace('*', '').split()
+            if not words:
+                return []
+            conditions = ' AND '.join(
+                "(a.original_filename LIKE ? OR a.email_subject LIKE ? OR a.email_source LIKE ?)"
+                for _ in words)
+            sql = f"SELECT {columns} FROM attachments a WHERE {conditions} ORDER BY a.id LIMIT ?"
+            params = tuple(p for w in words for p in (f"%{w}%",) * 3) + (limit,)
+
+        return [self._attachment(row) for row in self.conn.execute(sql, params)]
+
+    def _file_infos(self, cursor: sqlite3.Cursor, root: str) -> Iterator[FileInfo]:
+        """Convertit les lignes d'un curseur en FileInfo, par blocs de FETCH_SIZE"""
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                return
+            for row in rows:
+                yield self._file_info(row, root)
+
+    @staticmethod
+    def _file_info(row: tuple, root: str) -> FileInfo:
+        """FileInfo depuis une ligne (colonnes FILE_COLUMNS)"""
+        (name, relative_path, extension, size_bytes, created_ts, modified_ts, file_type,
+         depth, parent_folder, is_email, *optional) = row
+        return FileInfo(name, os.path.join(root, relative_path), relative_path, extension,
+                        size_bytes, created_ts, modified_ts, file_type, depth, parent_folder,
+                        bool(is_email), *optional)
+
+    @staticmethod
+    def _attachment(row: tuple) -> AttachmentInfo:
+        """AttachmentInfo depuis une ligne (colonnes ATTACHMENT_COLUMNS)"""
+        attachment = AttachmentInfo(*row)
+        attachment.is_nested_email = bool(attachment.is_nested_email)
+        return attachment
+
+    def close(self):
+        """Ferme la base"""
+        self.conn.close()
+
+    def __enter__(self) -> 'ScanCatalog':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -3,10 +3,18 @@ Module de classification et organisation des fichiers
 Copie les fichiers dans des dossiers par catégorie
 """
 
-import shutil
+import os
+import threading
+import time
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable
+from .copier import DEFAULT_BYTES_IN_FLIGHT, ParallelCopier
+from .journal import JOURNAL_NAME, CopyJournal, JournalEntry
 from .scanner import FileInfo
+from .sniffer import ContentSniffer
+from .transfer import METHODS, MODES, FileTransfer
+from ..utils.names import NameRegistry
 
 
 class FileClassifier:
@@ -19,22 +27,44 @@ class FileClassifier:
         "Autres fichiers": []  # Catch-all
     }
 
-    def __init__(self, output_dir: str, categories: Optional[Dict[str, List[str]]] = None):
+    def __init__(self, output_dir: str, categories: Optional[Dict[str, List[str]]] = None,
+                 sniff_content: bool = False, names: Optional[NameRegistry] = None):
         """
         Initialise le classificateur
 
         Args:
             output_dir: Dossier de sortie
             categories: Dictionnaire de catégories personnalisées
+            sniff_content: Dans classify_all, détecter le type réel des fichiers
+                           d'après leur contenu s'il n'est pas déjà connu
+            names: Registre des noms attribués, à partager avec un AttachmentExtractor
+                   écrivant dans les mêmes dossiers (par défaut : registre propre)
         """
         self.output_dir = Path(output_dir)
         self.categories = categories or self.DEFAULT_CATEGORIES
+        self.sniffer = ContentSniffer() if sniff_content else None
         self.stats = {
             'total_copied': 0,
             'total_size_mb': 0,
             'by_category': {},
-            'errors': 0
+            'errors': 0,
+            # Méthode de copie utilisée (nombre de fichiers) et débit (voir FileTransfer)
+            'copy_methods': {},
+            'copy_bytes': 0,
+            'copy_seconds': 0.0,
+            'copy_mb_per_s': 0.0,
+            # Fichiers déjà classés par un classement interrompu (voir classify_all(resume=True))
+            'resumed': 0
         }
+        # Copie par le noyau (clone, copy_file_range, sendfile), méthode mémorisée
+        # par couple de systèmes de fichiers
+        self.transfer = FileTransfer()
+        # Noms déjà pris dans chaque dossier de destination
+        self.names = names or NameRegistry()
+        # Journal du classement en cours (voir classify_all(journal=...))
+        self.journal: Optional[CopyJournal] = None
+        # Protège stats et résultats pendant une copie parallèle
+        self._lock = threading.Lock()
 
         # Créer les dossiers de catégories
         self._create_category_folders()
@@ -47,7 +77,7 @@ class FileClassifier:
             self.stats['by_category'][category] = 0
 
     def classify_file(self, file_info: FileInfo, copy: bool = True,
-                     preserve_structure: bool = False) -> Optional[str]:
+                     preserve_structure: bool = False, mode: str = 'copy') -> Optional[str]:
         """
         Classifie et copie un fichier
 
@@ -55,71 +85,246 @@ class FileClassifier:
             file_info: Information sur le fichier
             copy: Si True, copie le fichier, sinon retourne juste la catégorie
             preserve_structure: Préserver la structure de dossiers
+            mode: 'copy' (copie), 'hardlink' (lien physique, copie si la source est
+                  sur un autre système de fichiers), 'symlink' (lien symbolique vers
+                  la source) ou 'move' (déplacement, rename atomique sur un même
+                  système de fichiers)
 
         Returns:
             Chemin de destination ou None en cas d'erreur
         """
-        category = self._get_category(file_info.extension)
+        self._check_mode(mode)
+        category = self._file_category(file_info)
 
         if not copy:
             return category
 
         try:
-            # Déterminer le chemin de destination
-            if preserve_structure:
-                # Préserver la structure relative
-                relative_parent = Path(file_info.relative_path).parent
-                dest_dir = self.output_dir / category / relative_parent
-                dest_dir.mkdir(parents=True, exist_ok=True)
-            else:
-                dest_dir = self.output_dir / category
+            # Fichier déjà classé par un classement interrompu
+            previous = self._previous(file_info)
+            if previous is not None and self._resume(file_info, category, previous, mode):
+                return previous.destination
 
-            dest_path = dest_dir / file_info.name
-            dest_path = self._get_unique_path(dest_path)
+            dest_path = self._destination(file_info, category, preserve_structure, previous)
+            self._plan(file_info, dest_path)
 
-            # Copier le fichier
-            shutil.copy2(file_info.path, dest_path)
+            # Copier (ou lier, déplacer) le fichier
+            start = time.perf_counter()
+            method = self.transfer.transfer(file_info.path, str(dest_path), mode,
+                                            atomic=self.journal is not None)
+            if self.journal is not None:
+                self.journal.done(file_info.path, method)
 
             # Mettre à jour les stats
-            self.stats['total_copied'] += 1
-            self.stats['total_size_mb'] += file_info.size_mb
-            self.stats['by_category'][category] += 1
+            self._record_copy(file_info, category, method, time.perf_counter() - start)
 
             return str(dest_path)
 
         except Exception as e:
-            print(f"❌ Erreur copie {file_info.name}: {e}")
-            self.stats['errors'] += 1
+            self._record_error(file_info, e)
+            return None
+
+    @staticmethod
+    def _check_mode(mode: str):
+        """Vérifie le mode de classement"""
+        if mode not in MODES:
+            raise ValueError(f"Mode de classement inconnu: {mode} (attendu : {', '.join(MODES)})")
+
+    def _file_category(self, file_info: FileInfo) -> str:
+        """Catégorie d'un fichier"""
+        # Type détecté d'après le contenu en priorité (voir FolderScanner.scan(sniff_content=True))
+        return self._get_category(getattr(file_info, 'content_type', None) or file_info.extension)
+
+    def _destination(self, file_info: FileInfo, category: str, preserve_structure: bool,
+                     previous: Optional[JournalEntry] = None) -> Path:
+        """
+        Détermine le chemin de destination d'un fichier (dossiers créés si nécessaire)
+
+        Args:
+            file_info: Fichier à copier
+            category: Catégorie du fichier
+            preserve_structure: Préserver la structure de dossiers
+            previous: Copie du fichier notée au journal par un classement interrompu
+                      (voir _previous) : sa destination est reprise (pas de doublon nom_1)
+
+        Returns:
+            Chemin de destination libre
+        """
+        if preserve_structure:
+            # Préserver la structure relative
+            relative_parent = Path(file_info.relative_path).parent
+            dest_dir = self.output_dir / category / relative_parent
+            dest_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            dest_dir = self.output_dir / category
+
+        if previous is not None and Path(previous.destination).parent == dest_dir:
+            return Path(previous.destination)
+
+        return self._get_unique_path(dest_dir / file_info.name)
+
+    def _plan(self, file_info: FileInfo, dest_path: Path):
+        """Note une copie au journal avant de la commencer"""
+        if self.journal is not None:
+            self.journal.plan(file_info.path, str(dest_path), file_info.size_bytes,
+                              file_info.modified_ts)
+
+    def _previous(self, file_info: FileInfo) -> Optional[JournalEntry]:
+        """
+        Copie d'un fichier notée au journal par un classement interrompu
+
+        Sa destination est réservée dans le registre des noms. Si ce nom a déjà
+        été attribué pendant ce classement à un autre fichier (homonyme classé
+        avant celui-ci), l'entrée est ignorée : le fichier reçoit un nouveau nom.
+
+        Args:
+            file_info: Fichier à classer
+
+        Returns:
+            Entrée du journal, ou None
+        """
+        if self.journal is None:
             return None
+        previous = self.journal.previous(file_info.path)
+        if previous is None or not self.names.claim(previous.destination):
+            return None
+        return previous
 
-    def classify_all(self, files: List[FileInfo], copy: bool = True,
-                    preserve_structure: bool = False, show_progress: bool = True) -> Dict[str, str]:
+    def _resume(self, file_info: FileInfo, category: str, previous: JournalEntry,
+                mode: str) -> bool:
+        """
+        Vérifie une copie notée au journal par un classement interrompu
+
+        La source doit avoir la taille et la date notées, et la destination
+        les mêmes (la copie conserve la date de modification).
+
+        Args:
+            file_info: Fichier à classer
+            category: Catégorie du fichier
+            previous: Entrée du journal pour ce fichier
+            mode: Mode de classement
+
+        Returns:
+            True si le fichier est déjà classé (rien à refaire)
+        """
+        if not previous.unchanged(file_info.size_bytes, file_info.modified_ts) \
+                or not previous.verify():
+            return False
+
+        if mode == 'move' and os.path.exists(file_info.path) \
+                and not os.path.samefile(file_info.path, previous.destination):
+            # Déplacement entre systèmes de fichiers arrêté après la copie
+            os.remove(file_info.path)
+        if not previous.done:
+            self.journal.done(file_info.path, 'resumed')
+        with self._lock:
+            self.stats['resumed'] += 1
+            self.stats['by_category'][category] += 1
+        return True
+
+    def _record_copy(self, file_info: FileInfo, category: str, method: str, seconds: float = 0.0):
+        """
+        Comptabilise une copie réussie
+
+        Args:
+            file_info: Fichier copié
+            category: Catégorie du fichier
+            method: Méthode utilisée (méthode de copie, 'hardlink', 'symlink' ou 'rename')
+            seconds: Durée de la copie (0 en copie parallèle : la durée totale est comptée à la fin)
+        """
+        with self._lock:
+            self.stats['total_copied'] += 1
+            self.stats['total_size_mb'] += file_info.size_mb
+            self.stats['by_category'][category] += 1
+            methods = self.stats['copy_methods']
+            methods[method] = methods.get(method, 0) + 1
+            if method in METHODS:
+                # Liens et déplacements ne copient aucun octet
+                self.stats['copy_bytes'] += file_info.size_bytes
+            self._add_copy_time(seconds)
+
+    def _add_copy_time(self, seconds: float):
+        """Ajoute une durée de copie et met à jour le débit (appelé sous verrou)"""
+        self.stats['copy_seconds'] += seconds
+        if self.stats['copy_seconds'] > 0:
+            self.stats['copy_mb_per_s'] = round(
+                self.stats['copy_bytes'] / (1024 * 1024) / self.stats['copy_seconds'], 1)
+
+    def _record_error(self, file_info: FileInfo, error: Exception):
+        """Comptabilise une copie en erreur"""
+        print(f"❌ Erreur copie {file_info.name}: {error}")
+        with self._lock:
+            self.stats['errors'] += 1
+
+    def classify_all(self, files: Iterable[FileInfo], copy: bool = True,
+                    preserve_structure: bool = False, show_progress: bool = True,
+                    workers: int = 1,
+                    max_bytes_in_flight: int = DEFAULT_BYTES_IN_FLIGHT,
+                    mode: str = 'copy', journal: Optional[str] = None,
+                    resume: bool = False) -> Dict[str, str]:
         """
         Classifie tous les fichiers
 
         Args:
-            files: Liste des fichiers à classifier
+            files: Fichiers à classifier (liste, FileTable ou flux, par exemple scanner.iter_scan())
             copy: Copier les fichiers
             preserve_structure: Préserver la structure
             show_progress: Afficher la progression
+            workers: Nombre de threads de copie (1 = copies l'une après l'autre).
+                     Les petits et gros fichiers ont des files séparées (voir ParallelCopier).
+            max_bytes_in_flight: En copie parallèle, volume maximal soumis et pas encore copié
+            mode: 'copy', 'hardlink', 'symlink' ou 'move' (voir classify_file()) ;
+                  les liens donnent une vue classée sans doubler l'espace disque
+            journal: Journal des copies (voir CopyJournal) ; chaque fichier est écrit
+                     sous un nom temporaire puis renommé. Par défaut, aucun journal,
+                     sauf en reprise : JOURNAL_NAME à la racine du dossier de sortie
+            resume: Reprendre un classement interrompu : les fichiers notés au journal
+                    dont la destination a la taille et la date de la source sont
+                    sautés, les autres sont recopiés vers la même destination
 
         Returns:
-            Dictionnaire {chemin_source: chemin_destination}
+            Dictionnaire {chemin_source: chemin_destination} (en copie parallèle,
+            dans l'ordre de fin des copies)
         """
+        self._check_mode(mode)
         results = {}
+        total = f"/{len(files)}" if hasattr(files, '__len__') else ""
+        if self.sniffer is not None:
+            files = self.sniffer.iter_sniffed(files)
 
-        for i, file_info in enumerate(files, 1):
-            if show_progress and i % 10 == 0:
-                print(f"📁 Classification: {i}/{len(files)} fichiers")
-
-            dest_path = self.classify_file(file_info, copy, preserve_structure)
-            if dest_path:
-                results[file_info.path] = dest_path
+        if copy and (journal or resume):
+            self.journal = CopyJournal(journal or self.output_dir / JOURNAL_NAME, resume)
+        try:
+            if copy and workers > 1:
+                self._classify_parallel(files, results, preserve_structure, show_progress, total,
+                                        workers, max_bytes_in_flight, mode)
+            else:
+                for i, file_info in enumerate(files, 1):
+                    if show_progress and i % 10 == 0:
+                        print(f"📁 Classification: {i}{total} fichiers")
+
+                    # Membre d'archive : classé avec l'archive qui le contient
+                    if copy and file_info.archive_path is not None:
+                        continue
+
+                    dest_path = self.classify_file(file_info, copy, preserve_structure, mode)
+                    if dest_path:
+                        results[file_info.path] = dest_path
+        finally:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
 
         if show_progress:
             print(f"\n✅ Classification terminée:")
             print(f"   - {self.stats['total_copied']} fichiers copiés")
+            if self.stats['resumed']:
+                print(f"   - {self.stats['resumed']} fichiers déjà classés (reprise)")
             print(f"   - {self.stats['total_size_mb']:.2f} MB")
+            if self.stats['copy_methods']:
+                methods = ", ".join(f"{method}: {count}" for method, count
+                                    in self.stats['copy_methods'].items())
+                print(f"   - Copie : {self.stats['copy_mb_per_s']:.1f} MB/s ({methods})")
             for category, count in self.stats['by_category'].items():
                 if count > 0:
                     print(f"   - {category}: {count} fichiers")
@@ -128,6 +333,69 @@ class FileClassifier:
 
         return results
 
+    def _classify_parallel(self, files: Iterable[FileInfo], results: Dict[str, str],
+                           preserve_structure: bool, show_progress: bool, total: str,
+                           workers: int, max_bytes_in_flight: int, mode: str = 'copy'):
+        """
+        Copie les fichiers sur un pool de threads
+
+        Les destinations sont choisies dans ce thread, dans l'ordre des
+        fichiers ; le registre des noms réserve chaque chemin attribué : deux
+        fichiers de même nom ne visent jamais la même destination, même avant
+        leur copie.
+
+        Args:
+            files: Fichiers à classifier
+            results: Dictionnaire {chemin_source: chemin_destination} à remplir
+            preserve_structure: Préserver la structure
+            show_progress: Afficher la progression
+            total: Suffixe '/N' de la progression (vide si le nombre est inconnu)
+            workers: Nombre de threads de copie
+            max_bytes_in_flight: Volume maximal soumis et pas encore copié
+            mode: Mode de classement (voir classify_file())
+        """
+        def finished(file_info: FileInfo, category: str, dest_path: Path, method, error):
+            if error is not None:
+                self._record_error(file_info, error)
+                return
+            if self.journal is not None:
+                self.journal.done(file_info.path, method)
+            self._record_copy(file_info, category, method)
+            with self._lock:
+                results[file_info.path] = str(dest_path)
+
+        start = time.perf_counter()
+        transfer = partial(self.transfer.transfer, mode=mode, atomic=self.journal is not None)
+        with ParallelCopier(workers, max_bytes_in_flight, copy_function=transfer) as copier:
+            for i, file_info in enumerate(files, 1):
+                if show_progress and i % 10 == 0:
+                    print(f"📁 Classification: {i}{total} fichiers")
+
+                # Membre d'archive : classé avec l'archive qui le contient
+                if file_info.archive_path is not None:
+                    continue
+
+                category = self._file_category(file_info)
+                try:
+                    previous = self._previous(file_info)
+                    if previous is not None and self._resume(file_info, category, previous, mode):
+                        with self._lock:
+                            results[file_info.path] = previous.destination
+                        continue
+                    dest_path = self._destination(file_info, category, preserve_structure,
+                                                  previous)
+                    self._plan(file_info, dest_path)
+                except Exception as e:
+                    self._record_error(file_info, e)
+                    continue
+                copier.submit(file_info.path, str(dest_path), file_info.size_bytes,
+                              lambda method, error, f=file_info, c=category, d=dest_path:
+                              finished(f, c, d, method, error))
+
+        # Copies simultanées : le débit se mesure sur la durée totale
+        with self._lock:
+            self._add_copy_time(time.perf_counter() - start)
+
     def _get_category(self, extension: str) -> str:
         """
         Détermine la catégorie d'un fichier
@@ -149,27 +417,15 @@ class FileClassifier:
 
     def _get_unique_path(self, path: Path) -> Path:
         """
-        Génère un chemin unique si le fichier existe déjà
+        Génère un chemin unique si le fichier existe déjà (voir NameRegistry)
 
         Args:
             path: Chemin original
 
         Returns:
-            Chemin unique
+            Chemin unique, réservé pour ce classement
         """
-        if not path.exists():
-            return path
-
-        stem = path.stem
-        suffix = path.suffix
-        parent = path.parent
-        counter = 1
-
-        while True:
-            new_path = parent / f"{stem}_{counter}{suffix}"
-            if not new_path.exists():
-                return new_path
-            counter += 1
+        return self.names.allocate(path)
 
     def get_report(self) -> str:
         """
@@ -183,14 +439,19 @@ class FileClassifier:
             "RAPPORT DE CLASSIFICATION",
             "=" * 50,
             f"Fichiers copiés: {self.stats['total_copied']}",
+            f"Fichiers déjà classés (reprise): {self.stats['resumed']}",
             f"Taille totale: {self.stats['total_size_mb']:.2f} MB",
+            f"Débit de copie: {self.stats['copy_mb_per_s']:.1f} MB/s "
+            f"({', '.join(f'{m}: {n}' for m, n in self.stats['copy_methods'].items()) or '-'})",
             "",
             "Répartition par catégorie:",
         ]
 
+        # by_category compte aussi les fichiers repris d'un classement interrompu
+        classified = self.stats['total_copied'] + self.stats['resumed']
         for category, count in sorted(self.stats['by_category'].items()):
             if count > 0:
-                percentage = (count / self.stats['total_copied'] * 100) if self.stats['total_copied'] > 0 else 0
+                percentage = (count / classified * 100) if classified > 0 else 0
                 lines.append(f"  {category:.<30} {count:>4} ({percentage:.1f}%)")
 
         if self.stats['errors'] > 0:
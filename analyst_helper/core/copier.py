@@ -0,0 +1,147 @@
+"""
+Module de copie parallèle de fichiers
+Répartit les copies sur un pool de threads, avec des files séparées pour les petits et gros fichiers
+"""
+
+import shutil
+import threading
+from collections import deque
+from typing import Callable, List, Optional
+
+# Au-delà de cette taille, un fichier passe par la file des gros fichiers
+LARGE_FILE_SIZE = 8 * 1024 * 1024
+# Volume maximal soumis et pas encore copié
+DEFAULT_BYTES_IN_FLIGHT = 256 * 1024 * 1024
+# Volume minimal compté par fichier : borne aussi le nombre de petits fichiers en attente
+MIN_FILE_COST = 64 * 1024
+
+
+class ParallelCopier:
+    """Copie de fichiers sur un pool de threads
+
+    Les petits fichiers (coût dominé par les ouvertures et métadonnées) et
+    les gros fichiers (coût dominé par le débit) ont chacun leur file : un
+    quart des threads (au moins un) sert d'abord les gros fichiers, les
+    autres les petits, et un thread dont la file est vide se sert dans
+    l'autre. Ainsi un lot de fichiers de plusieurs Go ne bloque pas les
+    milliers de petits fichiers, et inversement.
+
+    submit() bloque tant que le volume soumis et pas encore copié dépasse
+    max_bytes_in_flight (un fichier plus gros que la limite passe seul).
+    Le callback de chaque copie est appelé depuis le thread qui l'a faite.
+    """
+
+    def __init__(self, workers: int = 4, max_bytes_in_flight: int = DEFAULT_BYTES_IN_FLIGHT,
+                 large_file_size: int = LARGE_FILE_SIZE,
+                 copy_function: Callable[[str, str], object] = shutil.copy2):
+        """
+        Initialise le pool de copie
+
+        Args:
+            workers: Nombre de threads de copie
+            max_bytes_in_flight: Volume maximal soumis et pas encore copié (octets)
+            large_file_size: Taille à partir de laquelle un fichier est « gros »
+            copy_function: Fonction de copie (source, destination)
+        """
+        self.workers = max(1, workers)
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self.large_file_size = large_file_size
+        self.copy_function = copy_function
+        self._small: deque = deque()
+        self._large: deque = deque()
+        # Un seul verrou, deux conditions : travail disponible (workers), place libérée (submit)
+        self._lock = threading.Lock()
+        self._work = threading.Condition(self._lock)
+        self._space = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._closed = False
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """Démarre les threads de copie"""
+        large_workers = max(1, self.workers // 4)
+        self._threads = [
+            threading.Thread(target=self._worker, args=(i < large_workers,), daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, source: str, destination: str, size: int,
+               callback: Optional[Callable[[object, Optional[Exception]], None]] = None):
+        """
+        Ajoute une copie (bloque si le volume en cours dépasse la limite)
+
+        Args:
+            source: Fichier source
+            destination: Chemin de destination
+            size: Taille du fichier (octets)
+            callback: Fonction appelée après la copie avec (résultat de copy_function,
+                      None) ou (None, exception levée)
+        """
+        cost = max(size, MIN_FILE_COST)
+        with self._lock:
+            while self._in_flight and self._in_flight + cost > self.max_bytes_in_flight:
+                self._space.wait()
+            self._in_flight += cost
+            queue = self._large if size >= self.large_file_size else self._small
+            queue.append((source, destination, cost, callback))
+            self._work.notify()
+
+    def close(self):
+        """Attend la fin de toutes les copies soumises et arrête les threads"""
+        with self._lock:
+            self._closed = True
+            self._work.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self) -> 'ParallelCopier':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _next_task(self, prefer_large: bool) -> Optional[tuple]:
+        """Tâche suivante : file préférée d'abord, puis l'autre (appelé sous verrou)"""
+        first, second = (self._large, self._small) if prefer_large else (self._small, self._large)
+        if first:
+            return first.popleft()
+        if second:
+            return second.popleft()
+        return None
+
+    def _worker(self, prefer_large: bool):
+        """
+        Boucle d'un thread de copie
+
+        Args:
+            prefer_large: Servir d'abord la file des gros fichiers
+        """
+        while True:
+            with self._lock:
+                task = self._next_task(prefer_large)
+                while task is None:
+                    if self._closed:
+                        return
+                    self._work.wait()
+                    task = self._next_task(prefer_large)
+
+            source, destination, cost, callback = task
+            result = error = None
+            try:
+                result = self.copy_function(source, destination)
+            except Exception as e:
+                error = e
+
+            with self._lock:
+                self._in_flight -= cost
+                self._space.notify()
+
+            if callback is not None:
+                try:
+                    callback(result, error)
+                except Exception as e:
+                    print(f"❌ Erreur après copie de {source}: {e}")
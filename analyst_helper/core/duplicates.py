@@ -0,0 +1,243 @@
+"""
+Module de détection de doublons
+Compare les fichiers par étapes : taille, puis empreinte partielle, puis empreinte complète
+"""
+
+import os
+import mmap
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .scanner import FileInfo
+
+# Taille des blocs lus en début et fin de fichier pour l'empreinte partielle
+DEFAULT_BLOCK_SIZE = 64 * 1024
+# Taille du tampon de lecture quand mmap n'est pas utilisable
+READ_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def _partial_hash(task: Tuple[str, int, int]) -> Tuple[str, Optional[str]]:
+    """
+    Empreinte du premier et du dernier bloc d'un fichier
+
+    Args:
+        task: Tuple (chemin, taille, taille de bloc)
+
+    Returns:
+        Tuple (chemin, empreinte hexadécimale ou None en cas d'erreur)
+    """
+    path, size, block_size = task
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            digest.update(f.read(block_size))
+            if size > block_size:
+                f.seek(max(block_size, size - block_size))
+                digest.update(f.read(block_size))
+        return path, digest.hexdigest()
+    except OSError:
+        return path, None
+
+
+def _file_identity(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Identité d'un fichier : les liens physiques (et symboliques) d'un même fichier la partagent
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        Tuple (st_dev, st_ino), ou None si stat() échoue
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def _full_hash(path: str) -> Tuple[str, Optional[str]]:
+    """
+    Empreinte complète d'un fichier (mmap, ou lecture par grands blocs)
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        Tuple (chemin, empreinte hexadécimale ou None en cas d'erreur)
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+            except (ValueError, OverflowError, OSError):
+                f.seek(0)
+                digest = hashlib.sha256()
+                for chunk in iter(lambda: f.read(READ_BUFFER_SIZE), b''):
+                    digest.update(chunk)
+        return path, digest.hexdigest()
+    except OSError:
+        return path, None
+
+
+class DuplicateFinder:
+    """Détecteur de doublons par empreintes successives"""
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE, workers: Optional[int] = None):
+        """
+        Initialise le détecteur
+
+        Args:
+            block_size: Taille des blocs de l'empreinte partielle (octets)
+            workers: Nombre de processus de calcul (None = nombre de CPU, 1 = sans pool)
+        """
+        self.block_size = block_size
+        self.workers = workers or os.cpu_count() or 1
+        self.stats = {
+            'partial_hashed': 0,
+            'full_hashed': 0,
+            'duplicate_groups': 0,
+            'duplicate_files': 0,
+            'linked_files': 0,
+            'wasted_bytes': 0
+        }
+
+    def find(self, files: List[FileInfo]) -> List[List[FileInfo]]:
+        """
+        Recherche les groupes de fichiers au contenu identique
+
+        Les fichiers vides et les membres d'archives sont ignorés. Les liens
+        physiques d'un même fichier (même st_dev, st_ino) ne sont lus qu'une
+        fois et ne forment pas à eux seuls un groupe : un groupe contient au
+        moins deux fichiers distincts, avec leurs liens, et l'espace récupérable
+        ne compte que les fichiers distincts. Les empreintes calculées sont conservées
+        dans FileInfo.quick_hash et FileInfo.content_hash ; celles déjà présentes
+        ne sont pas recalculées.
+
+        Args:
+            files: Fichiers à comparer
+
+        Returns:
+            Groupes de doublons (au moins 2 fichiers par groupe), les plus coûteux d'abord
+        """
+        # Étape 1 : regroupement par taille (aucune lecture)
+        by_size: Dict[int, List[FileInfo]] = {}
+        for file in files:
+            if file.size_bytes > 0 and file.archive_path is None:
+                by_size.setdefault(file.size_bytes, []).append(file)
+        candidates = [group for group in by_size.values() if len(group) > 1]
+
+        # Étape 1 bis : un seul représentant par fichier physique (un stat() par candidat)
+        links: Dict[str, List[FileInfo]] = {}
+        candidates = [self._merge_links(group, links) for group in candidates]
+        candidates = [group for group in candidates if len(group) > 1]
+        self.stats['linked_files'] = sum(len(others) for others in links.values())
+
+        # Étape 2 : empreinte du premier et du dernier bloc
+        to_hash = [f for group in candidates for f in group if f.quick_hash is None]
+        results = self._run(_partial_hash, [(f.path, f.size_bytes, self.block_size) for f in to_hash])
+        for file in to_hash:
+            file.quick_hash = results.get(file.path)
+            # Fichier entièrement couvert par les deux blocs : l'empreinte est complète
+            if file.size_bytes <= 2 * self.block_size:
+                file.content_hash = file.quick_hash
+        self.stats['partial_hashed'] += len(to_hash)
+
+        candidates = self._split(candidates, lambda f: f.quick_hash)
+
+        # Étape 3 : empreinte complète des collisions restantes
+        to_hash = [f for group in candidates for f in group if f.content_hash is None]
+        results = self._run(_full_hash, [f.path for f in to_hash])
+        for file in to_hash:
+            file.content_hash = results.get(file.path)
+        self.stats['full_hashed'] += len(to_hash)
+
+        duplicates = self._split(candidates, lambda f: f.content_hash)
+        duplicates.sort(key=lambda group: group[0].size_bytes * (len(group) - 1), reverse=True)
+        self.stats['duplicate_groups'] = len(duplicates)
+        self.stats['wasted_bytes'] = sum(group[0].size_bytes * (len(group) - 1) for group in duplicates)
+
+        # Les liens rejoignent le groupe de leur fichier, avec ses empreintes
+        groups = []
+        for group in duplicates:
+            expanded = []
+            for file in group:
+                expanded.append(file)
+                for other in links.get(file.path, ()):
+                    other.quick_hash, other.content_hash = file.quick_hash, file.content_hash
+                    expanded.append(other)
+            groups.append(expanded)
+        self.stats['duplicate_files'] = sum(len(group) for group in groups)
+        return groups
+
+    @staticmethod
+    def _merge_links(group: List[FileInfo], links: Dict[str, List[FileInfo]]) -> List[FileInfo]:
+        """
+        Garde un fichier par (st_dev, st_ino) dans un groupe de même taille
+
+        Args:
+            group: Fichiers de même taille
+            links: Dictionnaire {chemin du représentant: autres liens} à compléter
+
+        Returns:
+            Représentants, dans l'ordre du groupe
+        """
+        first: Dict[Tuple[int, int], FileInfo] = {}
+        kept = []
+        for file in group:
+            identity = _file_identity(file.path)
+            if identity is None:
+                kept.append(file)
+                continue
+            representative = first.setdefault(identity, file)
+            if representative is file:
+                kept.append(file)
+            else:
+                links.setdefault(representative.path, []).append(file)
+        return kept
+
+    @staticmethod
+    def _split(groups: List[List[FileInfo]], key) -> List[List[FileInfo]]:
+        """
+        Redécoupe des groupes selon une clé, en ne gardant que les collisions
+
+        Args:
+            groups: Groupes à redécouper
+            key: Fonction FileInfo -> clé (les clés None sont écartées)
+
+        Returns:
+            Nouveaux groupes d'au moins 2 fichiers
+        """
+        result = []
+        for group in groups:
+            buckets: Dict[str, List[FileInfo]] = {}
+            for file in group:
+                value = key(file)
+                if value is not None:
+                    buckets.setdefault(value, []).append(file)
+            result.extend(bucket for bucket in buckets.values() if len(bucket) > 1)
+        return result
+
+    def _run(self, func, tasks: List) -> Dict[str, Optional[str]]:
+        """
+        Exécute les calculs d'empreintes, dans un pool de processus si utile
+
+        Args:
+            func: Fonction de calcul (doit être picklable)
+            tasks: Arguments de chaque calcul
+
+        Returns:
+            Dictionnaire {chemin: empreinte}
+        """
+        if not tasks:
+            return {}
+
+        if self.workers <= 1 or len(tasks) < 2 * self.workers:
+            return dict(map(func, tasks))
+
+        chunksize = max(1, len(tasks) // (self.workers * 8))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return dict(pool.map(func, tasks, chunksize=chunksize))
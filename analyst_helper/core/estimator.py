@@ -0,0 +1,257 @@
+"""
+Module d'estimation rapide d'une arborescence
+Extrapole nombre de fichiers, volume et extensions à partir d'un échantillon de dossiers
+"""
+
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Descentes aléatoires par défaut
+DEFAULT_PROBES = 200
+# Nombre maximal de dossiers lus pendant une estimation
+MAX_READS = 2000
+# Quantile de la loi normale pour un intervalle de confiance à 95 %
+Z_95 = 1.96
+
+# Fréquence des vérifications de l'horloge (en fichiers) et des messages (en secondes)
+PROGRESS_CHECK_EVERY = 256
+PROGRESS_INTERVAL = 2.0
+
+
+@dataclass
+class Interval:
+    """Valeur estimée et intervalle de confiance à 95 %"""
+    value: float
+    low: float
+    high: float
+
+    def __str__(self) -> str:
+        return f"{self.value:,.0f} [{self.low:,.0f} - {self.high:,.0f}]".replace(',', ' ')
+
+
+@dataclass
+class ScanEstimate:
+    """Estimation d'une arborescence avant un scan complet"""
+    files: Interval
+    folders: Interval
+    size_mb: Interval
+    # Nombre de fichiers estimé par extension
+    by_extension: Dict[str, float] = field(default_factory=dict)
+    probes: int = 0
+    directories_read: int = 0
+    duration: float = 0.0
+
+    def extension_share(self) -> Dict[str, float]:
+        """
+        Répartition estimée des extensions
+
+        Returns:
+            Dictionnaire {extension: part des fichiers entre 0 et 1}, par part décroissante
+        """
+        total = sum(self.by_extension.values()) or 1
+        return {extension: count / total for extension, count in
+                sorted(self.by_extension.items(), key=lambda item: -item[1])}
+
+
+class TreeEstimator:
+    """Estimation par descentes aléatoires (estimateur de Knuth)
+
+    Une descente part de la racine et tire à chaque niveau un sous-dossier au
+    hasard, jusqu'à un dossier sans sous-dossier. Ce qu'elle lit à la
+    profondeur k est multiplié par le produit des nombres de sous-dossiers
+    rencontrés avant : chaque descente donne ainsi une estimation sans biais
+    du total. La moyenne des descentes est l'estimation, et leur dispersion
+    donne l'intervalle de confiance. Chaque dossier n'est lu qu'une fois,
+    avec les options d'exclusion et les filtres du scanner.
+
+    Une fois max_reads dossiers lus, les descentes continuent tant qu'elles
+    passent par des dossiers déjà lus ; la première qui aurait besoin d'une
+    nouvelle lecture est abandonnée et aucune autre n'est lancée. Seules les
+    descentes complètes comptent : une descente tronquée ne verrait que les
+    premiers niveaux et sous-estimerait l'arborescence. Les deux premières
+    descentes sont toujours menées jusqu'au bout (il en faut deux pour
+    l'intervalle), au besoin au-delà de max_reads.
+    """
+
+    def __init__(self, scanner, probes: int = DEFAULT_PROBES, max_reads: int = MAX_READS,
+                 seed: Optional[int] = None):
+        """
+        Initialise l'estimation
+
+        Args:
+            scanner: FolderScanner déjà configuré (voir FolderScanner.estimate)
+            probes: Nombre de descentes aléatoires
+            max_reads: Nombre de dossiers lus au-delà duquel plus aucune lecture n'est faite
+            seed: Graine du tirage (estimation reproductible)
+        """
+        self.scanner = scanner
+        self.probes = max(2, probes)
+        self.max_reads = max_reads
+        self.rng = random.Random(seed)
+        # Contenu de chaque dossier lu : (fichiers, octets, extensions, sous-dossiers)
+        self._listings: Dict[Path, Tuple[int, int, Dict[str, int], List[Path]]] = {}
+
+    def listing(self, directory: Path, depth: int) -> Tuple[int, int, Dict[str, int], List[Path]]:
+        """
+        Contenu d'un dossier (lu une seule fois)
+
+        Args:
+            directory: Dossier
+            depth: Profondeur du dossier
+
+        Returns:
+            Tuple (nombre de fichiers, octets, fichiers par extension, sous-dossiers)
+        """
+        cached = self._listings.get(directory)
+        if cached is None:
+            files, size, extensions, subdirs = 0, 0, {}, []
+            for item in self.scanner._read_directory(directory, depth, None):
+                if isinstance(item, Path):
+                    subdirs.append(item)
+                else:
+                    files += 1
+                    size += item.size_bytes
+                    extensions[item.extension] = extensions.get(item.extension, 0) + 1
+            cached = self._listings[directory] = (files, size, extensions, subdirs)
+        return cached
+
+    def run(self) -> ScanEstimate:
+        """
+        Lance les descentes aléatoires
+
+        Returns:
+            ScanEstimate
+        """
+        start = time.perf_counter()
+        samples = []
+        by_extension: Dict[str, float] = {}
+
+        for _ in range(self.probes):
+            sample = self._probe(budget=len(samples) >= 2)
+            if sample is None:
+                # Budget de lectures épuisé : on s'arrête aux descentes complètes
+                break
+            samples.append(sample[:3])
+            for extension, n in sample[3].items():
+                by_extension[extension] = by_extension.get(extension, 0) + n
+
+        probes = len(samples)
+        files, folders, size_mb = (self._interval([sample[i] for sample in samples])
+                                   for i in range(3))
+        return ScanEstimate(files, folders, size_mb,
+                            {extension: n / probes for extension, n in by_extension.items()},
+                            probes, len(self._listings), time.perf_counter() - start)
+
+    def _probe(self, budget: bool = True) -> Optional[Tuple[float, float, float, Dict[str, float]]]:
+        """
+        Une descente aléatoire, de la racine à un dossier sans sous-dossier
+
+        Args:
+            budget: Abandonner la descente plutôt que lire un dossier au-delà de max_reads
+
+        Returns:
+            Tuple (fichiers, dossiers, Mo, fichiers par extension) pondérés, ou None
+            si la descente a été abandonnée
+        """
+        weight, directory, depth = 1.0, self.scanner.root_path, 0
+        files = folders = size = 0.0
+        by_extension: Dict[str, float] = {}
+        while True:
+            if budget and directory not in self._listings and len(self._listings) >= self.max_reads:
+                return None
+            count, nbytes, extensions, subdirs = self.listing(directory, depth)
+            files += weight * count
+            size += weight * nbytes
+            folders += weight * len(subdirs)
+            for extension, n in extensions.items():
+                by_extension[extension] = by_extension.get(extension, 0) + weight * n
+            if not subdirs:
+                return files, folders, size / (1024 * 1024), by_extension
+            weight *= len(subdirs)
+            directory, depth = self.rng.choice(subdirs), depth + 1
+
+    @staticmethod
+    def _interval(values: List[float]) -> Interval:
+        """Moyenne des descentes et intervalle de confiance (loi normale)"""
+        n = len(values)
+        mean = sum(values) / n
+        variance = sum((value - mean) ** 2 for value in values) / (n - 1)
+        margin = Z_95 * math.sqrt(variance / n)
+        return Interval(mean, max(0.0, mean - margin), mean + margin)
+
+
+class ScanProgress:
+    """Avancement et temps restant d'un scan, rapportés à une estimation préalable"""
+
+    def __init__(self, expected_files: float, callback: Optional[Callable] = None,
+                 interval: float = PROGRESS_INTERVAL):
+        """
+        Initialise le suivi
+
+        Args:
+            expected_files: Nombre de fichiers attendu (ScanEstimate.files.value)
+            callback: Fonction appelée avec (fichiers vus, fichiers attendus, secondes
+                      restantes ou None) ; par défaut, un message est affiché
+            interval: Délai minimal entre deux rapports (secondes)
+        """
+        self.expected = max(1.0, expected_files)
+        self.callback = callback
+        self.interval = interval
+        self.done = 0
+        self.started = time.monotonic()
+        self._last_report = self.started
+
+    def advance(self, count: int = 1):
+        """
+        Comptabilise des fichiers scannés (l'horloge n'est lue que tous les quelques centaines)
+
+        Args:
+            count: Nombre de fichiers
+        """
+        before = self.done
+        self.done += count
+        if before // PROGRESS_CHECK_EVERY != self.done // PROGRESS_CHECK_EVERY:
+            now = time.monotonic()
+            if now - self._last_report >= self.interval:
+                self._last_report = now
+                self._report(now)
+
+    def eta(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Temps restant estimé
+
+        Args:
+            now: Instant courant (time.monotonic)
+
+        Returns:
+            Secondes restantes, ou None si l'estimation est déjà dépassée
+        """
+        elapsed = (now if now is not None else time.monotonic()) - self.started
+        if not self.done or self.done >= self.expected:
+            return None
+        return elapsed * (self.expected - self.done) / self.done
+
+    def _report(self, now: float):
+        eta = self.eta(now)
+        if self.callback is not None:
+            self.callback(self.done, self.expected, eta)
+            return
+        if eta is None:
+            print(f"⏳ {self.done} fichiers (estimation de ~{self.expected:.0f} dépassée)")
+        else:
+            print(f"⏳ {min(99, 100 * self.done / self.expected):.0f}% - {self.done} / "
+                  f"~{self.expected:.0f} fichiers, reste ~{_format_duration(eta)}")
+
+
+def _format_duration(seconds: float) -> str:
+    """Durée lisible ('2 h 05 min', '3 min 20 s', '12 s')"""
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600} h {seconds % 3600 // 60:02d} min"
+    if seconds >= 60:
+        return f"{seconds // 60} min {seconds % 60:02d} s"
+    return f"{seconds} s"
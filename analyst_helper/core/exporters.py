@@ -0,0 +1,182 @@
+"""
+Module d'export en flux des résultats de scan
+Écrit les lignes une à une (NDJSON, JSON, CSV), avec compression gzip ou xz optionnelle
+"""
+
+import csv
+import gzip
+import json
+import lzma
+from datetime import datetime
+from operator import attrgetter
+from typing import Dict, Iterable, Optional, TextIO
+
+from .scanner import FileRecord
+
+FORMATS = ('ndjson', 'json', 'csv')
+COMPRESSIONS = ('gzip', 'xz')
+
+_FORMAT_SUFFIXES = {'.ndjson': 'ndjson', '.jsonl': 'ndjson', '.json': 'json', '.csv': 'csv'}
+_COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.xz': 'xz'}
+
+# Extraction de toutes les valeurs exportées en un seul appel (pas de dict intermédiaire)
+_row_values = attrgetter(*FileRecord.EXPORT_FIELDS)
+
+
+def detect_format(output_path: str):
+    """
+    Déduit le format et la compression de l'extension du fichier
+
+    Args:
+        output_path: Chemin du fichier de sortie (ex: fichiers.ndjson.gz)
+
+    Returns:
+        Tuple (format, compression) ; chaque valeur peut être None si non reconnue
+    """
+    lower = output_path.lower()
+    compression = None
+    for suffix, name in _COMPRESSION_SUFFIXES.items():
+        if lower.endswith(suffix):
+            compression = name
+            lower = lower[:-len(suffix)]
+            break
+
+    file_format = None
+    for suffix, name in _FORMAT_SUFFIXES.items():
+        if lower.endswith(suffix):
+            file_format = name
+            break
+
+    return file_format, compression
+
+
+def open_output(output_path: str, compression: Optional[str] = None,
+                encoding: str = 'utf-8', newline: Optional[str] = None) -> TextIO:
+    """
+    Ouvre un fichier texte en écriture, compressé ou non
+
+    Args:
+        output_path: Chemin du fichier de sortie
+        compression: None, 'gzip' ou 'xz'
+        encoding: Encodage du texte
+        newline: Gestion des fins de ligne (voir open())
+
+    Returns:
+        Flux texte
+    """
+    if compression is None:
+        return open(output_path, 'w', encoding=encoding, newline=newline,
+                    buffering=1024 * 1024)
+    if compression == 'gzip':
+        return gzip.open(output_path, 'wt', encoding=encoding, newline=newline, compresslevel=6)
+    if compression == 'xz':
+        return lzma.open(output_path, 'wt', encoding=encoding, newline=newline, preset=3)
+    raise ValueError(f"Compression inconnue: {compression} (attendu: {', '.join(COMPRESSIONS)})")
+
+
+def write_ndjson(files: Iterable[FileRecord], stream: TextIO) -> int:
+    """
+    Écrit un fichier par ligne au format JSON (NDJSON)
+
+    Args:
+        files: Fichiers à exporter (liste, FileTable ou flux)
+        stream: Flux texte de sortie
+
+    Returns:
+        Nombre de lignes écrites
+    """
+    fields = FileRecord.EXPORT_FIELDS
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    count = 0
+    for file in files:
+        stream.write(dumps(dict(zip(fields, _row_values(file)))))
+        stream.write('\n')
+        count += 1
+    return count
+
+
+def write_json(files: Iterable[FileRecord], stream: TextIO, root_path: str,
+               stats: Optional[Dict] = None) -> int:
+    """
+    Écrit la même structure que FolderScanner.export_to_json, fichiers en flux
+
+    Les statistiques sont écrites après la liste des fichiers, pour refléter un
+    scan en flux terminé.
+
+    Args:
+        files: Fichiers à exporter (liste, FileTable ou flux)
+        stream: Flux texte de sortie
+        root_path: Dossier racine du scan
+        stats: Statistiques du scan (lues une fois les fichiers écrits)
+
+    Returns:
+        Nombre de fichiers écrits
+    """
+    fields = FileRecord.EXPORT_FIELDS
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    stream.write('{"root_path": ' + dumps(str(root_path)))
+    stream.write(', "scan_date": ' + dumps(datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    stream.write(', "files": [')
+
+    count = 0
+    for file in files:
+        stream.write(',\n' if count else '\n')
+        stream.write(dumps(dict(zip(fields, _row_values(file)))))
+        count += 1
+
+    stream.write('\n], "stats": ' + dumps(stats if stats is not None else {}) + '}\n')
+    return count
+
+
+def write_csv(files: Iterable[FileRecord], stream: TextIO) -> int:
+    """
+    Écrit les fichiers au format CSV (mêmes colonnes que FolderScanner.export_to_csv)
+
+    Args:
+        files: Fichiers à exporter (liste, FileTable ou flux)
+        stream: Flux texte de sortie (ouvert avec newline='')
+
+    Returns:
+        Nombre de lignes écrites (hors en-tête)
+    """
+    writer = csv.writer(stream)
+    writer.writerow(FileRecord.EXPORT_FIELDS)
+    count = 0
+    for file in files:
+        writer.writerow(_row_values(file))
+        count += 1
+    return count
+
+
+def export_stream(files: Iterable[FileRecord], output_path: str,
+                  file_format: Optional[str] = None, compression: Optional[str] = None,
+                  root_path: str = '', stats: Optional[Dict] = None) -> int:
+    """
+    Exporte des fichiers en flux vers un fichier NDJSON, JSON ou CSV
+
+    Args:
+        files: Fichiers à exporter (liste, FileTable ou flux)
+        output_path: Chemin du fichier de sortie
+        file_format: 'ndjson', 'json' ou 'csv' (déduit de l'extension si None)
+        compression: None, 'gzip' ou 'xz' (déduit de l'extension si None)
+        root_path: Dossier racine du scan (format json)
+        stats: Statistiques du scan (format json)
+
+    Returns:
+        Nombre de fichiers exportés
+    """
+    detected_format, detected_compression = detect_format(output_path)
+    file_format = file_format or detected_format or 'ndjson'
+    compression = compression or detected_compression
+
+    if file_format not in FORMATS:
+        raise ValueError(f"Format inconnu: {file_format} (attendu: {', '.join(FORMATS)})")
+
+    if file_format == 'csv':
+        with open_output(output_path, compression, encoding='utf-8-sig', newline='') as stream:
+            return write_csv(files, stream)
+
+    with open_output(output_path, compression) as stream:
+        if file_format == 'json':
+            return write_json(files, stream, root_path, stats)
+        return write_ndjson(files, stream)
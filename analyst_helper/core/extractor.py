@@ -6,9 +6,10 @@ Supporte les formats .msg (Outlook) et .eml (standard)
 import os
 import re
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterable, Any
 from datetime import datetime
 from dataclasses import dataclass
+from ..utils.names import NameRegistry
 
 
 @dataclass
@@ -28,14 +29,18 @@ class AttachmentInfo:
 class AttachmentExtractor:
     """Extracteur de pièces jointes d'emails"""
 
-    def __init__(self, output_dir: str):
+    def __init__(self, output_dir: str, names: Optional[NameRegistry] = None):
         """
         Initialise l'extracteur
 
         Args:
             output_dir: Dossier de sortie pour les pièces jointes
+            names: Registre des noms attribués, à partager avec un FileClassifier
+                   écrivant dans les mêmes dossiers (par défaut : registre propre)
         """
         self.output_dir = Path(output_dir)
+        # Noms déjà pris dans chaque dossier de destination
+        self.names = names or NameRegistry()
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.attachments: List[AttachmentInfo] = []
         self.stats = {
@@ -110,9 +115,9 @@ class AttachmentExtractor:
 
                 # Si c'est un email imbriqué
                 if filename.lower().endswith('.msg'):
-                    # Sauvegarder temporairement
-                    temp_path = self.output_dir / f"temp_{filename}"
-                    attachment.save(customPath=str(self.output_dir), customFilename=f"temp_{filename}")
+                    # Sauvegarder temporairement (nom réservé : ni pièce jointe ni autre email écrasé)
+                    temp_path = self._get_unique_path(self.output_dir / f"temp_{filename}")
+                    attachment.save(customPath=str(self.output_dir), customFilename=temp_path.name)
 
                     # Extraire récursivement
                     nested = self._extract_msg_recursive(
@@ -228,22 +233,28 @@ class AttachmentExtractor:
             self.stats['errors'] += 1
             return []
 
-    def extract_all(self, files: List[str], show_progress: bool = True) -> List[AttachmentInfo]:
+    def extract_all(self, files: Iterable[Any], show_progress: bool = True) -> List[AttachmentInfo]:
         """
         Extrait les pièces jointes de tous les emails
 
         Args:
-            files: Liste des chemins d'emails
+            files: Chemins d'emails ou FileInfo (liste ou flux, par exemple
+                   scanner.iter_scan()) ; les fichiers non-emails sont ignorés
             show_progress: Afficher la progression
 
         Returns:
             Liste de toutes les pièces jointes extraites
         """
         all_attachments = []
+        total = f"/{len(files)}" if hasattr(files, '__len__') else ""
 
-        for i, file_path in enumerate(files, 1):
+        for i, item in enumerate(files, 1):
+            # Membre d'archive : absent du disque, pas d'extraction possible
+            if getattr(item, 'archive_path', None) is not None:
+                continue
+            file_path = getattr(item, 'path', item)
             if show_progress:
-                print(f"📧 [{i}/{len(files)}] {Path(file_path).name}")
+                print(f"📧 [{i}{total}] {Path(file_path).name}")
 
             ext = Path(file_path).suffix.lower()
 
@@ -290,27 +301,33 @@ class AttachmentExtractor:
 
     def _get_unique_path(self, path: Path) -> Path:
         """
-        Génère un chemin unique si le fichier existe déjà
+        Génère un chemin unique si le fichier existe déjà (voir NameRegistry)
 
         Args:
             path: Chemin original
 
         Returns:
-            Chemin unique
+            Chemin unique, réservé pour cette extraction
+        """
+        return self.names.allocate(path)
+
+    def save_catalog(self, db_path: str, scan_id: Optional[int] = None) -> int:
         """
-        if not path.exists():
-            return path
-
-        stem = path.stem
-        suffix = path.suffix
-        parent = path.parent
-        counter = 1
-
-        while True:
-            new_path = parent / f"{stem}_{counter}{suffix}"
-            if not new_path.exists():
-                return new_path
-            counter += 1
+        Enregistre les pièces jointes extraites dans un catalogue SQLite
+
+        Args:
+            db_path: Chemin de la base (voir FolderScanner.save_catalog)
+            scan_id: Scan dont proviennent les emails (optionnel)
+
+        Returns:
+            Nombre de pièces jointes enregistrées
+        """
+        from .catalog import ScanCatalog
+
+        with ScanCatalog(db_path) as catalog:
+            count = catalog.add_attachments(self.attachments, scan_id)
+        print(f"🗃️  Catalogue: {db_path} ({count} pièces jointes)")
+        return count
 
     @staticmethod
     def clean_filename(filename: str) -> str:
@@ -0,0 +1,299 @@
+"""
+Module d'index des fichiers scannés
+Requêtes par taille, date, extension, type et dossier sans parcourir tous les fichiers
+"""
+
+import heapq
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..utils.filters import ScanFilter
+
+# Colonnes triées utilisables par order_by
+ORDER_COLUMNS = ('size', 'mtime')
+
+# Borne haute des chaînes commençant par un préfixe (tri lexicographique)
+_PREFIX_END = '\U0010ffff'
+
+
+class FileIndex:
+    """Index en mémoire d'un résultat de scan (liste de FileInfo ou FileTable)
+
+    Construit en une passe, l'index garde :
+        - les numéros de ligne triés par taille et par date de modification,
+          avec les valeurs triées correspondantes (recherche dichotomique) ;
+        - les lignes de chaque extension et de chaque type (index inversés) ;
+        - les dossiers triés, avec les lignes de chaque dossier (préfixe de chemin).
+
+    Une requête part du critère le plus sélectif et vérifie les autres sur les
+    colonnes, ligne par ligne : son coût dépend du nombre de candidats et non
+    du nombre de fichiers. L'index est un instantané : il faut le reconstruire
+    si les fichiers changent (rescan, surveillance).
+    """
+
+    def __init__(self, files: Sequence):
+        """
+        Construit l'index
+
+        Args:
+            files: Fichiers scannés (liste de FileInfo/FileRow ou FileTable) ;
+                   les numéros de ligne sont leurs positions dans cette séquence
+        """
+        from .table import FileTable, StringDictionary
+
+        self.files = files
+        if isinstance(files, FileTable):
+            self._sizes, self._mtimes = files.sizes, files.mtimes
+            if all(isinstance(strings, StringDictionary)
+                   for strings in (files.extensions, files.file_types, files.dirs)):
+                # Colonnes déjà encodées : aucune copie
+                self._ext_ids, self._type_ids, self._dir_ids = \
+                    files.ext_ids, files.type_ids, files.dir_ids
+                extensions, file_types, dirs = files.extensions, files.file_types, files.dirs
+            else:
+                # Snapshot : identifiants dans une StringPool commune à toutes les
+                # chaînes (noms compris), recodés en dictionnaires compacts
+                extensions, self._ext_ids = self._recode(files.ext_ids, files.extensions)
+                file_types, self._type_ids = self._recode(files.type_ids, files.file_types)
+                dirs, self._dir_ids = self._recode(files.dir_ids, files.dirs)
+        else:
+            extensions, file_types, dirs = StringDictionary(), StringDictionary(), StringDictionary()
+            self._sizes, self._mtimes = array('q'), array('d')
+            self._ext_ids, self._type_ids, self._dir_ids = array('I'), array('I'), array('I')
+            for file in files:
+                self._sizes.append(file.size_bytes)
+                self._mtimes.append(file.modified_ts)
+                self._ext_ids.append(extensions.encode(file.extension))
+                self._type_ids.append(file_types.encode(file.file_type))
+                self._dir_ids.append(dirs.encode(os.path.dirname(file.relative_path)))
+
+        self._extensions: Dict[str, int] = {value: code for code, value in enumerate(extensions.values)}
+        self._file_types: Dict[str, int] = {value: code for code, value in enumerate(file_types.values)}
+        self._ext_rows = self._invert(self._ext_ids, len(extensions))
+        self._type_rows = self._invert(self._type_ids, len(file_types))
+        dir_rows = self._invert(self._dir_ids, len(dirs))
+
+        # Dossiers triés (séparateur '/') et leurs codes, pour les requêtes par préfixe
+        by_path = sorted((value.replace(os.sep, '/'), code) for code, value in enumerate(dirs.values))
+        self._dir_paths = [path for path, _ in by_path]
+        self._dir_codes = array('I', (code for _, code in by_path))
+        self._dir_rows = dir_rows
+
+        self._order = {
+            'size': self._sorted(self._sizes, 'q'),
+            'mtime': self._sorted(self._mtimes, 'd'),
+        }
+
+    @staticmethod
+    def _recode(ids: Sequence[int], strings: Sequence[str]):
+        """
+        Recode une colonne d'identifiants en codes consécutifs
+
+        Args:
+            ids: Identifiants de chaînes (une valeur par ligne)
+            strings: Table des chaînes (StringPool d'un snapshot...)
+
+        Returns:
+            Tuple (StringDictionary des valeurs présentes, codes par ligne)
+        """
+        from .table import StringDictionary
+
+        dictionary = StringDictionary()
+        codes = array('I')
+        mapping: Dict[int, int] = {}
+        for string_id in ids:
+            code = mapping.get(string_id)
+            if code is None:
+                code = mapping[string_id] = dictionary.encode(strings[string_id])
+            codes.append(code)
+        return dictionary, codes
+
+    @staticmethod
+    def _invert(codes: Sequence[int], count: int) -> List[array]:
+        """Lignes de chaque code, dans l'ordre des lignes"""
+        rows = [array('I') for _ in range(count)]
+        for row, code in enumerate(codes):
+            rows[code].append(row)
+        return rows
+
+    @staticmethod
+    def _sorted(column: Sequence, typecode: str) -> Tuple[array, array]:
+        """Numéros de ligne triés selon une colonne, et valeurs triées"""
+        order = array('I', sorted(range(len(column)), key=column.__getitem__))
+        return order, array(typecode, (column[row] for row in order))
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def query(self, where: Optional[ScanFilter] = None, under: Optional[str] = None,
+              order_by: Optional[str] = None, descending: bool = False,
+              limit: Optional[int] = None, **criteria) -> List:
+        """
+        Sélectionne des fichiers en combinant les index
+
+        Exemples :
+            index.query(order_by='size', descending=True, limit=20)
+            index.query(modified_after='2024-01-01', modified_before='2024-04-01')
+            index.query(extensions=['.dwg'], under='Projets/Lot 2')
+
+        Args:
+            where: Critères (ScanFilter) ; sinon, arguments de ScanFilter en
+                   mots-clés (extensions, file_types, min_size, max_size,
+                   modified_after, modified_before)
+            under: Dossier relatif à la racine : fichiers de ce dossier et de ses sous-dossiers
+            order_by: 'size' ou 'mtime' (par défaut : ordre du scan)
+            descending: Ordre décroissant
+            limit: Nombre maximal de fichiers
+            **criteria: Arguments de ScanFilter (si where n'est pas fourni)
+
+        Returns:
+            Liste de fichiers (éléments de la séquence indexée)
+        """
+        files = self.files
+        return [files[row] for row in self.query_rows(where, under, order_by, descending,
+                                                      limit, **criteria)]
+
+    def count(self, where: Optional[ScanFilter] = None, under: Optional[str] = None,
+              **criteria) -> int:
+        """
+        Nombre de fichiers satisfaisant des critères (voir query())
+
+        Returns:
+            Nombre de fichiers
+        """
+        return len(self.query_rows(where, under, **criteria))
+
+    def query_rows(self, where: Optional[ScanFilter] = None, under: Optional[str] = None,
+                   order_by: Optional[str] = None, descending: bool = False,
+                   limit: Optional[int] = None, **criteria) -> List[int]:
+        """
+        Numéros de ligne des fichiers sélectionnés (voir query())
+
+        Returns:
+            Liste de numéros de ligne
+        """
+        if order_by is not None and order_by not in ORDER_COLUMNS:
+            raise ValueError(f"order_by inconnu: {order_by} (attendu : {', '.join(ORDER_COLUMNS)})")
+        flt = where if where is not None else ScanFilter(**criteria)
+
+        # Chaque critère donne un plan : (nombre de candidats, colonne vérifiée, candidats)
+        plans = []
+        checks = []
+        if flt.extensions is not None:
+            codes = {self._extensions[e] for e in flt.extensions if e in self._extensions}
+            plans.append(self._code_plan(self._ext_ids, self._ext_rows, codes))
+            checks.append((self._ext_ids, codes))
+        if flt.file_types is not None:
+            codes = {self._file_types[t] for t in flt.file_types if t in self._file_types}
+            plans.append(self._code_plan(self._type_ids, self._type_rows, codes))
+            checks.append((self._type_ids, codes))
+        if under is not None:
+            codes = self._dirs_under(under)
+            plans.append(self._code_plan(self._dir_ids, self._dir_rows, codes))
+            checks.append((self._dir_ids, codes))
+
+        ranges = {}
+        if flt.min_size is not None or flt.max_size is not None:
+            ranges['size'] = self._range('size', flt.min_size, flt.max_size, True)
+        if flt.modified_after is not None or flt.modified_before is not None:
+            ranges['mtime'] = self._range('mtime', flt.modified_after, flt.modified_before, False)
+        for name, (lo, hi) in ranges.items():
+            plans.append((hi - lo, name, None))
+            # Valeurs extrêmes de la plage : une ligne en fait partie si sa valeur est comprise entre elles
+            values = self._order[name][1]
+            bounds = (values[lo], values[hi - 1]) if hi > lo else (1, 0)
+            checks.append((self._sizes if name == 'size' else self._mtimes, bounds))
+
+        def accepted(row: int, skip) -> bool:
+            for column, condition in checks:
+                if column is skip:
+                    continue
+                if isinstance(condition, tuple):
+                    if not condition[0] <= column[row] <= condition[1]:
+                        return False
+                elif column[row] not in condition:
+                    return False
+            return True
+
+        plan = min(plans, key=lambda p: p[0]) if plans else (len(self), None, range(len(self)))
+        if order_by is not None and self._walk_sorted(order_by, plan, ranges, limit):
+            # Parcours de l'ordre trié, arrêté dès que limit lignes sont retenues
+            lo, hi = ranges.get(order_by, (0, len(self)))
+            order = self._order[order_by][0]
+            walked = self._sizes if order_by == 'size' else self._mtimes
+            result = []
+            for position in (range(hi - 1, lo - 1, -1) if descending else range(lo, hi)):
+                row = order[position]
+                if accepted(row, walked):
+                    result.append(row)
+                    if limit is not None and len(result) >= limit:
+                        break
+            return result
+
+        count, key, rows = plan
+        if key in ORDER_COLUMNS:
+            lo, hi = ranges[key]
+            rows = sorted(self._order[key][0][lo:hi])
+            key = self._sizes if key == 'size' else self._mtimes
+        result = [row for row in rows if accepted(row, key)]
+        if order_by is not None:
+            sort_key = (self._sizes if order_by == 'size' else self._mtimes).__getitem__
+            if limit is not None:
+                select = heapq.nlargest if descending else heapq.nsmallest
+                return select(limit, result, key=sort_key)
+            result.sort(key=sort_key, reverse=descending)
+        return result[:limit] if limit is not None else result
+
+    def _walk_sorted(self, order_by: str, plan: tuple, ranges: Dict[str, Tuple[int, int]],
+                     limit: Optional[int]) -> bool:
+        """
+        Choisit entre parcourir l'ordre trié de order_by et trier les candidats du plan
+
+        Le parcours trié s'arrête après limit lignes retenues : si les critères
+        retiennent une fraction p des lignes parcourues, il en lit environ
+        limit / p, contre tous les candidats du plan pour un tri.
+        """
+        count, key, _ = plan
+        if key is None or key == order_by:
+            return True
+        if limit is None or count == 0:
+            return False
+        lo, hi = ranges.get(order_by, (0, len(self)))
+        return limit * (hi - lo) < count * count
+
+    @staticmethod
+    def _code_plan(column: Sequence[int], rows_by_code: List[array], codes) -> tuple:
+        """Plan d'un index inversé : lignes de tous les codes, dans l'ordre des lignes"""
+        selected = [rows_by_code[code] for code in codes]
+        if len(selected) == 1:
+            rows = selected[0]
+        else:
+            rows = sorted(row for part in selected for row in part)
+        return len(rows), column, rows
+
+    def _dirs_under(self, under: str) -> set:
+        """Codes des dossiers égaux à `under` ou situés en dessous"""
+        prefix = under.replace(os.sep, '/').strip('/')
+        paths = self._dir_paths
+        if not prefix:
+            return set(self._dir_codes)
+        codes = set()
+        i = bisect_left(paths, prefix)
+        if i < len(paths) and paths[i] == prefix:
+            codes.add(self._dir_codes[i])
+        start = bisect_left(paths, prefix + '/')
+        end = bisect_right(paths, prefix + '/' + _PREFIX_END)
+        codes.update(self._dir_codes[start:end])
+        return codes
+
+    def _range(self, column: str, low, high, inclusive_high: bool) -> Tuple[int, int]:
+        """Positions [lo, hi[ de l'ordre trié d'une colonne comprises entre deux bornes"""
+        values = self._order[column][1]
+        lo = bisect_left(values, low) if low is not None else 0
+        if high is None:
+            hi = len(values)
+        else:
+            hi = bisect_right(values, high) if inclusive_high else bisect_left(values, high)
+        return lo, max(lo, hi)
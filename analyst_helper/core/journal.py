@@ -0,0 +1,180 @@
+"""
+Module de journal de classement
+Journal des copies prévues et terminées, pour reprendre un classement interrompu
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from .transfer import partial_path
+
+# Journal par défaut, à la racine du dossier de sortie
+JOURNAL_NAME = '.classification_journal.ndjson'
+
+# Écart toléré entre dates de modification (systèmes de fichiers à résolution de 2 s : FAT, SMB...)
+MTIME_WINDOW = 2.0
+
+
+class JournalEntry:
+    """Copie enregistrée dans le journal"""
+
+    __slots__ = ('source', 'destination', 'size', 'mtime', 'done')
+
+    def __init__(self, source: str, destination: str, size: int, mtime: float,
+                 done: bool = False):
+        self.source = source
+        self.destination = destination
+        self.size = size
+        self.mtime = mtime
+        self.done = done
+
+    def unchanged(self, size: int, mtime: float) -> bool:
+        """Le fichier source a encore la taille et la date enregistrées"""
+        return size == self.size and abs(mtime - self.mtime) <= MTIME_WINDOW
+
+    def verify(self) -> bool:
+        """
+        Vérifie la destination : présente, avec la taille et la date de la source
+
+        Returns:
+            True si la copie (ou le lien) est complète
+        """
+        try:
+            stat = os.stat(self.destination)
+        except OSError:
+            return False
+        return self.unchanged(stat.st_size, stat.st_mtime)
+
+
+class CopyJournal:
+    """Journal des copies d'un classement (fichier NDJSON en ajout seul)
+
+    Chaque copie est notée « prévue » (source, destination, taille, date)
+    avant de commencer, puis « terminée » après le renommage du fichier
+    temporaire : un fichier de destination est donc complet ou absent.
+    Chaque ligne est écrite sans tampon applicatif : après un arrêt brutal
+    du programme, le journal contient toutes les copies commencées (une
+    dernière ligne tronquée est ignorée). Le fichier est synchronisé sur
+    disque à la fermeture.
+
+    En reprise, le journal est relu puis réécrit compacté (fichier
+    temporaire puis renommage) et les fichiers temporaires des copies
+    interrompues sont supprimés. Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Ouvre le journal
+
+        Args:
+            path: Chemin du journal
+            resume: Relire le journal existant (sinon, il est remplacé)
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, JournalEntry] = {}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            self._load()
+            self._compact()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def previous(self, source: str) -> Optional[JournalEntry]:
+        """
+        Copie d'un fichier enregistrée par un classement précédent
+
+        Args:
+            source: Chemin du fichier source
+
+        Returns:
+            Entrée du journal, ou None si le fichier n'y figure pas
+        """
+        return self.entries.get(source)
+
+    def plan(self, source: str, destination: str, size: int, mtime: float):
+        """
+        Note une copie avant de la commencer
+
+        Args:
+            source: Fichier source
+            destination: Chemin de destination
+            size: Taille de la source (octets)
+            mtime: Date de modification de la source
+        """
+        self._write({'op': 'plan', 'source': source, 'dest': destination,
+                     'size': size, 'mtime': mtime})
+
+    def done(self, source: str, method: str):
+        """
+        Note une copie terminée
+
+        Args:
+            source: Fichier source
+            method: Méthode utilisée (voir FileTransfer.transfer)
+        """
+        self._write({'op': 'done', 'source': source, 'method': method})
+
+    def close(self):
+        """Synchronise le journal sur disque et le ferme"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def __enter__(self) -> 'CopyJournal':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _write(self, record: dict):
+        """Ajoute une ligne et la transmet au système"""
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def _load(self):
+        """Relit le journal (dernier état de chaque fichier source)"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Ligne tronquée par l'arrêt du programme
+                    continue
+                if record.get('op') == 'plan':
+                    self.entries[record['source']] = JournalEntry(
+                        record['source'], record['dest'], record['size'], record['mtime'])
+                elif record.get('op') == 'done':
+                    entry = self.entries.get(record['source'])
+                    if entry is not None:
+                        entry.done = True
+
+        # Copies interrompues : fichiers temporaires à supprimer
+        for entry in self.entries.values():
+            if not entry.done:
+                try:
+                    os.remove(partial_path(entry.destination))
+                except FileNotFoundError:
+                    pass
+
+    def _compact(self):
+        """Réécrit le journal avec une ligne 'plan' (et 'done') par fichier source"""
+        temporary = self.path.with_name(self.path.name + '.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps({'op': 'plan', 'source': entry.source,
+                                    'dest': entry.destination, 'size': entry.size,
+                                    'mtime': entry.mtime}, ensure_ascii=False) + '\n')
+                if entry.done:
+                    f.write(json.dumps({'op': 'done', 'source': entry.source, 'method': 'resumed'},
+                                       ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
@@ -0,0 +1,287 @@
+"""
+Module de manifeste de scan persistant
+Mémorise le contenu de chaque dossier pour des rescans incrémentaux
+"""
+
+import os
+import pickle
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class DirectoryListing:
+    """Contenu mémorisé d'un dossier, dans l'ordre de os.scandir"""
+
+    __slots__ = ('mtime_ns', 'names', 'kinds', 'sizes', 'mtimes', 'ctimes', 'inodes', 'extra')
+
+    KIND_FILE = 0
+    KIND_DIR = 1
+
+    def __init__(self, mtime_ns: int):
+        """
+        Initialise un contenu de dossier vide
+
+        Args:
+            mtime_ns: Date de modification du dossier (ns)
+        """
+        self.mtime_ns = mtime_ns
+        self.names: List[str] = []
+        self.kinds = bytearray()
+        self.sizes = array('q')
+        self.mtimes = array('q')
+        self.ctimes = array('q')
+        self.inodes = array('Q')
+        # Champs dérivés par fichier (ex: empreintes), indexés par nom
+        self.extra: Dict[str, Dict] = {}
+
+    def add_file(self, name: str, stat: os.stat_result):
+        """
+        Ajoute un fichier
+
+        Args:
+            name: Nom du fichier
+            stat: Résultat de stat() du fichier
+        """
+        self.names.append(name)
+        self.kinds.append(self.KIND_FILE)
+        self.sizes.append(stat.st_size)
+        self.mtimes.append(stat.st_mtime_ns)
+        self.ctimes.append(stat.st_ctime_ns)
+        self.inodes.append(stat.st_ino)
+
+    def add_dir(self, name: str):
+        """
+        Ajoute un sous-dossier
+
+        Args:
+            name: Nom du sous-dossier
+        """
+        self.names.append(name)
+        self.kinds.append(self.KIND_DIR)
+        self.sizes.append(0)
+        self.mtimes.append(0)
+        self.ctimes.append(0)
+        self.inodes.append(0)
+
+    def file_signatures(self) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Retourne la signature (taille, mtime_ns, inode) de chaque fichier
+
+        Returns:
+            Dictionnaire {nom: signature}
+        """
+        return {
+            self.names[i]: (self.sizes[i], self.mtimes[i], self.inodes[i])
+            for i, kind in enumerate(self.kinds) if kind == self.KIND_FILE
+        }
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+@dataclass
+class RescanResult:
+    """Résultat d'un rescan incrémental"""
+    files: List = field(default_factory=list)
+    added: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    modified: Set[str] = field(default_factory=set)
+
+
+class ScanManifest:
+    """Manifeste d'un scan : contenu de chaque dossier, indexé par chemin relatif
+
+    Sur disque, toutes les entrées sont stockées en colonnes (tableaux array et
+    noms concaténés) pour que le chargement d'un million d'entrées reste bien
+    en dessous de la seconde ; les DirectoryListing ne sont reconstruits qu'à
+    la demande, dossier par dossier.
+    """
+
+    VERSION = 3
+
+    def __init__(self, root_path: str, options: Optional[Dict] = None):
+        """
+        Initialise un manifeste vide
+
+        Args:
+            root_path: Dossier racine scanné
+            options: Options du scan (exclusions...), comparées avant réutilisation
+        """
+        self.root_path = str(root_path)
+        self.options = options or {}
+        self.directories: Dict[str, DirectoryListing] = {}
+        self._columns: Optional[Dict] = None
+        self._index: Dict[str, int] = {}
+
+    def get(self, rel_dir: str) -> Optional[DirectoryListing]:
+        """
+        Retourne le contenu mémorisé d'un dossier
+
+        Args:
+            rel_dir: Chemin relatif du dossier ('' pour la racine)
+
+        Returns:
+            DirectoryListing ou None si le dossier est inconnu
+        """
+        listing = self.directories.get(rel_dir)
+        if listing is None and rel_dir in self._index:
+            listing = self._materialize(self._index[rel_dir])
+            self.directories[rel_dir] = listing
+        return listing
+
+    def dir_paths(self) -> Set[str]:
+        """
+        Retourne les chemins relatifs de tous les dossiers connus
+
+        Returns:
+            Ensemble de chemins relatifs
+        """
+        return self.directories.keys() | self._index.keys()
+
+    def is_compatible(self, root_path: str, options: Dict) -> bool:
+        """
+        Vérifie que le manifeste peut servir pour un scan donné
+
+        Args:
+            root_path: Dossier racine du scan
+            options: Options du scan
+
+        Returns:
+            True si la racine et les options sont identiques
+        """
+        return self.root_path == str(root_path) and self.options == options
+
+    def save(self, path: str):
+        """
+        Enregistre le manifeste en colonnes (écriture atomique)
+
+        Args:
+            path: Chemin du fichier manifeste
+        """
+        dir_paths = sorted(self.dir_paths())
+        columns = {
+            'dir_paths': dir_paths,
+            'dir_mtimes': array('q'),
+            'dir_starts': array('Q'),
+            'names': [],
+            'kinds': bytearray(),
+            'sizes': array('q'),
+            'mtimes': array('q'),
+            'ctimes': array('q'),
+            'inodes': array('Q'),
+            'extra': {},
+        }
+
+        for rel_dir in dir_paths:
+            listing = self.get(rel_dir)
+            columns['dir_mtimes'].append(listing.mtime_ns)
+            columns['dir_starts'].append(len(columns['kinds']))
+            columns['names'].extend(listing.names)
+            columns['kinds'].extend(listing.kinds)
+            columns['sizes'].extend(listing.sizes)
+            columns['mtimes'].extend(listing.mtimes)
+            columns['ctimes'].extend(listing.ctimes)
+            columns['inodes'].extend(listing.inodes)
+            if listing.extra:
+                columns['extra'][rel_dir] = listing.extra
+
+        columns['dir_starts'].append(len(columns['kinds']))
+        columns['names'] = '\0'.join(columns['names'])
+        columns['kinds'] = bytes(columns['kinds'])
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(
+                (self.VERSION, self.root_path, self.options, columns),
+                f, protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['ScanManifest']:
+        """
+        Charge un manifeste
+
+        Args:
+            path: Chemin du fichier manifeste
+
+        Returns:
+            ScanManifest, ou None si absent, illisible ou d'une autre version
+        """
+        try:
+            with open(path, 'rb') as f:
+                version, root_path, options, columns = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️  Manifeste illisible, scan complet: {e}")
+            return None
+
+        if version != cls.VERSION:
+            return None
+
+        manifest = cls(root_path, options)
+        columns['names'] = columns['names'].split('\0') if columns['names'] else []
+        manifest._columns = columns
+        manifest._index = {rel_dir: i for i, rel_dir in enumerate(columns['dir_paths'])}
+        return manifest
+
+    def _materialize(self, index: int) -> DirectoryListing:
+        """
+        Reconstruit le contenu d'un dossier depuis les colonnes chargées
+
+        Args:
+            index: Index du dossier dans les colonnes
+
+        Returns:
+            DirectoryListing
+        """
+        columns = self._columns
+        start, end = columns['dir_starts'][index], columns['dir_starts'][index + 1]
+
+        listing = DirectoryListing(columns['dir_mtimes'][index])
+        listing.names = columns['names'][start:end]
+        listing.kinds = bytearray(columns['kinds'][start:end])
+        listing.sizes = columns['sizes'][start:end]
+        listing.mtimes = columns['mtimes'][start:end]
+        listing.ctimes = columns['ctimes'][start:end]
+        listing.inodes = columns['inodes'][start:end]
+        listing.extra = columns['extra'].get(columns['dir_paths'][index], {})
+        return listing
+
+    def diff(self, previous: Optional['ScanManifest']) -> Tuple[Set[str], Set[str], Set[str]]:
+        """
+        Compare ce manifeste à un manifeste précédent
+
+        Les dossiers repris tels quels du cache (même objet) ne sont pas comparés.
+
+        Args:
+            previous: Manifeste précédent
+
+        Returns:
+            Tuple (ajoutés, supprimés, modifiés) de chemins relatifs
+        """
+        added, removed, modified = set(), set(), set()
+        old_paths = previous.dir_paths() if previous else set()
+
+        for rel_dir in self.dir_paths() | old_paths:
+            new_listing = self.get(rel_dir)
+            old_listing = previous.get(rel_dir) if previous else None
+            if new_listing is old_listing:
+                continue
+
+            new_files = new_listing.file_signatures() if new_listing else {}
+            old_files = old_listing.file_signatures() if old_listing else {}
+
+            for name, signature in new_files.items():
+                rel_path = os.path.join(rel_dir, name)
+                if name not in old_files:
+                    added.add(rel_path)
+                elif old_files[name] != signature:
+                    modified.add(rel_path)
+
+            for name in old_files.keys() - new_files.keys():
+                removed.add(os.path.join(rel_dir, name))
+
+        return added, removed, modified
@@ -0,0 +1,297 @@
+"""
+Module de profilage du scan
+Compte les appels système, mesure chaque phase et la latence de chaque dossier
+"""
+
+import heapq
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Méthodes du scanner remplacées par des versions instrumentées pendant le profilage
+HOOKS = ('_iter_directory', '_stat_directory', '_prefilter', '_create_file_info',
+         '_create_light_file_info', '_sniff_items', '_list_archive', '_update_stats')
+
+# Intervalle d'échantillonnage du débit (secondes)
+SAMPLE_INTERVAL = 0.5
+
+
+def _format_us(microseconds: int) -> str:
+    if microseconds >= 1_000_000:
+        return f"{microseconds / 1_000_000:g} s"
+    if microseconds >= 1000:
+        return f"{microseconds / 1000:g} ms"
+    return f"{microseconds} µs"
+
+
+class ScanProfiler:
+    """Profil d'un scan : appels système, temps par phase, latence par dossier, débit
+
+    Le profilage remplace temporairement quelques méthodes du scanner par des
+    versions chronométrées (attributs d'instance). Désactivé, il ne coûte
+    rien : le code du parcours n'est pas modifié.
+
+    Phases mesurées :
+        scandir    : lecture des entrées des dossiers (temps restant du dossier)
+        stat       : stat() des fichiers (DirEntry.stat) et des dossiers (boucles, montages)
+        file_info  : construction des FileInfo (Path, relative_to, extension, type)
+        sniff      : lecture des en-têtes (sniff_content)
+        archives   : lecture des répertoires d'archives (archive_depth)
+        stats      : statistiques et index des dossiers
+
+    Avec workers > 1, les temps des phases sont cumulés sur tous les threads
+    et peuvent dépasser la durée totale.
+    """
+
+    def __init__(self, slowest: int = 20, sample_interval: float = SAMPLE_INTERVAL):
+        """
+        Initialise un profil vide
+
+        Args:
+            slowest: Nombre de dossiers les plus lents conservés
+            sample_interval: Intervalle d'échantillonnage du débit (secondes)
+        """
+        self.slowest_count = slowest
+        self.sample_interval = sample_interval
+        self.syscalls: Dict[str, int] = {'scandir': 0, 'stat': 0, 'open': 0}
+        self.phases: Dict[str, float] = {name: 0.0 for name in
+                                         ('scandir', 'stat', 'file_info', 'sniff', 'archives', 'stats')}
+        # Histogramme log2 des latences par dossier : bucket b = [2^(b-1), 2^b[ µs
+        self.histogram: Dict[int, int] = {}
+        self.slowest: List[Tuple[float, str, int]] = []
+        self.timeline: List[Tuple[float, int]] = []
+        self.directories = 0
+        self.files = 0
+        self.started: Optional[float] = None
+        self.elapsed = 0.0
+        self._next_sample = 0.0
+        self._lock = threading.Lock()
+
+    def attach(self, scanner):
+        """
+        Installe les versions chronométrées des méthodes du scanner
+
+        Args:
+            scanner: FolderScanner à profiler
+        """
+        self.started = time.perf_counter()
+        self._next_sample = self.started + self.sample_interval
+        for name in HOOKS:
+            original = getattr(type(scanner), name).__get__(scanner)
+            setattr(scanner, name, getattr(self, f'_profile{name}')(scanner, original))
+
+    @staticmethod
+    def detach(scanner):
+        """
+        Rétablit les méthodes d'origine du scanner
+
+        Args:
+            scanner: FolderScanner profilé
+        """
+        for name in HOOKS:
+            scanner.__dict__.pop(name, None)
+
+    def stop(self):
+        """Termine la mesure (durée totale et dernier point de débit)"""
+        if self.started is not None:
+            self.elapsed = time.perf_counter() - self.started
+            self.timeline.append((round(self.elapsed, 3), self.files))
+
+    def _profile_iter_directory(self, scanner, original):
+        def _iter_directory(directory, depth):
+            phases_before = sum(self.phases[p] for p in ('stat', 'file_info', 'sniff', 'archives'))
+            start = time.perf_counter()
+            items = list(original(directory, depth))
+            latency = time.perf_counter() - start
+            nested = sum(self.phases[p] for p in ('stat', 'file_info', 'sniff', 'archives')) \
+                - phases_before
+
+            with self._lock:
+                self.directories += 1
+                self.syscalls['scandir'] += 1
+                if scanner._manifest is not None:
+                    self.syscalls['stat'] += 1
+                # En parallèle, les phases des autres threads faussent le reste : borné à 0
+                self.phases['scandir'] += max(0.0, latency - nested)
+                bucket = int(latency * 1_000_000).bit_length()
+                self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+                entry = (latency, str(directory), len(items))
+                if len(self.slowest) < self.slowest_count:
+                    heapq.heappush(self.slowest, entry)
+                elif latency > self.slowest[0][0]:
+                    heapq.heapreplace(self.slowest, entry)
+            return iter(items)
+        return _iter_directory
+
+    def _profile_stat_directory(self, scanner, original):
+        def _stat_directory(directory):
+            start = time.perf_counter()
+            key = original(directory)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.syscalls['stat'] += 1
+                self.phases['stat'] += elapsed
+            return key
+        return _stat_directory
+
+    def _profile_prefilter(self, scanner, original):
+        def _prefilter(entry, listing):
+            start = time.perf_counter()
+            accepted = original(entry, listing)
+            elapsed = time.perf_counter() - start
+            # Les fichiers retenus sont comptés par _create_file_info (stat en cache)
+            stat_read = not accepted and (listing is not None or (
+                scanner._filter.needs_stat
+                and scanner._filter_names.get(scanner._get_extension(entry.name))))
+            with self._lock:
+                self.phases['stat'] += elapsed
+                if stat_read:
+                    self.syscalls['stat'] += 1
+            return accepted
+        return _prefilter
+
+    def _profile_create_file_info(self, scanner, original):
+        def _create_file_info(entry, depth):
+            start = time.perf_counter()
+            try:
+                entry.stat()            # mis en cache par DirEntry : original() ne le refait pas
+            except OSError:
+                pass
+            middle = time.perf_counter()
+            result = original(entry, depth)
+            end = time.perf_counter()
+            with self._lock:
+                self.syscalls['stat'] += 1
+                self.phases['stat'] += middle - start
+                self.phases['file_info'] += end - middle
+            return result
+        return _create_file_info
+
+    def _profile_create_light_file_info(self, scanner, original):
+        def _create_light_file_info(entry, depth, rel_dir, parent_name):
+            start = time.perf_counter()
+            result = original(entry, depth, rel_dir, parent_name)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases['file_info'] += elapsed
+            return result
+        return _create_light_file_info
+
+    def _profile_sniff_items(self, scanner, original):
+        def _sniff_items(directory, items, sniff_keys):
+            before = scanner.sniffer.stats['sniffed'] + scanner.sniffer.stats['errors']
+            start = time.perf_counter()
+            original(directory, items, sniff_keys)
+            elapsed = time.perf_counter() - start
+            opened = scanner.sniffer.stats['sniffed'] + scanner.sniffer.stats['errors'] - before
+            with self._lock:
+                self.phases['sniff'] += elapsed
+                self.syscalls['open'] += opened
+        return _sniff_items
+
+    def _profile_list_archive(self, scanner, original):
+        def _list_archive(archive):
+            start = time.perf_counter()
+            members = original(archive)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases['archives'] += elapsed
+                self.syscalls['open'] += 1
+            return members
+        return _list_archive
+
+    def _profile_update_stats(self, scanner, original):
+        def _update_stats(file):
+            start = time.perf_counter()
+            original(file)
+            end = time.perf_counter()
+            self.phases['stats'] += end - start
+            self.files += 1
+            if end >= self._next_sample:
+                self.timeline.append((round(end - self.started, 3), self.files))
+                self._next_sample = end + self.sample_interval
+        return _update_stats
+
+    def files_per_second(self) -> List[Tuple[float, float]]:
+        """
+        Débit sur chaque intervalle d'échantillonnage
+
+        Returns:
+            Liste de tuples (instant en secondes, fichiers/s sur l'intervalle)
+        """
+        rates = []
+        previous_time, previous_files = 0.0, 0
+        for instant, files in self.timeline:
+            if instant > previous_time:
+                rates.append((instant, (files - previous_files) / (instant - previous_time)))
+            previous_time, previous_files = instant, files
+        return rates
+
+    def slowest_directories(self, n: Optional[int] = None) -> List[Tuple[str, float, int]]:
+        """
+        Dossiers les plus lents à lire
+
+        Args:
+            n: Nombre de dossiers (par défaut, tous ceux conservés)
+
+        Returns:
+            Liste de tuples (chemin, latence en secondes, nombre d'entrées), du plus lent au plus rapide
+        """
+        ranked = sorted(self.slowest, reverse=True)[:n]
+        return [(path, latency, entries) for latency, path, entries in ranked]
+
+    def to_dict(self) -> Dict:
+        """Profil sous forme de dictionnaire (export JSON)"""
+        return {
+            'elapsed': round(self.elapsed, 6),
+            'files': self.files,
+            'directories': self.directories,
+            'syscalls': dict(self.syscalls),
+            'phases': {name: round(value, 6) for name, value in self.phases.items()},
+            'directory_latency_histogram_us': {
+                (1 << bucket) if bucket else 1: count
+                for bucket, count in sorted(self.histogram.items())
+            },
+            'slowest_directories': self.slowest_directories(),
+            'files_per_second': self.files_per_second(),
+        }
+
+    def report(self, top: int = 10) -> str:
+        """
+        Rapport textuel du profil
+
+        Args:
+            top: Nombre de dossiers lents affichés
+
+        Returns:
+            Rapport
+        """
+        rate = self.files / self.elapsed if self.elapsed else 0
+        lines = [
+            f"⏱️  Profil du scan : {self.elapsed:.3f} s, {self.files} fichiers, "
+            f"{self.directories} dossiers, {rate:.0f} fichiers/s",
+            "",
+            "Appels système : " + ", ".join(f"{name} {count}" for name, count in self.syscalls.items()),
+            "",
+            "Temps par phase :",
+        ]
+        for name, value in sorted(self.phases.items(), key=lambda item: -item[1]):
+            share = 100 * value / self.elapsed if self.elapsed else 0
+            lines.append(f"  {name:<10} {value:>9.3f} s  {share:5.1f} %")
+
+        lines += ["", "Latence par dossier :"]
+        peak = max(self.histogram.values(), default=0)
+        for bucket, count in sorted(self.histogram.items()):
+            low = _format_us(1 << (bucket - 1)) if bucket else "0 µs"
+            bar = '█' * max(1, round(30 * count / peak))
+            lines.append(f"  ≥ {low:>8} {count:>8}  {bar}")
+
+        lines += ["", "Dossiers les plus lents :"]
+        for path, latency, entries in self.slowest_directories(top):
+            lines.append(f"  {latency * 1000:>9.2f} ms  {entries:>7} entrées  {path}")
+
+        lines += ["", "Débit (fichiers/s) :"]
+        for instant, files_rate in self.files_per_second():
+            lines.append(f"  {instant:>8.2f} s  {files_rate:>10.0f}")
+
+        return "\n".join(lines)
@@ -34,7 +34,7 @@ class HTMLReporter:
         Génère le rapport HTML complet
 
         Args:
-            files: Liste des fichiers
+            files: Liste des fichiers (ou FileTable)
             attachments: Liste des pièces jointes (optionnel)
             stats: Statistiques (optionnel)
             title: Titre du rapport
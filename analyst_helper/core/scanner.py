@@ -4,35 +4,199 @@ Permet de parcourir récursivement les dossiers et collecter les métadonnées
 """
 
 import os
-import hashlib
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from typing import Callable, List, Dict, Optional, Iterable, Iterator, Union
 import json
+from .walker import ParallelWalker
+from .manifest import DirectoryListing, RescanResult, ScanManifest
+from .tree_index import DirectoryIndex
+from .sniffer import ContentSniffer, resolve_content_type
+from .archives import ArchiveLister, archive_kind
+from .profiler import ScanProfiler
+from .estimator import DEFAULT_PROBES, ScanEstimate, ScanProgress, TreeEstimator
+from ..utils.filters import ScanFilter
+from ..utils.ignore import IGNORE_FILENAME, IgnoreMatcher, IgnoreRules
 
 
-@dataclass
-class FileInfo:
-    """Information sur un fichier"""
-    name: str
-    path: str
-    relative_path: str
-    extension: str
-    size_bytes: int
-    size_kb: float
-    size_mb: float
-    created_date: str
-    modified_date: str
-    file_type: str
-    depth: int
-    parent_folder: str
-    is_email: bool = False
-    email_source: Optional[str] = None
+def format_timestamp(timestamp: float) -> str:
+    """
+    Formate un timestamp comme dans les exports ('YYYY-MM-DD HH:MM:SS')
+
+    Args:
+        timestamp: Timestamp epoch (secondes)
+
+    Returns:
+        Date formatée
+    """
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def ns_to_timestamp(ns: int) -> float:
+    """
+    Convertit une date en nanosecondes comme os.stat (st_mtime, st_ctime)
+
+    Args:
+        ns: Date epoch en nanosecondes (st_mtime_ns)
+
+    Returns:
+        Timestamp epoch (secondes), identique à celui d'un stat() du même fichier
+    """
+    seconds, nanoseconds = divmod(ns, 1_000_000_000)
+    return seconds + nanoseconds * 1e-9
+
+
+class FileRecord:
+    """Base commune des enregistrements de fichier : champs dérivés et conversions
+
+    Seuls la taille en octets et les timestamps sont stockés ; tailles en KB/MB
+    et dates formatées sont calculées à la demande.
+    """
+
+    __slots__ = ()
+
+    # Champs stockés
+    FIELDS = ('name', 'path', 'relative_path', 'extension', 'size_bytes', 'created_ts',
+              'modified_ts', 'file_type', 'depth', 'parent_folder', 'is_email',
+              'email_source', 'quick_hash', 'content_hash', 'content_type', 'archive_path')
+
+    # Champs exportés (JSON, CSV, rapport), dans l'ordre historique
+    EXPORT_FIELDS = ('name', 'path', 'relative_path', 'extension', 'size_bytes', 'size_kb',
+                     'size_mb', 'created_date', 'modified_date', 'file_type', 'depth',
+                     'parent_folder', 'is_email', 'email_source', 'quick_hash', 'content_hash',
+                     'content_type', 'archive_path')
+
+    @property
+    def size_kb(self) -> float:
+        return round(self.size_bytes / 1024, 2)
+
+    @property
+    def size_mb(self) -> float:
+        return round(self.size_bytes / (1024 * 1024), 2)
+
+    @property
+    def is_virtual(self) -> bool:
+        """Membre d'archive : listé sans extraction, absent du disque"""
+        return self.archive_path is not None
+
+    @property
+    def created_date(self) -> str:
+        return format_timestamp(self.created_ts)
+
+    @property
+    def modified_date(self) -> str:
+        return format_timestamp(self.modified_ts)
 
     def to_dict(self) -> Dict:
         """Convertit en dictionnaire"""
-        return asdict(self)
+        return {name: getattr(self, name) for name in self.EXPORT_FIELDS}
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FileRecord):
+            return NotImplemented
+        return self._values() == other._values()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+class FileInfo(FileRecord):
+    """Information sur un fichier"""
+
+    __slots__ = FileRecord.FIELDS
+
+    def __init__(self, name: str, path: str, relative_path: str, extension: str,
+                 size_bytes: int, created_ts: float, modified_ts: float, file_type: str,
+                 depth: int, parent_folder: str, is_email: bool = False,
+                 email_source: Optional[str] = None, quick_hash: Optional[str] = None,
+                 content_hash: Optional[str] = None, content_type: Optional[str] = None,
+                 archive_path: Optional[str] = None):
+        self.name = name
+        self.path = path
+        self.relative_path = relative_path
+        self.extension = extension
+        self.size_bytes = size_bytes
+        self.created_ts = created_ts
+        self.modified_ts = modified_ts
+        self.file_type = file_type
+        self.depth = depth
+        self.parent_folder = parent_folder
+        self.is_email = is_email
+        self.email_source = email_source
+        self.quick_hash = quick_hash
+        self.content_hash = content_hash
+        self.content_type = content_type
+        self.archive_path = archive_path
+
+
+def _lazy_stat_field(name: str) -> property:
+    """Champ lu par stat() au premier accès (voir LazyFileInfo)"""
+    slot = FileInfo.__dict__[name]
+
+    def getter(self):
+        try:
+            return slot.__get__(self)
+        except AttributeError:
+            self._load_stat()
+            return slot.__get__(self)
+
+    return property(getter, slot.__set__)
+
+
+class LazyFileInfo(FileInfo):
+    """FileInfo d'un scan léger : taille et dates lues par un seul stat() au premier accès
+
+    Le scan léger n'utilise que ce que DirEntry fournit sans appel système
+    (nom, type d'entrée) ; un fichier dont la taille ou les dates ne sont
+    jamais lues ne coûte aucun stat().
+    """
+
+    __slots__ = ()
+
+    def __init__(self, name: str, path: str, relative_path: str, extension: str,
+                 file_type: str, depth: int, parent_folder: str, is_email: bool = False):
+        self.name = name
+        self.path = path
+        self.relative_path = relative_path
+        self.extension = extension
+        self.file_type = file_type
+        self.depth = depth
+        self.parent_folder = parent_folder
+        self.is_email = is_email
+        self.email_source = None
+        self.quick_hash = None
+        self.content_hash = None
+        self.content_type = None
+        self.archive_path = None
+
+    size_bytes = _lazy_stat_field('size_bytes')
+    created_ts = _lazy_stat_field('created_ts')
+    modified_ts = _lazy_stat_field('modified_ts')
+
+    @property
+    def stat_loaded(self) -> bool:
+        """Taille et dates déjà lues"""
+        try:
+            FileInfo.size_bytes.__get__(self)
+            return True
+        except AttributeError:
+            return False
+
+    def _load_stat(self):
+        try:
+            stat = os.stat(self.path)
+            values = (stat.st_size, stat.st_ctime, stat.st_mtime)
+        except OSError:
+            values = (0, 0.0, 0.0)
+        for name, value in zip(('size_bytes', 'created_ts', 'modified_ts'), values):
+            FileInfo.__dict__[name].__set__(self, value)
 
 
 class FolderScanner:
@@ -56,69 +220,1086 @@ class FolderScanner:
         self.root_path = Path(root_path).resolve()
         self.max_depth = max_depth
         self.files: List[FileInfo] = []
-        self.stats = {
-            'total_files': 0,
-            'total_size_mb': 0,
-            'total_emails': 0,
-            'total_folders': 0,
-            'by_type': {},
-            'by_extension': {}
-        }
+        self.stats: Dict = {}
+        # Index des dossiers (totaux par dossier et par sous-arbre), construit pendant le scan
+        self.tree_index = DirectoryIndex(self.root_path.name)
+        self._reset_stats()
+        # Manifeste en cours de construction / précédent (rescan incrémental uniquement)
+        self._manifest: Optional[ScanManifest] = None
+        self._previous_manifest: Optional[ScanManifest] = None
+        self._verify_files = False
+        # Dernier manifeste enregistré par rescan(), pour y conserver les champs dérivés
+        self._last_manifest: Optional[ScanManifest] = None
+        self._last_manifest_path: Optional[str] = None
+        # Options du parcours en cours (voir _configure_walk)
+        self._exclude: frozenset = frozenset()
+        self._ignore_root = IgnoreMatcher()
+        self._ignore_files = False
+        self._dir_matchers: Dict[str, IgnoreMatcher] = {}
+        # Détection du type réel (créé au premier scan avec sniff_content, cache conservé)
+        self.sniffer: Optional[ContentSniffer] = None
+        self._sniff_content = False
+        # Listage du contenu des archives (None = désactivé)
+        self._archives: Optional[ArchiveLister] = None
+        # Profil du dernier scan lancé avec profile=True
+        self.profiler: Optional[ScanProfiler] = None
+        # Scan léger : aucun stat() des fichiers pendant le parcours (LazyFileInfo)
+        self._light = False
+        # Filtre de sélection et décision déjà prise pour chaque extension
+        self._filter: Optional[ScanFilter] = None
+        self._filter_names: Dict[str, bool] = {}
+        # Dossiers déjà parcourus et fichiers à liens multiples, par (st_dev, st_ino)
+        self._one_filesystem = False
+        self._root_dev: Optional[int] = None
+        self._seen_dirs: Dict[tuple, str] = {}
+        self._dir_keys: Dict[str, Optional[tuple]] = {}
+        self._key_paths: Dict[tuple, List[str]] = {}
+        # Première occurrence de chaque fichier à liens multiples : (chemin, taille)
+        self._linked_files: Dict[tuple, tuple] = {}
+        self._duplicate_links: set = set()
+        self._walk_lock = threading.Lock()
+        # Dernière estimation (voir estimate()), réutilisée pour l'avancement du scan
+        self.estimation: Optional[ScanEstimate] = None
 
-    def scan(self, exclude_folders: Optional[List[str]] = None) -> List[FileInfo]:
+    def scan(self, exclude_folders: Optional[List[str]] = None, workers: int = 1,
+             ignore: Optional[Union[IgnoreRules, Iterable[str]]] = None,
+             ignore_files: bool = False, sniff_content: bool = False,
+             archive_depth: int = 0, profile: bool = False,
+             light: bool = False,
+             filters: Optional[Union[ScanFilter, Dict]] = None,
+             progress: Union[bool, Callable] = False,
+             one_filesystem: bool = False) -> List[FileInfo]:
         """
         Scanne le dossier racine
 
         Args:
-            exclude_folders: Liste des dossiers à exclure
+            exclude_folders: Noms exacts de fichiers ou dossiers à exclure
+            workers: Nombre de threads de lecture (1 = parcours séquentiel).
+                     Le résultat est identique quel que soit le nombre de threads.
+            ignore: Règles d'exclusion au format gitignore ('*.tmp', 'build/',
+                    'docs/**/brouillons', '!garder.pdf'...) ; les dossiers exclus
+                    ne sont pas parcourus
+            ignore_files: Lire aussi les fichiers .analystignore rencontrés
+            sniff_content: Déterminer le type des fichiers d'après leur contenu
+                           (signatures binaires) et non seulement leur extension
+            archive_depth: Lister aussi le contenu des archives ZIP/TAR/GZ, sans
+                           extraction : 0 = désactivé, 1 = contenu des archives,
+                           2 = archives contenues dans des archives, etc.
+                           Les membres sont des FileInfo virtuels (archive_path renseigné).
+            profile: Profiler le scan (appels système, temps par phase, dossiers
+                     lents, débit) ; résultat dans self.profiler.report()
+            light: Scan léger, sans stat() des fichiers (les dossiers en ont un, pour
+                   les boucles) : seuls nom, chemins, extension, type et
+                   profondeur sont calculés ; taille et dates sont lues au premier
+                   accès. Les tailles ne sont pas comptées dans les statistiques.
+            filters: Critères de sélection (ScanFilter ou dict de ses arguments :
+                     extensions, file_types, min_size, max_size, modified_after,
+                     modified_before) ; les fichiers rejetés ne sont ni créés ni comptés
+            progress: Afficher l'avancement et le temps restant, rapportés à
+                      l'estimation (estimate() est appelée si aucune n'a encore été
+                      faite) ; une fonction reçoit (fichiers vus, fichiers attendus,
+                      secondes restantes ou None) au lieu de l'affichage
+            one_filesystem: Ne pas descendre dans les points de montage d'un autre
+                            système de fichiers que la racine
 
         Returns:
             Liste des fichiers trouvés
         """
-        if exclude_folders is None:
-            exclude_folders = []
+        tracker = self._start_progress(progress, exclude_folders=exclude_folders, ignore=ignore,
+                                       ignore_files=ignore_files, filters=filters)
+        self._configure_walk(exclude_folders, ignore, ignore_files, sniff_content, archive_depth,
+                             profile, light, filters, one_filesystem)
 
         print(f"🔍 Scan de: {self.root_path}")
+        self._reset_stats()
+        self.tree_index = DirectoryIndex(self.root_path.name)
         self.files = []
-        self._scan_directory(self.root_path, 0, exclude_folders)
-        self._compute_stats()
+        for file_info in self._walk(workers):
+            self._update_stats(file_info)
+            self.files.append(file_info)
+            if tracker is not None:
+                tracker.advance()
 
+        self._finish_profile()
         print(f"✅ Scan terminé: {self.stats['total_files']} fichiers trouvés")
         return self.files
 
-    def _scan_directory(self, directory: Path, depth: int, exclude_folders: List[str]):
+    def iter_scan(self, exclude_folders: Optional[List[str]] = None, workers: int = 1,
+                  batch_size: Optional[int] = None,
+                  ignore: Optional[Union[IgnoreRules, Iterable[str]]] = None,
+                  ignore_files: bool = False,
+                  sniff_content: bool = False,
+                  archive_depth: int = 0,
+                  profile: bool = False,
+                  light: bool = False,
+                  filters: Optional[Union[ScanFilter, Dict]] = None,
+                  progress: Union[bool, Callable] = False,
+                  one_filesystem: bool = False
+                  ) -> Iterator[Union[FileInfo, List[FileInfo]]]:
         """
-        Scanne un dossier récursivement
+        Scanne le dossier racine en flux, sans conserver les fichiers en mémoire
+
+        Les statistiques sont mises à jour au fil du parcours ; self.files n'est pas rempli.
+
+        Args:
+            exclude_folders: Noms exacts de fichiers ou dossiers à exclure
+            workers: Nombre de threads de lecture (1 = parcours séquentiel)
+            batch_size: Si fourni, produit des listes de batch_size fichiers au lieu de fichiers isolés
+            ignore: Règles d'exclusion au format gitignore (voir scan())
+            ignore_files: Lire aussi les fichiers .analystignore rencontrés
+            sniff_content: Déterminer le type des fichiers d'après leur contenu
+            archive_depth: Niveaux d'archives dont le contenu est listé (voir scan())
+            profile: Profiler le scan (voir scan())
+            light: Scan léger, sans stat() des fichiers (voir scan())
+            filters: Critères de sélection des fichiers (voir scan())
+            progress: Afficher l'avancement et le temps restant (voir scan())
+            one_filesystem: Rester sur le système de fichiers de la racine
+
+        Returns:
+            Itérateur de FileInfo (ou de listes de FileInfo)
+        """
+        tracker = self._start_progress(progress, exclude_folders=exclude_folders, ignore=ignore,
+                                       ignore_files=ignore_files, filters=filters)
+        self._configure_walk(exclude_folders, ignore, ignore_files, sniff_content, archive_depth,
+                             profile, light, filters, one_filesystem)
+
+        print(f"🔍 Scan de: {self.root_path}")
+        self._reset_stats()
+        # En flux, l'index ne garde que les totaux (mémoire proportionnelle aux dossiers)
+        self.tree_index = DirectoryIndex(self.root_path.name, keep_names=False)
+        batch = []
+
+        for file_info in self._walk(workers):
+            self._update_stats(file_info)
+            if tracker is not None:
+                tracker.advance()
+            if batch_size:
+                batch.append(file_info)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            else:
+                yield file_info
+
+        if batch:
+            yield batch
+
+        self._finish_profile()
+        print(f"✅ Scan terminé: {self.stats['total_files']} fichiers trouvés")
+
+    def scan_table(self, **scan_options):
+        """
+        Scanne le dossier racine et stocke le résultat en colonnes
+
+        Les fichiers sont ajoutés à la table au fil du parcours, sans liste
+        intermédiaire. La table devient self.files : exports, arborescence et
+        doublons fonctionnent à l'identique.
+
+        Args:
+            **scan_options: Options de iter_scan() (exclude_folders, workers, ignore...)
+
+        Returns:
+            FileTable
+        """
+        from .table import FileTable
+
+        table = FileTable(self.root_path)
+        table.extend(self.iter_scan(**scan_options))
+        self.files = table
+        return table
+
+    def estimate(self, probes: int = DEFAULT_PROBES, seed: Optional[int] = None,
+                 **scan_options) -> ScanEstimate:
+        """
+        Estime en quelques secondes le résultat d'un scan complet
+
+        Un échantillon de dossiers est tiré au hasard à chaque profondeur
+        (descentes aléatoires depuis la racine) ; nombre de fichiers, de
+        dossiers, volume et répartition des extensions sont extrapolés, avec
+        un intervalle de confiance à 95 %. Sur une arborescence très
+        irrégulière, l'intervalle est large : augmenter probes le resserre.
+        L'estimation est conservée dans self.estimation et sert ensuite à
+        l'avancement de scan(progress=True).
+
+        Args:
+            probes: Nombre de descentes aléatoires
+            seed: Graine du tirage (estimation reproductible)
+            **scan_options: Options d'exclusion et de sélection de scan()
+                            (exclude_folders, ignore, ignore_files, filters)
+
+        Returns:
+            ScanEstimate
+        """
+        self._configure_options({key: scan_options.get(key) for key in
+                                 ('exclude_folders', 'ignore', 'ignore_files', 'filters')})
+        self.estimation = TreeEstimator(self, probes, seed=seed).run()
+
+        estimation = self.estimation
+        print(f"📐 Estimation ({estimation.directories_read} dossiers lus en "
+              f"{estimation.duration:.1f} s) : {estimation.files} fichiers, "
+              f"{estimation.size_mb.value:.1f} MB")
+        return estimation
+
+    def _start_progress(self, progress: Union[bool, Callable], **scan_options) -> Optional[ScanProgress]:
+        """
+        Prépare le suivi d'avancement d'un scan
+
+        Args:
+            progress: Option progress de scan()
+            **scan_options: Options d'exclusion et de sélection, pour une estimation éventuelle
+
+        Returns:
+            ScanProgress, ou None si l'avancement n'est pas demandé
+        """
+        if not progress:
+            return None
+        if self.estimation is None:
+            self.estimate(**scan_options)
+        return ScanProgress(self.estimation.files.value,
+                            progress if callable(progress) else None)
+
+    def rescan(self, manifest_path: str, exclude_folders: Optional[List[str]] = None,
+               workers: int = 1, verify_files: bool = False, **scan_options) -> RescanResult:
+        """
+        Rescan incrémental à partir d'un manifeste persistant
+
+        Les dossiers dont la date de modification n'a pas changé ne sont pas relus :
+        leurs fichiers sont reconstruits depuis le manifeste. La date d'un dossier
+        ne change que si des entrées y sont ajoutées, supprimées ou renommées ;
+        verify_files=True refait un stat() par fichier pour détecter aussi les
+        modifications sur place. Le manifeste est mis à jour en fin de scan.
+
+        Le manifeste mémorise tous les fichiers, y compris ceux rejetés par
+        filters : un même manifeste sert quel que soit le filtre, et les
+        chemins ajoutés/supprimés/modifiés portent sur tous les fichiers.
+
+        Args:
+            manifest_path: Chemin du manifeste (créé s'il n'existe pas)
+            exclude_folders: Liste des dossiers à exclure
+            workers: Nombre de threads de lecture
+            verify_files: Vérifier chaque fichier des dossiers inchangés
+            **scan_options: Autres options de scan() (ignore, sniff_content, archive_depth...)
+
+        Returns:
+            RescanResult avec la liste complète et les chemins ajoutés/supprimés/modifiés
+        """
+        self._configure_options(dict(scan_options, exclude_folders=exclude_folders))
+        options = self._walk_signature()
+
+        previous = ScanManifest.load(manifest_path)
+        if previous and not previous.is_compatible(self.root_path, options):
+            print("⚠️  Manifeste d'une autre configuration, scan complet")
+            previous = None
+
+        self._previous_manifest = previous
+        self._manifest = ScanManifest(self.root_path, options)
+        self._verify_files = verify_files
+        try:
+            files = self.scan(exclude_folders, workers, **scan_options)
+            manifest = self._manifest
+        finally:
+            self._manifest = None
+            self._previous_manifest = None
+
+        manifest.save(manifest_path)
+        self._last_manifest = manifest
+        self._last_manifest_path = manifest_path
+        added, removed, modified = manifest.diff(previous)
+        print(f"🔄 Changements: {len(added)} ajoutés, {len(removed)} supprimés, "
+              f"{len(modified)} modifiés")
+
+        return RescanResult(files=files, added=added, removed=removed, modified=modified)
+
+    def scan_shard(self, shard, **scan_options) -> List[FileInfo]:
+        """
+        Scanne une partie de l'arborescence (shard), sous la racine de ce scanner
+
+        Les chemins relatifs et profondeurs sont ceux d'un scan complet de la
+        racine : les résultats de plusieurs shards se fusionnent directement
+        (voir shards.merge_shards).
+
+        Args:
+            shard: ScanShard (sous-arbres et dossiers à lire)
+            **scan_options: Options de scan() (exclude_folders, ignore, ignore_files...)
+
+        Returns:
+            Liste des fichiers du shard
+        """
+        self._configure_options(scan_options)
+
+        print(f"🔍 Scan de: {self.root_path} (shard {shard.index + 1}, "
+              f"{len(shard.units)} sous-arbres)")
+        self._reset_stats()
+        self.tree_index = DirectoryIndex(self.root_path.name)
+        self.files = []
+
+        for rel_dir in shard.folders:
+            self._register_folder(self.root_path / rel_dir)
+        for rel_dir, recursive in shard.units:
+            directory = self.root_path / rel_dir if rel_dir else self.root_path
+            depth = len(Path(rel_dir).parts)
+            if rel_dir:
+                self._register_folder(directory)
+            self._dir_matchers[str(directory)] = self._subtree_matcher(rel_dir)
+
+            if recursive:
+                items = self._scan_directory(directory, depth)
+            else:
+                # Dossier découpé : ses sous-dossiers appartiennent à d'autres unités
+                items = (item for item in self._iter_directory(directory, depth)
+                         if not isinstance(item, Path))
+            for file_info in items:
+                self._update_stats(file_info)
+                self.files.append(file_info)
+
+        self._finish_profile()
+        print(f"✅ Scan terminé: {self.stats['total_files']} fichiers trouvés")
+        return self.files
+
+    def scan_sharded(self, shards: Optional[int] = None, processes: Optional[int] = None,
+                     output_dir: Optional[str] = None, **scan_options) -> List[FileInfo]:
+        """
+        Scanne la racine en plusieurs shards, chacun dans son propre processus
+
+        La racine est découpée en sous-arbres de taille estimée équilibrée ;
+        chaque shard produit un snapshot autonome, puis les snapshots sont
+        fusionnés. self.files devient une FileTable. L'ordre des fichiers est
+        celui des shards, et non celui d'un parcours séquentiel.
+
+        Args:
+            shards: Nombre de shards (par défaut : nombre de processus)
+            processes: Nombre de processus (par défaut : nombre de CPU)
+            output_dir: Dossier des snapshots de shards (conservés) ; temporaire si None
+            **scan_options: Options de scan() (exclude_folders, ignore, sniff_content...)
+
+        Returns:
+            Fichiers trouvés (FileTable)
+        """
+        from .shards import scan_sharded
+
+        merged = scan_sharded([self.root_path], shards, processes, output_dir, **scan_options)
+        self.files = merged.files
+        self._reset_stats()
+        self.stats.update(merged.stats)
+        self.tree_index = merged.get_directory_index()
+        return self.files
+
+    def watch(self, callback=None, debounce: float = 0.5, max_delay: float = 5.0,
+              manifest_path: Optional[str] = None, background: bool = True, **scan_options):
+        """
+        Surveille le dossier en continu (inotify) et tient à jour fichiers, stats et index
+
+        Un scan complet (ou incrémental si manifest_path existe déjà) est fait au
+        démarrage, puis les créations, suppressions, modifications et déplacements
+        sont appliqués par lots. Si la file d'événements du noyau déborde, un
+        rescan incrémental prend le relais.
+
+        Args:
+            callback: Fonction appelée avec chaque lot de changements (ChangeBatch)
+            debounce: Délai de calme avant d'appliquer un lot (secondes)
+            max_delay: Délai maximal avant d'appliquer un lot pendant une rafale
+            manifest_path: Manifeste des rescans (fichier temporaire si None)
+            background: Lancer la surveillance dans un thread (sinon appeler poll())
+            **scan_options: Options de scan() (exclude_folders, ignore, sniff_content...)
+
+        Returns:
+            FolderWatcher (à arrêter avec stop(), ou à utiliser dans un bloc with)
+        """
+        from .watcher import FolderWatcher
+
+        watcher = FolderWatcher(self, debounce=debounce, max_delay=max_delay,
+                                manifest_path=manifest_path, **scan_options)
+        if callback is not None:
+            watcher.subscribe(callback)
+        if background:
+            watcher.start()
+        return watcher
+
+    def _configure_walk(self, exclude_folders: Optional[List[str]],
+                        ignore: Optional[Union[IgnoreRules, Iterable[str]]],
+                        ignore_files: bool, sniff_content: bool = False,
+                        archive_depth: int = 0, profile: bool = False, light: bool = False,
+                        filters: Optional[Union[ScanFilter, Dict]] = None,
+                        one_filesystem: bool = False):
+        """
+        Prépare les options du parcours (exclusions compilées une seule fois)
+
+        Args:
+            exclude_folders: Noms exacts à exclure
+            ignore: Règles d'exclusion au format gitignore
+            ignore_files: Lire les fichiers .analystignore
+            sniff_content: Détecter le type des fichiers d'après leur contenu
+            archive_depth: Niveaux d'archives dont le contenu est listé (0 = aucun)
+            profile: Installer le profilage (aucun coût s'il est désactivé)
+            light: Scan léger, sans stat() des fichiers
+            filters: Critères de sélection des fichiers
+            one_filesystem: Ignorer les dossiers d'un autre système de fichiers que la racine
+        """
+        self._exclude = frozenset(exclude_folders or ())
+        if ignore is not None and not isinstance(ignore, IgnoreRules):
+            ignore = IgnoreRules(ignore)
+        self._ignore_root = IgnoreMatcher((ignore,) if ignore is not None else ())
+        self._ignore_files = ignore_files
+        self._dir_matchers = {}
+        self._sniff_content = sniff_content
+        if sniff_content and self.sniffer is None:
+            self.sniffer = ContentSniffer()
+        self._archives = ArchiveLister(archive_depth) if archive_depth > 0 else None
+        self._light = light
+        if filters is not None and not isinstance(filters, ScanFilter):
+            filters = ScanFilter(**filters)
+        self._filter = filters or None
+        self._filter_names = {}
+        self._one_filesystem = one_filesystem
+        self._root_dev = None
+        if one_filesystem:
+            try:
+                self._root_dev = os.stat(self.root_path).st_dev
+            except OSError:
+                pass
+        self._seen_dirs = {}
+        self._dir_keys = {}
+        self._key_paths = {}
+        self._linked_files = {}
+        self._duplicate_links = set()
+
+        ScanProfiler.detach(self)
+        self.profiler = ScanProfiler() if profile else None
+        if profile:
+            self.profiler.attach(self)
+
+    def _configure_options(self, scan_options: Dict):
+        """
+        Prépare le parcours à partir d'options nommées (voir scan())
+
+        Args:
+            scan_options: Options de scan() ; les options absentes gardent leur valeur par défaut
+        """
+        self._configure_walk(scan_options.get('exclude_folders'), scan_options.get('ignore'),
+                             scan_options.get('ignore_files', False),
+                             scan_options.get('sniff_content', False),
+                             scan_options.get('archive_depth', 0),
+                             scan_options.get('profile', False),
+                             scan_options.get('light', False),
+                             scan_options.get('filters'),
+                             scan_options.get('one_filesystem', False))
+
+    def _subtree_matcher(self, rel_dir: str) -> IgnoreMatcher:
+        """
+        Règles d'exclusion applicables à un dossier lu sans passer par ses parents
+
+        Args:
+            rel_dir: Chemin relatif du dossier
+
+        Returns:
+            Règles de la racine, complétées par les .analystignore des dossiers parents
+        """
+        matcher = self._ignore_root
+        if self._ignore_files and rel_dir:
+            parts = Path(rel_dir).parts
+            for i in range(len(parts)):
+                ancestor = os.path.join(*parts[:i]) if i else ''
+                directory = self.root_path / ancestor if ancestor else self.root_path
+                matcher = self._read_ignore_file(directory, ancestor, matcher)
+        return matcher
+
+    def _finish_profile(self):
+        """Termine le profilage éventuel et rétablit les méthodes d'origine"""
+        if self.profiler is not None:
+            self.profiler.stop()
+            ScanProfiler.detach(self)
+
+    def _walk_signature(self) -> Dict:
+        """
+        Décrit les options du parcours (un manifeste n'est réutilisable qu'à options égales)
+
+        Returns:
+            Dictionnaire des options
+        """
+        signature = {
+            'exclude_folders': sorted(self._exclude),
+            'ignore': [list(rules.patterns) for rules in self._ignore_root.rules],
+            'ignore_files': self._ignore_files,
+        }
+        if self._one_filesystem:
+            signature['one_filesystem'] = True
+        return signature
+
+    def _walk(self, workers: int) -> Iterator[FileInfo]:
+        """
+        Parcourt l'arborescence, en séquentiel ou en parallèle
+
+        Args:
+            workers: Nombre de threads de lecture
+
+        Returns:
+            Itérateur des fichiers dans l'ordre du parcours séquentiel
+        """
+        if workers > 1:
+            return self._scan_parallel(workers)
+        return self._scan_directory(self.root_path, 0)
+
+    def _scan_directory(self, directory: Path, depth: int):
+        """
+        Scanne un dossier et ses sous-dossiers
+
+        Le parcours utilise une pile explicite (aucune limite de récursion de
+        Python) et restitue les fichiers dans l'ordre d'un parcours récursif en
+        profondeur d'abord. Un dossier déjà parcouru (boucle de liens
+        symboliques ou de montages) n'est lu qu'une fois.
 
         Args:
             directory: Dossier à scanner
             depth: Profondeur actuelle
-            exclude_folders: Dossiers à exclure
         """
+        if not self._enter_directory(directory, top=True):
+            return
+        stack = [(self._iter_directory(directory, depth), depth)]
+        while stack:
+            items, level = stack[-1]
+            for item in items:
+                if not isinstance(item, Path):
+                    yield item
+                elif self._enter_directory(item):
+                    self._register_folder(item)
+                    stack.append((self._iter_directory(item, level + 1), level + 1))
+                    break
+            else:
+                stack.pop()
+
+    def _enter_directory(self, directory: Path, top: bool = False) -> bool:
+        """
+        Décide si un dossier doit être parcouru (un stat() par dossier)
+
+        Un dossier est identifié par (st_dev, st_ino) : un dossier déjà
+        parcouru sous un autre chemin (lien symbolique, montage lié) est ignoré.
+        Appelé dans l'ordre du parcours séquentiel, y compris en parallèle
+        (par le consommateur ordonné) : le chemin retenu pour un dossier
+        atteint par plusieurs chemins ne dépend pas du nombre de threads.
+
+        Args:
+            directory: Dossier rencontré
+            top: Point de départ du parcours (jamais ignoré pour le système de fichiers)
+
+        Returns:
+            True si le dossier doit être lu
+        """
+        key = self._directory_key(directory)
+        if key is None:
+            return True                 # erreur signalée à la lecture du dossier
+
+        if not top and self._root_dev is not None and key[0] != self._root_dev:
+            print(f"⏭️  Autre système de fichiers ignoré: {directory}")
+            self._count_skipped('skipped_mounts')
+            return False
+
+        path = str(directory)
+        first = self._seen_dirs.setdefault(key, path)
+        if first != path:
+            print(f"⚠️  Dossier déjà parcouru ignoré (boucle ?): {directory} -> {first}")
+            self._count_skipped('skipped_loops')
+            return False
+        return True
+
+    def _may_descend(self, directory: Path) -> bool:
+        """
+        Parcours parallèle : le dossier peut-il être lu en avance par un thread ?
+
+        Non pour un autre système de fichiers (one_filesystem) ou un dossier
+        qui est aussi l'un de ses propres parents (boucle : le parcours ne
+        finirait pas). Les autres alias sont lus, puis écartés dans l'ordre
+        du parcours par _enter_directory.
+
+        Args:
+            directory: Sous-dossier rencontré
+
+        Returns:
+            True si le dossier peut être lu
+        """
+        key = self._directory_key(directory)
+        if key is None:
+            return True
+        if self._root_dev is not None and key[0] != self._root_dev:
+            return False
+
+        # Chemins déjà vus pour ce dossier (en général, lui seul) : l'un est-il un parent ?
+        path = str(directory)
+        return not any(path.startswith(other.rstrip(os.sep) + os.sep)
+                       for other in self._key_paths.get(key, ()))
+
+    def _directory_key(self, directory: Path) -> Optional[tuple]:
+        """(st_dev, st_ino) d'un dossier, lu une seule fois (None si stat() échoue)"""
+        path = str(directory)
+        if path not in self._dir_keys:
+            key = self._dir_keys[path] = self._stat_directory(directory)
+            if key is not None:
+                self._key_paths.setdefault(key, []).append(path)
+        return self._dir_keys[path]
+
+    def _stat_directory(self, directory: Path) -> Optional[tuple]:
+        """stat() d'un dossier : (st_dev, st_ino), ou None en cas d'erreur"""
+        try:
+            stat = os.stat(directory)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def _count_skipped(self, key: str):
+        """Compte un dossier ignoré (statistique partagée entre les threads)"""
+        with self._walk_lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def _note_link(self, file_info: FileInfo, stat: os.stat_result):
+        """
+        Mémorise un fichier à liens multiples (lien physique ou symbolique)
+
+        Seule la première occurrence d'un même (st_dev, st_ino) compte dans
+        le volume unique (unique_size_mb).
+
+        Args:
+            file_info: Fichier rencontré
+            stat: Résultat de stat() du fichier (liens suivis)
+        """
+        first, _ = self._linked_files.setdefault((stat.st_dev, stat.st_ino),
+                                                 (file_info.path, file_info.size_bytes))
+        if first != file_info.path:
+            self._duplicate_links.add(file_info.path)
+
+    def _scan_parallel(self, workers: int):
+        """
+        Scanne le dossier racine avec un pool de threads
+
+        Args:
+            workers: Nombre de threads de lecture
+        """
+        self._enter_directory(self.root_path, top=True)
+        # Les threads lisent en avance (sauf boucles et autres systèmes de
+        # fichiers) ; les alias sont tranchés dans l'ordre du parcours
+        walker = ParallelWalker(lambda directory, depth: list(self._iter_directory(directory, depth)),
+                                workers, descend=self._may_descend, enter=self._enter_directory)
+
+        for is_dir, item in walker.walk(self.root_path):
+            if is_dir:
+                self._register_folder(item)
+            else:
+                yield item
+
+    def _iter_directory(self, directory: Path, depth: int):
+        """
+        Lit un seul niveau de dossier, sans descendre dans les sous-dossiers
+
+        Args:
+            directory: Dossier à lire
+            depth: Profondeur actuelle
+
+        Returns:
+            Itérateur de FileInfo (fichiers) et de Path (sous-dossiers), dans l'ordre de os.scandir
+        """
+        if not self._sniff_content:
+            items = self._read_directory(directory, depth, None)
+        else:
+            # Le contenu du dossier forme un lot de lectures pour le détecteur
+            sniff_keys = {}
+            items = list(self._read_directory(directory, depth, sniff_keys))
+            self._sniff_items(directory, items, sniff_keys)
+            if self._filter is not None and self._filter.file_types is not None:
+                # Type corrigé par le contenu : filtré après la détection
+                items = [item for item in items
+                         if isinstance(item, Path) or self._filter.match_type(item.file_type)]
+            items = iter(items)
+
+        if self._archives is not None:
+            return self._expand_archives(items)
+        return items
+
+    def _expand_archives(self, items: Iterator):
+        """
+        Ajoute après chaque archive ses membres virtuels
+
+        Args:
+            items: Contenu d'un dossier (FileInfo et Path)
+        """
+        for item in items:
+            yield item
+            if not isinstance(item, Path) and archive_kind(item.name):
+                yield from self._list_archive(item)
+
+    def _list_archive(self, archive: FileInfo) -> List[FileInfo]:
+        """
+        Liste les membres d'une archive sous forme de FileInfo virtuels
+
+        L'archive joue le rôle de dossier parent : le chemin d'un membre est
+        celui de l'archive suivi du chemin interne, et la profondeur continue
+        de croître à l'intérieur de l'archive.
+
+        Args:
+            archive: Archive sur disque
+
+        Returns:
+            Liste de FileInfo (vide si l'archive est illisible)
+        """
+        members = []
+        flt = self._filter
+        try:
+            for member_path, size, mtime in self._archives.iter_members(archive.path):
+                parts = [part for part in member_path.split('/') if part not in ('', '.')]
+                if not parts:
+                    continue
+                name = parts[-1]
+                extension = self._get_extension(name)
+                if flt is not None and not (flt.match_extension(extension)
+                                            and flt.match_type(self._classify_file(extension))
+                                            and flt.match_stat(size, mtime)):
+                    continue
+                members.append(FileInfo(
+                    name=name,
+                    path=os.path.join(archive.path, *parts),
+                    relative_path=os.path.join(archive.relative_path, *parts),
+                    extension=extension,
+                    size_bytes=size,
+                    created_ts=mtime,
+                    modified_ts=mtime,
+                    file_type=self._classify_file(extension),
+                    depth=archive.depth + len(parts),
+                    parent_folder=parts[-2] if len(parts) > 1 else archive.name,
+                    is_email=extension in self.EMAIL_EXTENSIONS,
+                    archive_path=archive.path
+                ))
+        except Exception as e:
+            print(f"⚠️  Archive illisible {archive.name}: {e}")
+        return members
+
+    def _read_directory(self, directory: Path, depth: int,
+                        sniff_keys: Optional[Dict[str, tuple]]):
+        """
+        Lit un niveau de dossier (voir _iter_directory)
+
+        Args:
+            directory: Dossier à lire
+            depth: Profondeur actuelle
+            sniff_keys: Si fourni, reçoit la clé (inode, mtime_ns) de chaque fichier
+        """
+        # Règles d'exclusion héritées du dossier parent
+        matcher = self._dir_matchers.pop(str(directory), self._ignore_root)
+
         if depth > self.max_depth:
             print(f"⚠️  Profondeur maximale atteinte pour: {directory}")
             return
 
+        rel_dir = self._relative_dir(directory)
+        listing = None
+        if self._manifest is not None:
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError as e:
+                print(f"⚠️  Accès refusé: {directory} ({e})")
+                return
+
+            cached = self._previous_manifest.get(rel_dir) if self._previous_manifest else None
+            if cached is not None and cached.mtime_ns == mtime_ns:
+                if self._verify_files:
+                    cached = self._revalidate_listing(directory, cached)
+                self._manifest.directories[rel_dir] = cached
+                if self._ignore_files:
+                    matcher = self._read_ignore_file(directory, rel_dir, matcher)
+                yield from self._replay_listing(directory, depth, cached, matcher, sniff_keys)
+                return
+
+            listing = DirectoryListing(mtime_ns)
+
+        exclude = self._exclude
+        flt = self._filter
+        prefix = rel_dir.replace(os.sep, '/') + '/' if rel_dir else ''
+        # Le manifeste (et un filtre sur la taille ou la date) a besoin du stat()
+        # de chaque fichier : pas de scan léger
+        light = self._light and listing is None and not (flt is not None and flt.needs_stat)
+        parent_name = directory.name
+
         try:
-            for entry in os.scandir(directory):
+            entries = os.scandir(directory)
+            if self._ignore_files:
+                entries = list(entries)
+                if any(entry.name == IGNORE_FILENAME for entry in entries):
+                    matcher = self._read_ignore_file(directory, rel_dir, matcher)
+
+            for entry in entries:
                 # Ignorer les dossiers exclus
-                if entry.name in exclude_folders:
+                if entry.name in exclude:
                     continue
 
                 if entry.is_file():
-                    file_info = self._create_file_info(entry, depth)
+                    if matcher and matcher.is_ignored(prefix + entry.name, False):
+                        continue
+                    if flt is not None and not self._prefilter(entry, listing):
+                        continue
+                    if light:
+                        file_info = self._create_light_file_info(entry, depth, rel_dir, parent_name)
+                    else:
+                        file_info = self._create_file_info(entry, depth)
+                        if file_info:
+                            stat = entry.stat()
+                            if stat.st_nlink > 1 or entry.is_symlink():
+                                self._note_link(file_info, stat)
                     if file_info:
-                        self.files.append(file_info)
+                        if listing is not None:
+                            listing.add_file(entry.name, entry.stat())
+                        if sniff_keys is not None:
+                            stat = entry.stat()
+                            sniff_keys[entry.name] = (stat.st_ino, stat.st_mtime_ns)
+                        yield file_info
 
                 elif entry.is_dir():
-                    self.stats['total_folders'] += 1
-                    self._scan_directory(Path(entry.path), depth + 1, exclude_folders)
+                    # Élagage : un dossier exclu n'est jamais parcouru
+                    if matcher and matcher.is_ignored(prefix + entry.name, True):
+                        continue
+                    if listing is not None:
+                        listing.add_dir(entry.name)
+                    if matcher is not self._ignore_root:
+                        self._dir_matchers[entry.path] = matcher
+                    yield Path(entry.path)
+
+            if listing is not None:
+                self._manifest.directories[rel_dir] = listing
 
         except PermissionError:
             print(f"⚠️  Accès refusé: {directory}")
         except Exception as e:
             print(f"❌ Erreur lors du scan de {directory}: {e}")
 
+    def _prefilter(self, entry: os.DirEntry, listing: Optional[DirectoryListing]) -> bool:
+        """
+        Applique le filtre de sélection à une entrée, avant la création du FileInfo
+
+        Le nom est testé en premier ; la taille et la date ne sont lues (stat(),
+        mis en cache par DirEntry) que si le nom est retenu. Un fichier rejeté
+        est tout de même inscrit au manifeste.
+
+        Args:
+            entry: Entrée du système de fichiers
+            listing: Contenu du dossier en cours de mémorisation (rescan), ou None
+
+        Returns:
+            True si le fichier est retenu
+        """
+        flt = self._filter
+        if not self._filter_name(self._get_extension(entry.name)):
+            if listing is not None:
+                try:
+                    listing.add_file(entry.name, entry.stat())
+                except OSError:
+                    pass
+            return False
+
+        if flt.needs_stat:
+            try:
+                stat = entry.stat()
+            except OSError:
+                return True             # erreur signalée par _create_file_info
+            if not flt.match_stat(stat.st_size, stat.st_mtime):
+                if listing is not None:
+                    listing.add_file(entry.name, stat)
+                return False
+        return True
+
+    def _filter_name(self, extension: str) -> bool:
+        """
+        Décision du filtre d'après l'extension seule (mémorisée par extension)
+
+        Avec sniff_content, le type n'est connu qu'après lecture du contenu :
+        seule l'extension est testée ici.
+
+        Args:
+            extension: Extension du fichier
+
+        Returns:
+            True si le fichier peut être retenu
+        """
+        accepted = self._filter_names.get(extension)
+        if accepted is None:
+            flt = self._filter
+            accepted = flt.match_extension(extension) and (
+                self._sniff_content or flt.match_type(self._classify_file(extension)))
+            self._filter_names[extension] = accepted
+        return accepted
+
+    def _sniff_items(self, directory: Path, items: List, sniff_keys: Dict[str, tuple]):
+        """
+        Détecte le type réel des fichiers d'un dossier et corrige leur classification
+
+        Le format détecté est mémorisé dans le manifeste : un rescan ne relit pas
+        les fichiers inchangés.
+
+        Args:
+            directory: Dossier lu
+            items: Contenu du dossier (FileInfo et Path)
+            sniff_keys: Clé (inode, mtime_ns) de chaque fichier
+        """
+        files = [item for item in items if not isinstance(item, Path) and item.size_bytes]
+        if not files:
+            return
+
+        detected = self.sniffer.sniff([(f.path, sniff_keys.get(f.name)) for f in files])
+        listing = None
+        if self._manifest is not None:
+            listing = self._manifest.directories.get(self._relative_dir(directory))
+
+        for file_info, value in zip(files, detected):
+            content_type = resolve_content_type(value, file_info.extension)
+            file_info.content_type = content_type
+            if content_type is not None and content_type != file_info.extension:
+                file_info.file_type = self._classify_file(content_type)
+                file_info.is_email = content_type in self.EMAIL_EXTENSIONS
+            if listing is not None:
+                listing.extra.setdefault(file_info.name, {})['content_format'] = value
+
+    def _read_ignore_file(self, directory: Path, rel_dir: str,
+                          matcher: IgnoreMatcher) -> IgnoreMatcher:
+        """
+        Ajoute les règles du fichier .analystignore d'un dossier, s'il existe
+
+        Args:
+            directory: Dossier concerné
+            rel_dir: Chemin relatif du dossier
+            matcher: Règles héritées
+
+        Returns:
+            Règles applicables au dossier
+        """
+        path = directory / IGNORE_FILENAME
+        if not path.is_file():
+            return matcher
+        return matcher.child(IgnoreRules.from_file(str(path), rel_dir.replace(os.sep, '/')))
+
+    def _register_folder(self, directory: Path):
+        """
+        Comptabilise un sous-dossier rencontré pendant le parcours
+
+        Args:
+            directory: Sous-dossier
+        """
+        self.stats['total_folders'] += 1
+        self.tree_index.add_directory(self._relative_dir(directory))
+
+    def _relative_dir(self, directory: Path) -> str:
+        """
+        Chemin d'un dossier relatif à la racine ('' pour la racine)
+
+        Args:
+            directory: Dossier sous la racine
+
+        Returns:
+            Chemin relatif
+        """
+        root = str(self.root_path)
+        path = str(directory)
+        return path[len(root):].lstrip(os.sep) if path != root else ''
+
+    def _replay_listing(self, directory: Path, depth: int, listing: DirectoryListing,
+                        matcher: IgnoreMatcher, sniff_keys: Optional[Dict[str, tuple]] = None):
+        """
+        Rejoue le contenu mémorisé d'un dossier inchangé
+
+        Args:
+            directory: Dossier concerné
+            depth: Profondeur du dossier
+            listing: Contenu mémorisé
+            matcher: Règles d'exclusion applicables au dossier (transmises aux sous-dossiers)
+            sniff_keys: Si fourni, reçoit la clé (inode, mtime_ns) de chaque fichier
+
+        Returns:
+            Itérateur de FileInfo et de Path, comme _iter_directory
+        """
+        flt = self._filter
+        for i, name in enumerate(listing.names):
+            if listing.kinds[i] == DirectoryListing.KIND_DIR:
+                subdir = directory / name
+                if matcher is not self._ignore_root:
+                    self._dir_matchers[str(subdir)] = matcher
+                yield subdir
+            else:
+                if flt is not None and not (
+                        self._filter_name(self._get_extension(name))
+                        and flt.match_stat(listing.sizes[i], ns_to_timestamp(listing.mtimes[i]))):
+                    continue
+                file_info = self._file_info_from_values(
+                    directory, name, depth, listing.sizes[i],
+                    ns_to_timestamp(listing.ctimes[i]), ns_to_timestamp(listing.mtimes[i])
+                )
+                extra = listing.extra.get(name)
+                if extra:
+                    file_info.quick_hash = extra.get('quick_hash')
+                    file_info.content_hash = extra.get('content_hash')
+                if sniff_keys is not None:
+                    key = (listing.inodes[i], listing.mtimes[i])
+                    sniff_keys[name] = key
+                    # Format déjà détecté lors d'un scan précédent : aucune lecture
+                    if extra and 'content_format' in extra:
+                        self.sniffer.cache[key] = extra['content_format']
+                yield file_info
+
+    def _revalidate_listing(self, directory: Path, listing: DirectoryListing) -> DirectoryListing:
+        """
+        Refait un stat() des fichiers d'un dossier inchangé
+
+        Args:
+            directory: Dossier concerné
+            listing: Contenu mémorisé
+
+        Returns:
+            Le même contenu si rien n'a changé, sinon un contenu mis à jour
+        """
+        refreshed = DirectoryListing(listing.mtime_ns)
+        changed = False
+
+        for i, name in enumerate(listing.names):
+            if listing.kinds[i] == DirectoryListing.KIND_DIR:
+                refreshed.add_dir(name)
+                continue
+            try:
+                stat = os.stat(directory / name)
+            except OSError:
+                changed = True
+                continue
+            refreshed.add_file(name, stat)
+            if (stat.st_size, stat.st_mtime_ns, stat.st_ino) != \
+                    (listing.sizes[i], listing.mtimes[i], listing.inodes[i]):
+                changed = True
+            elif name in listing.extra:
+                refreshed.extra[name] = listing.extra[name]
+
+        return refreshed if changed else listing
+
+    def _file_info_from_values(self, directory: Path, name: str, depth: int,
+                               size: int, ctime: float, mtime: float) -> FileInfo:
+        """
+        Construit un FileInfo à partir de valeurs déjà connues (sans accès disque)
+
+        Args:
+            directory: Dossier parent
+            name: Nom du fichier
+            depth: Profondeur dans l'arborescence
+            size: Taille en octets
+            ctime: Date de création (timestamp)
+            mtime: Date de modification (timestamp)
+
+        Returns:
+            FileInfo
+        """
+        extension = self._get_extension(name)
+        return FileInfo(
+            name=name,
+            path=os.path.join(str(directory), name),
+            relative_path=os.path.join(self._relative_dir(directory), name),
+            extension=extension,
+            size_bytes=size,
+            created_ts=ctime,
+            modified_ts=mtime,
+            file_type=self._classify_file(extension),
+            depth=depth,
+            parent_folder=directory.name,
+            is_email=extension in self.EMAIL_EXTENSIONS
+        )
+
     def _create_file_info(self, entry: os.DirEntry, depth: int) -> Optional[FileInfo]:
         """
         Crée un objet FileInfo à partir d'une entrée
@@ -145,10 +1326,8 @@ class FolderScanner:
                 relative_path=str(file_path.relative_to(self.root_path)),
                 extension=extension,
                 size_bytes=stat.st_size,
-                size_kb=round(stat.st_size / 1024, 2),
-                size_mb=round(stat.st_size / (1024 * 1024), 2),
-                created_date=datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d %H:%M:%S'),
-                modified_date=datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+                created_ts=stat.st_ctime,
+                modified_ts=stat.st_mtime,
                 file_type=file_type,
                 depth=depth,
                 parent_folder=file_path.parent.name,
@@ -159,6 +1338,99 @@ class FolderScanner:
             print(f"⚠️  Erreur lecture fichier {entry.name}: {e}")
             return None
 
+    def _create_light_file_info(self, entry: os.DirEntry, depth: int, rel_dir: str,
+                                parent_name: str) -> LazyFileInfo:
+        """
+        Crée un FileInfo sans appel système (scan léger)
+
+        Args:
+            entry: Entrée du système de fichiers
+            depth: Profondeur dans l'arborescence
+            rel_dir: Chemin relatif du dossier parent
+            parent_name: Nom du dossier parent
+
+        Returns:
+            LazyFileInfo
+        """
+        name = entry.name
+        extension = self._get_extension(name)
+        return LazyFileInfo(
+            name=name,
+            path=entry.path,
+            relative_path=os.path.join(rel_dir, name),
+            extension=extension,
+            file_type=self._classify_file(extension),
+            depth=depth,
+            parent_folder=parent_name,
+            is_email=extension in self.EMAIL_EXTENSIONS
+        )
+
+    def find_duplicates(self, workers: Optional[int] = None,
+                        block_size: Optional[int] = None) -> List[List[FileInfo]]:
+        """
+        Recherche les fichiers en double parmi les fichiers scannés
+
+        Les fichiers sont comparés par taille, puis par empreinte du premier et du
+        dernier bloc, et seules les collisions restantes sont lues entièrement.
+        Après un rescan(), les empreintes sont mémorisées dans le manifeste.
+
+        Args:
+            workers: Nombre de processus de calcul (None = nombre de CPU)
+            block_size: Taille des blocs de l'empreinte partielle (octets)
+
+        Returns:
+            Groupes de doublons, les plus coûteux d'abord
+        """
+        from .duplicates import DuplicateFinder, DEFAULT_BLOCK_SIZE
+
+        finder = DuplicateFinder(block_size or DEFAULT_BLOCK_SIZE, workers)
+        duplicates = finder.find(self.files)
+
+        self.stats['duplicate_groups'] = finder.stats['duplicate_groups']
+        self.stats['duplicate_files'] = finder.stats['duplicate_files']
+        self.stats['wasted_bytes'] = finder.stats['wasted_bytes']
+        self.stats['wasted_mb'] = round(finder.stats['wasted_bytes'] / (1024 * 1024), 2)
+
+        if self._last_manifest is not None:
+            self._store_hashes(self._last_manifest)
+            self._last_manifest.save(self._last_manifest_path)
+
+        print(f"🔁 Doublons: {len(duplicates)} groupes, {self.stats['wasted_mb']} MB récupérables")
+        return duplicates
+
+    def _store_hashes(self, manifest: ScanManifest):
+        """
+        Mémorise les empreintes calculées dans les champs dérivés du manifeste
+
+        Args:
+            manifest: Manifeste à compléter
+        """
+        for file in self.files:
+            if file.quick_hash is None:
+                continue
+            listing = manifest.get(os.path.dirname(file.relative_path))
+            if listing is not None:
+                listing.extra.setdefault(file.name, {}).update(
+                    quick_hash=file.quick_hash,
+                    content_hash=file.content_hash
+                )
+
+    @staticmethod
+    def _get_extension(name: str) -> str:
+        """
+        Extension d'un nom de fichier, avec la même règle que Path.suffix
+
+        Args:
+            name: Nom du fichier
+
+        Returns:
+            Extension en minuscules ('' si aucune)
+        """
+        i = name.rfind('.')
+        if 0 < i < len(name) - 1:
+            return name[i:].lower()
+        return ''
+
     def _classify_file(self, extension: str) -> str:
         """
         Classifie un fichier selon son extension
@@ -180,18 +1452,86 @@ class FolderScanner:
         else:
             return "Autres fichiers"
 
-    def _compute_stats(self):
-        """Calcule les statistiques sur les fichiers scannés"""
-        self.stats['total_files'] = len(self.files)
-        self.stats['total_size_mb'] = sum(f.size_mb for f in self.files)
-        self.stats['total_emails'] = sum(1 for f in self.files if f.is_email)
+    def _reset_stats(self):
+        """Réinitialise les statistiques avant un nouveau scan (en place)"""
+        self.stats.clear()
+        self.stats.update({
+            'total_files': 0,
+            'total_size_mb': 0,
+            'unique_size_mb': 0,
+            'total_emails': 0,
+            'total_folders': 0,
+            'by_type': {},
+            'by_extension': {},
+            'archive_members': 0,
+            'archive_members_size_mb': 0
+        })
+
+    def _update_stats(self, file: FileInfo):
+        """
+        Met à jour les statistiques avec un fichier
+
+        En scan léger, la taille n'est pas lue (elle coûterait un stat()).
+
+        Args:
+            file: Fichier à comptabiliser
+        """
+        # Membres d'archives : comptés à part pour ne pas fausser l'occupation disque
+        if file.archive_path is not None:
+            self.stats['archive_members'] += 1
+            self.stats['archive_members_size_mb'] += file.size_mb
+            return
+
+        sized = not isinstance(file, LazyFileInfo) or file.stat_loaded
+        self.stats['total_files'] += 1
+        if sized:
+            self.stats['total_size_mb'] += file.size_mb
+            # Liens multiples vers un même fichier : volume compté une seule fois
+            if not self._duplicate_links or file.path not in self._duplicate_links:
+                self.stats['unique_size_mb'] += file.size_mb
+        if file.is_email:
+            self.stats['total_emails'] += 1
 
         # Stats par type
-        for file in self.files:
-            self.stats['by_type'][file.file_type] = \
-                self.stats['by_type'].get(file.file_type, 0) + 1
-            self.stats['by_extension'][file.extension] = \
-                self.stats['by_extension'].get(file.extension, 0) + 1
+        self.stats['by_type'][file.file_type] = \
+            self.stats['by_type'].get(file.file_type, 0) + 1
+        self.stats['by_extension'][file.extension] = \
+            self.stats['by_extension'].get(file.extension, 0) + 1
+
+        self.tree_index.add_file(os.path.dirname(file.relative_path), file.name,
+                                 file.size_bytes if sized else 0)
+
+    def _remove_stats(self, file: FileInfo, update_index: bool = True):
+        """
+        Retire un fichier des statistiques (inverse de _update_stats)
+
+        Args:
+            file: Fichier à décompter
+            update_index: Retirer aussi le fichier de l'index des dossiers
+        """
+        if file.archive_path is not None:
+            self.stats['archive_members'] -= 1
+            self.stats['archive_members_size_mb'] -= file.size_mb
+            return
+
+        self.stats['total_files'] -= 1
+        self.stats['total_size_mb'] -= file.size_mb
+        if file.path in self._duplicate_links:
+            self._duplicate_links.discard(file.path)
+        else:
+            self.stats['unique_size_mb'] = self.stats.get('unique_size_mb', 0) - file.size_mb
+        if file.is_email:
+            self.stats['total_emails'] -= 1
+
+        for key, value in (('by_type', file.file_type), ('by_extension', file.extension)):
+            counts = self.stats[key]
+            counts[value] = counts.get(value, 0) - 1
+            if counts[value] <= 0:
+                del counts[value]
+
+        if update_index:
+            self.tree_index.remove_file(os.path.dirname(file.relative_path), file.name,
+                                        file.size_bytes)
 
     def export_to_json(self, output_path: str):
         """
@@ -212,56 +1552,203 @@ class FolderScanner:
 
         print(f"📄 Export JSON: {output_path}")
 
-    def export_to_csv(self, output_path: str):
+    def export_to_csv(self, output_path: str, files: Optional[Iterable[FileInfo]] = None):
         """
         Exporte les résultats en CSV
 
         Args:
             output_path: Chemin du fichier de sortie
+            files: Fichiers à exporter (par défaut self.files) ; accepte un flux,
+                   par exemple scanner.iter_scan()
         """
         import csv
 
-        if not self.files:
+        rows = iter(self.files if files is None else files)
+        first = next(rows, None)
+        if first is None:
             print("⚠️  Aucun fichier à exporter")
             return
 
         with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=self.files[0].to_dict().keys())
+            first_row = first.to_dict()
+            writer = csv.DictWriter(f, fieldnames=first_row.keys())
             writer.writeheader()
-            for file in self.files:
+            writer.writerow(first_row)
+            for file in rows:
                 writer.writerow(file.to_dict())
 
         print(f"📊 Export CSV: {output_path}")
 
-    def get_tree_structure(self, max_depth: int = 3) -> str:
+    def export_stream(self, output_path: str, file_format: Optional[str] = None,
+                      compression: Optional[str] = None,
+                      files: Optional[Iterable[FileInfo]] = None) -> int:
         """
-        Génère une représentation textuelle de l'arborescence
+        Exporte les résultats en flux (NDJSON, JSON ou CSV), éventuellement compressés
+
+        Les lignes sont écrites une à une : la mémoire reste constante, y compris
+        avec files=scanner.iter_scan(). Format et compression sont déduits de
+        l'extension (ex: fichiers.ndjson.gz, fichiers.csv.xz) s'ils ne sont pas fournis.
 
         Args:
-            max_depth: Profondeur maximale à afficher
+            output_path: Chemin du fichier de sortie
+            file_format: 'ndjson', 'json' ou 'csv'
+            compression: None, 'gzip' ou 'xz'
+            files: Fichiers à exporter (par défaut self.files)
 
         Returns:
-            Arborescence sous forme de texte
+            Nombre de fichiers exportés
         """
-        tree = {}
+        from .exporters import export_stream
 
-        for file in self.files:
-            if file.depth > max_depth:
-                continue
+        count = export_stream(
+            self.files if files is None else files, output_path, file_format, compression,
+            root_path=str(self.root_path), stats=self.stats
+        )
+        print(f"📄 Export: {output_path} ({count} fichiers)")
+        return count
+
+    def save_snapshot(self, output_path: str) -> int:
+        """
+        Enregistre les résultats dans un snapshot binaire en colonnes
+
+        Args:
+            output_path: Chemin du snapshot
 
-            parts = Path(file.relative_path).parts
-            current = tree
+        Returns:
+            Nombre de fichiers enregistrés
+        """
+        from .snapshot import save_snapshot
+
+        # Fichiers à liens multiples : dédoublonnés entre shards à la fusion
+        links = [[dev, ino, path, size]
+                 for (dev, ino), (path, size) in self._linked_files.items()]
+        count = save_snapshot(self.files, output_path, str(self.root_path), self.stats, links)
+        print(f"💾 Snapshot: {output_path} ({count} fichiers)")
+        return count
+
+    @classmethod
+    def load_snapshot(cls, snapshot_path: str) -> 'FolderScanner':
+        """
+        Recharge un snapshot sans refaire le scan
+
+        Le fichier est mappé en mémoire : l'ouverture est quasi instantanée et
+        chaque ligne n'est décodée qu'à l'accès. self.files est une FileTable
+        utilisable directement par le reporter, le classificateur, les exports
+        et find_duplicates (les empreintes calculées restent en mémoire, le
+        fichier n'est pas modifié).
+
+        Args:
+            snapshot_path: Chemin du snapshot
+
+        Returns:
+            FolderScanner prêt à l'emploi (sans nouveau scan)
+        """
+        from .snapshot import load_snapshot
+
+        table, meta = load_snapshot(snapshot_path)
+        scanner = cls(meta['root_path'])
+        scanner.files = table
+        scanner.stats.update(meta['stats'])
+        return scanner
+
+    def save_catalog(self, db_path: str, label: Optional[str] = None) -> int:
+        """
+        Enregistre les résultats dans un catalogue SQLite (interrogeable, recherche plein texte)
+
+        Args:
+            db_path: Chemin de la base (créée si nécessaire ; un catalogue peut contenir plusieurs scans)
+            label: Libellé libre du scan
+
+        Returns:
+            Identifiant du scan dans le catalogue
+        """
+        from .catalog import ScanCatalog
+
+        with ScanCatalog(db_path) as catalog:
+            scan_id = catalog.add_scan(self.files, self.root_path, self.stats, label)
+        print(f"🗃️  Catalogue: {db_path} ({len(self.files)} fichiers, scan #{scan_id})")
+        return scan_id
+
+    @classmethod
+    def load_catalog(cls, db_path: str, scan_id: Optional[int] = None) -> 'FolderScanner':
+        """
+        Recharge un scan depuis un catalogue SQLite sans refaire le scan
+
+        self.files est une FileTable, utilisable directement par le reporter,
+        le classificateur et les exports.
+
+        Args:
+            db_path: Chemin de la base
+            scan_id: Scan à recharger (par défaut le plus récent)
+
+        Returns:
+            FolderScanner prêt à l'emploi (sans nouveau scan)
+        """
+        from .catalog import ScanCatalog
 
-            for part in parts[:-1]:
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
+        with ScanCatalog(db_path) as catalog:
+            if scan_id is None:
+                scan_id = catalog.latest_scan()
+                if scan_id is None:
+                    raise KeyError(f"Catalogue vide: {db_path}")
+            scanner = cls(catalog.root_path(scan_id))
+            scanner.files = catalog.load_files(scan_id)
+            scanner.stats.update(catalog.load_stats(scan_id))
+        return scanner
 
-            if '_files' not in current:
-                current['_files'] = []
-            current['_files'].append(file.name)
+    def get_directory_index(self) -> DirectoryIndex:
+        """
+        Retourne l'index des dossiers, en le reconstruisant si nécessaire
+
+        L'index est construit pendant scan() ; après un iter_scan() ou un
+        load_snapshot(), il est reconstruit en une passe sur self.files.
+
+        Returns:
+            DirectoryIndex
+        """
+        index = self.tree_index
+        disk_files = len(self.files) - self.stats.get('archive_members', 0)
+        if not index.keep_names or index.total_files != disk_files:
+            index = DirectoryIndex.from_files(self.files, self.root_path.name)
+            self.tree_index = index
+        return index
+
+    def build_file_index(self):
+        """
+        Construit un index des fichiers scannés pour les requêtes répétées
+
+        Returns:
+            FileIndex sur self.files (à reconstruire après un nouveau scan)
+        """
+        from .file_index import FileIndex
+
+        return FileIndex(self.files)
+
+    def top_folders(self, n: int = 10, by: str = 'bytes'):
+        """
+        Dossiers les plus lourds (totaux du sous-arbre)
+
+        Args:
+            n: Nombre de dossiers
+            by: 'bytes' ou 'files'
+
+        Returns:
+            Liste de DirectoryNode, du plus lourd au plus léger
+        """
+        return self.tree_index.top_folders(n, by) if self.tree_index.total_files \
+            else self.get_directory_index().top_folders(n, by)
+
+    def get_tree_structure(self, max_depth: int = 3) -> str:
+        """
+        Génère une représentation textuelle de l'arborescence
+
+        Args:
+            max_depth: Profondeur maximale à afficher
 
-        return self._format_tree(tree)
+        Returns:
+            Arborescence sous forme de texte
+        """
+        return self._format_tree(self.get_directory_index().to_nested_dict(max_depth))
 
     def _format_tree(self, tree: dict, prefix: str = "", is_last: bool = True) -> str:
         """
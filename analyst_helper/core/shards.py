@@ -0,0 +1,387 @@
+"""
+Module de scan en shards (plusieurs racines, plusieurs processus ou machines)
+Découpe l'arborescence en sous-arbres de taille estimée équilibrée et fusionne les résultats
+"""
+
+import heapq
+import json
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .scanner import FolderScanner
+
+# Nombre de descentes aléatoires par sous-arbre pour estimer son nombre d'entrées
+PROBES = 8
+# Le découpage continue tant qu'une unité dépasse 1/OVERSPLIT de la part d'un shard
+OVERSPLIT = 4
+# Nombre maximal de dossiers lus pendant la planification
+MAX_PLAN_READS = 5000
+
+
+@dataclass
+class ScanShard:
+    """Partie d'une arborescence à scanner
+
+    Une unité (chemin relatif, récursif) désigne un sous-arbre complet, ou
+    seulement les fichiers d'un dossier découpé (récursif = False). Les
+    chemins sont relatifs à root_path, la racine commune de tous les shards.
+    """
+    index: int
+    root_path: str
+    units: List[Tuple[str, bool]] = field(default_factory=list)
+    # Dossiers intermédiaires à comptabiliser (entre la racine commune et les racines scannées)
+    folders: List[str] = field(default_factory=list)
+    estimated_entries: int = 0
+
+    def to_dict(self) -> Dict:
+        """Convertit en dictionnaire (JSON)"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ScanShard':
+        """Reconstruit un shard depuis to_dict()"""
+        return cls(data['index'], data['root_path'],
+                   [(rel, bool(recursive)) for rel, recursive in data['units']],
+                   list(data.get('folders', ())), data.get('estimated_entries', 0))
+
+    def save(self, path: str):
+        """
+        Enregistre la description du shard (pour un scan sur une autre machine)
+
+        Args:
+            path: Chemin du fichier JSON
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'ScanShard':
+        """
+        Relit une description de shard
+
+        Args:
+            path: Chemin du fichier JSON
+
+        Returns:
+            ScanShard
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+class ShardPlanner:
+    """Découpe une arborescence en shards de taille estimée équilibrée
+
+    La taille d'un sous-arbre est estimée par descentes aléatoires (estimateur
+    de Knuth) : à chaque niveau, un sous-dossier est tiré au hasard et le
+    nombre d'entrées lues est pondéré par le produit des nombres de
+    sous-dossiers rencontrés. Le plus gros sous-arbre est découpé en ses
+    sous-dossiers tant qu'il dépasse une fraction de la part d'un shard, puis
+    les unités sont réparties de la plus grosse à la plus petite sur le shard
+    le moins chargé. Seuls des scandir sont faits, sans stat() des fichiers.
+    """
+
+    def __init__(self, root_path: Union[str, os.PathLike], probes: int = PROBES,
+                 max_reads: int = MAX_PLAN_READS, seed: Optional[int] = None, **scan_options):
+        """
+        Initialise la planification
+
+        Args:
+            root_path: Racine commune des shards
+            probes: Descentes aléatoires par sous-arbre
+            max_reads: Nombre maximal de dossiers lus
+            seed: Graine du tirage (plan reproductible)
+            **scan_options: Options d'exclusion du scan (exclude_folders, ignore, ignore_files)
+        """
+        self.scanner = FolderScanner(root_path)
+        self.scanner._configure_walk(scan_options.get('exclude_folders'),
+                                     scan_options.get('ignore'),
+                                     scan_options.get('ignore_files', False), light=True)
+        self.probes = probes
+        self.max_reads = max_reads
+        self.rng = random.Random(seed)
+        self._listings: Dict[str, Tuple[int, List[str]]] = {}
+
+    @property
+    def root_path(self) -> Path:
+        return self.scanner.root_path
+
+    def listing(self, rel_dir: str) -> Tuple[int, List[str]]:
+        """
+        Contenu d'un dossier (lu une seule fois)
+
+        Args:
+            rel_dir: Chemin relatif du dossier
+
+        Returns:
+            Tuple (nombre de fichiers, chemins relatifs des sous-dossiers)
+        """
+        cached = self._listings.get(rel_dir)
+        if cached is None:
+            scanner = self.scanner
+            directory = self.root_path / rel_dir if rel_dir else self.root_path
+            if str(directory) not in scanner._dir_matchers:
+                scanner._dir_matchers[str(directory)] = scanner._subtree_matcher(rel_dir)
+
+            files, subdirs = 0, []
+            for item in scanner._read_directory(directory, len(Path(rel_dir).parts), None):
+                if isinstance(item, Path):
+                    subdirs.append(os.path.join(rel_dir, item.name))
+                else:
+                    files += 1
+            cached = self._listings[rel_dir] = (files, subdirs)
+        return cached
+
+    def estimate(self, rel_dir: str) -> float:
+        """
+        Estime le nombre d'entrées (fichiers et dossiers) d'un sous-arbre
+
+        Args:
+            rel_dir: Chemin relatif du sous-arbre
+
+        Returns:
+            Estimation (moyenne des descentes aléatoires)
+        """
+        total = 0.0
+        for _ in range(self.probes):
+            weight, current = 1.0, rel_dir
+            while True:
+                files, subdirs = self.listing(current)
+                total += weight * (files + len(subdirs))
+                if not subdirs or len(self._listings) >= self.max_reads:
+                    break
+                weight *= len(subdirs)
+                current = self.rng.choice(subdirs)
+        return total / self.probes
+
+    def plan(self, count: int, roots: Iterable[str] = ('',)) -> List[ScanShard]:
+        """
+        Découpe les sous-arbres `roots` en `count` shards
+
+        Args:
+            count: Nombre de shards
+            roots: Chemins relatifs des racines à scanner ('' = toute la racine)
+
+        Returns:
+            Liste de ScanShard (certains peuvent être vides si l'arborescence est petite)
+        """
+        roots = list(roots)
+        subtrees = {rel: self.estimate(rel) for rel in roots}
+        files_only: Dict[str, int] = {}
+        leaves = set()
+
+        while subtrees and len(self._listings) < self.max_reads:
+            total = sum(subtrees.values()) + sum(files_only.values())
+            candidates = [rel for rel in subtrees if rel not in leaves]
+            if not candidates:
+                break
+            largest = max(candidates, key=subtrees.get)
+            if subtrees[largest] <= total / (count * OVERSPLIT):
+                break
+            files, subdirs = self.listing(largest)
+            if not subdirs:
+                leaves.add(largest)
+                continue
+            del subtrees[largest]
+            files_only[largest] = files + len(subdirs)
+            for rel in subdirs:
+                subtrees[rel] = self.estimate(rel)
+
+        # Répartition gloutonne : la plus grosse unité va au shard le moins chargé
+        shards = [ScanShard(i, str(self.root_path)) for i in range(count)]
+        loads = [(0.0, i) for i in range(count)]
+        units = [(size, rel, True) for rel, size in subtrees.items()] + \
+                [(size, rel, False) for rel, size in files_only.items()]
+        for size, rel, recursive in sorted(units, key=lambda unit: (-unit[0], unit[1])):
+            load, i = heapq.heappop(loads)
+            shards[i].units.append((rel, recursive))
+            heapq.heappush(loads, (load + size, i))
+        for load, i in loads:
+            shards[i].estimated_entries = round(load)
+
+        # Dossiers entre la racine commune et les racines scannées : comptés une fois
+        ancestors = set()
+        for rel in roots:
+            parts = Path(rel).parts
+            ancestors.update(os.path.join(*parts[:i]) for i in range(1, len(parts)))
+        shards[0].folders = sorted(ancestors)
+        return shards
+
+
+def plan_shards(roots: Iterable[Union[str, os.PathLike]], count: int,
+                seed: Optional[int] = None, **scan_options) -> List[ScanShard]:
+    """
+    Découpe une ou plusieurs racines en shards équilibrés
+
+    Plusieurs racines (points de montage...) sont rattachées à leur dossier
+    parent commun : les chemins relatifs du résultat fusionné partent de ce dossier.
+
+    Args:
+        roots: Dossiers à scanner
+        count: Nombre de shards
+        seed: Graine du tirage (plan reproductible)
+        **scan_options: Options d'exclusion du scan (exclude_folders, ignore, ignore_files)
+
+    Returns:
+        Liste de ScanShard
+    """
+    roots = [Path(root).resolve() for root in roots]
+    if len(roots) == 1:
+        base = roots[0]
+    else:
+        base = Path(os.path.commonpath([str(root) for root in roots]))
+        for i, root in enumerate(roots):
+            for other in roots[i + 1:]:
+                if root == other or root in other.parents or other in root.parents:
+                    raise ValueError(f"Racines imbriquées: {root} et {other}")
+    planner = ShardPlanner(base, seed=seed, **scan_options)
+    return planner.plan(max(1, count), [os.path.relpath(root, base) if root != base else ''
+                                        for root in roots])
+
+
+def run_shard(shard: Union[ScanShard, Dict, str], output_path: str, **scan_options) -> int:
+    """
+    Scanne un shard et enregistre un snapshot autonome
+
+    Utilisable sur une autre machine, à partir de la description enregistrée
+    par ScanShard.save() et d'un dossier partagé pour les snapshots.
+
+    Args:
+        shard: ScanShard, dictionnaire (to_dict) ou chemin du fichier JSON
+        output_path: Chemin du snapshot produit
+        **scan_options: Options de scan() (exclude_folders, ignore, sniff_content...)
+
+    Returns:
+        Nombre de fichiers scannés
+    """
+    if isinstance(shard, str):
+        shard = ScanShard.load(shard)
+    elif isinstance(shard, dict):
+        shard = ScanShard.from_dict(shard)
+
+    scanner = FolderScanner(shard.root_path)
+    scanner.scan_shard(shard, **scan_options)
+    return scanner.save_snapshot(output_path)
+
+
+def merge_stats(stats_list: Iterable[Dict]) -> Dict:
+    """
+    Additionne les statistiques de plusieurs shards
+
+    Args:
+        stats_list: Statistiques de chaque shard
+
+    Returns:
+        Statistiques combinées (compteurs et répartitions additionnés)
+    """
+    merged: Dict = {}
+    for stats in stats_list:
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                counts = merged.setdefault(key, {})
+                for name, count in value.items():
+                    counts[name] = counts.get(name, 0) + count
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[key] = merged.get(key, 0) + value
+    for key in merged:
+        if key.endswith('_mb'):
+            merged[key] = round(merged[key], 2)
+    return merged
+
+
+def merge_shards(paths: Iterable[str]) -> FolderScanner:
+    """
+    Fusionne les snapshots de shards en un seul résultat
+
+    Args:
+        paths: Snapshots produits par run_shard (même racine commune)
+
+    Un fichier à liens multiples dont les noms tombent dans plusieurs shards
+    est compté une fois par shard dans unique_size_mb : le volume unique est
+    corrigé d'après les (st_dev, st_ino) enregistrés par chaque shard.
+
+    Returns:
+        FolderScanner avec tous les fichiers (FileTable) et les statistiques combinées
+    """
+    from .snapshot import load_snapshot
+    from .table import FileTable
+
+    table = None
+    stats_list = []
+    linked: Dict[tuple, tuple] = {}
+    duplicate_mb = 0.0
+    for path in paths:
+        shard_table, meta = load_snapshot(path)
+        if table is None:
+            table = FileTable(meta['root_path'])
+        elif meta['root_path'] != table.root_path:
+            raise ValueError(f"Shard d'une autre racine: {path} ({meta['root_path']})")
+        table.extend(shard_table)
+        stats_list.append(meta['stats'])
+        for dev, ino, link_path, size in meta.get('links', ()):
+            if (dev, ino) in linked:
+                # Déjà compté par un shard précédent
+                duplicate_mb += round(size / (1024 * 1024), 2)
+            else:
+                linked[(dev, ino)] = (link_path, size)
+
+    if table is None:
+        raise ValueError("Aucun shard à fusionner")
+    scanner = FolderScanner(table.root_path)
+    scanner.files = table
+    scanner._linked_files = linked
+    stats = merge_stats(stats_list)
+    if 'unique_size_mb' in stats:
+        stats['unique_size_mb'] = round(stats['unique_size_mb'] - duplicate_mb, 2)
+    scanner.stats.update(stats)
+    return scanner
+
+
+def scan_sharded(roots: Iterable[Union[str, os.PathLike]], shards: Optional[int] = None,
+                 processes: Optional[int] = None, output_dir: Optional[str] = None,
+                 **scan_options) -> FolderScanner:
+    """
+    Scanne une ou plusieurs racines en shards parallèles, puis fusionne les résultats
+
+    Args:
+        roots: Dossiers à scanner
+        shards: Nombre de shards (par défaut : nombre de processus)
+        processes: Nombre de processus (par défaut : nombre de CPU)
+        output_dir: Dossier des descriptions et snapshots de shards (conservés) ;
+                    temporaire si None
+        **scan_options: Options de scan() (exclude_folders, ignore, sniff_content...)
+
+    Returns:
+        FolderScanner fusionné (racine commune, fichiers en FileTable)
+    """
+    processes = processes or os.cpu_count() or 1
+    plan = plan_shards(roots, shards or processes, **scan_options)
+    print(f"🧩 {len(plan)} shards : " + ", ".join(f"~{s.estimated_entries}" for s in plan)
+          + " entrées estimées")
+
+    with tempfile.TemporaryDirectory(prefix='analyst_shards_') as tmpdir:
+        directory = output_dir or tmpdir
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for shard in plan:
+            shard.save(os.path.join(directory, f"shard_{shard.index:03d}.json"))
+            paths.append(os.path.join(directory, f"shard_{shard.index:03d}.snap"))
+
+        run = partial(run_shard, **scan_options)
+        if processes > 1 and len(plan) > 1:
+            with ProcessPoolExecutor(min(processes, len(plan))) as pool:
+                counts = list(pool.map(run, plan, paths))
+        else:
+            counts = [run(shard, path) for shard, path in zip(plan, paths)]
+
+        merged = merge_shards(paths)
+
+    print(f"🧩 Fusion : {len(merged.files)} fichiers ("
+          + ", ".join(str(count) for count in counts) + " par shard)")
+    return merged
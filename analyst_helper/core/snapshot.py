@@ -0,0 +1,232 @@
+"""
+Module de snapshot binaire des résultats de scan
+Format en colonnes à largeur fixe + table de chaînes internées, chargé par mmap
+"""
+
+import os
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .scanner import FileRecord
+from .table import FileTable, StringDictionary
+
+MAGIC = b'AHSNAP\x00\x01'
+VERSION = 1
+# En-tête : signature, position et longueur des métadonnées JSON (en fin de fichier)
+HEADER = struct.Struct('<8sQQ')
+ALIGNMENT = 8
+
+
+class StringPool:
+    """Table de chaînes internées, décodées à la demande depuis le fichier mappé"""
+
+    __slots__ = ('offsets', 'blob')
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        """
+        Initialise la table
+
+        Args:
+            offsets: Positions de début de chaque chaîne (n + 1 valeurs)
+            blob: Chaînes concaténées (UTF-8)
+        """
+        self.offsets = offsets
+        self.blob = blob
+
+    def __getitem__(self, index: int) -> str:
+        return str(self.blob[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class PooledColumn:
+    """Colonne de chaînes stockée sous forme d'identifiants dans une StringPool"""
+
+    __slots__ = ('pool', 'ids')
+
+    def __init__(self, pool: StringPool, ids: memoryview):
+        self.pool = pool
+        self.ids = ids
+
+    def __getitem__(self, index: int) -> str:
+        return self.pool[self.ids[index]]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class SparseColumn:
+    """Valeurs creuses : lignes triées + identifiants de chaînes, modifications en mémoire
+
+    Le fichier mappé n'est jamais modifié : les valeurs écrites ensuite
+    (empreintes de find_duplicates, type détecté par le contenu...) sont
+    gardées dans un dictionnaire consulté en premier (None = valeur effacée).
+    """
+
+    __slots__ = ('pool', 'rows', 'ids', 'overlay')
+
+    def __init__(self, pool: StringPool, rows: memoryview, ids: memoryview):
+        self.pool = pool
+        self.rows = rows
+        self.ids = ids
+        self.overlay: Dict[int, Optional[str]] = {}
+
+    def _stored(self, index: int) -> Optional[str]:
+        """Valeur enregistrée dans le snapshot"""
+        position = bisect_left(self.rows, index)
+        if position < len(self.rows) and self.rows[position] == index:
+            return self.pool[self.ids[position]]
+        return None
+
+    def get(self, index: int, default=None):
+        value = self.overlay[index] if index in self.overlay else self._stored(index)
+        return default if value is None else value
+
+    def __setitem__(self, index: int, value):
+        self.overlay[index] = value
+
+    def pop(self, index: int, default=None):
+        value = self.get(index, default)
+        self.overlay[index] = None
+        return value
+
+    def __len__(self) -> int:
+        count = len(self.rows)
+        for index, value in self.overlay.items():
+            count += (value is not None) - (self._stored(index) is not None)
+        return count
+
+
+def save_snapshot(files: Union[FileTable, Iterable[FileRecord]], output_path: str,
+                  root_path: str, stats: Optional[Dict] = None,
+                  links: Optional[List] = None) -> int:
+    """
+    Enregistre un snapshot binaire (écriture atomique)
+
+    Args:
+        files: FileTable, ou fichiers à convertir en table
+        output_path: Chemin du snapshot
+        root_path: Dossier racine du scan
+        stats: Statistiques du scan
+        links: Fichiers à liens multiples comptés dans unique_size_mb,
+               en listes [st_dev, st_ino, chemin, taille]
+
+    Returns:
+        Nombre de fichiers enregistrés
+    """
+    table = files
+    if not isinstance(table, FileTable) or not isinstance(table.dirs, StringDictionary):
+        table = FileTable.from_files(files, root_path)
+    pool = StringDictionary()
+
+    def remap(ids, dictionary) -> array:
+        mapping = [pool.encode(value) for value in dictionary.values]
+        return array('I', (mapping[code] for code in ids))
+
+    columns = {
+        'name_ids': array('I', (pool.encode(name) for name in table.names)),
+        'dir_ids': remap(table.dir_ids, table.dirs),
+        'ext_ids': remap(table.ext_ids, table.extensions),
+        'type_ids': remap(table.type_ids, table.file_types),
+        'sizes': table.sizes,
+        'ctimes': table.ctimes,
+        'mtimes': table.mtimes,
+        'depths': table.depths,
+        'email_flags': array('B', table.email_flags),
+    }
+    for field, values in table.sparse.items():
+        rows = sorted(values)
+        columns[f'sparse_{field}_rows'] = array('I', rows)
+        columns[f'sparse_{field}_ids'] = array('I', (pool.encode(values[row]) for row in rows))
+
+    encoded = [value.encode('utf-8') for value in pool.values]
+    offsets = array('Q', [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    columns['pool_offsets'] = offsets
+    columns['pool_blob'] = array('B', b''.join(encoded))
+
+    tmp_path = f"{output_path}.tmp"
+    layout = {}
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+        for name, column in columns.items():
+            f.write(b'\0' * (-f.tell() % ALIGNMENT))
+            layout[name] = [f.tell(), column.typecode, len(column)]
+            f.write(column.tobytes())
+
+        meta = json.dumps({
+            'version': VERSION,
+            'root_path': str(root_path),
+            'rows': len(table),
+            'snapshot_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'stats': stats or {},
+            'links': links or [],
+            'columns': layout,
+        }, ensure_ascii=False).encode('utf-8')
+        meta_offset = f.tell()
+        f.write(meta)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, meta_offset, len(meta)))
+
+    os.replace(tmp_path, output_path)
+    return len(table)
+
+
+def load_snapshot(path: str) -> Tuple[FileTable, Dict]:
+    """
+    Ouvre un snapshot par mmap, sans décoder les lignes
+
+    Les colonnes numériques sont des vues sur le fichier mappé ; les chaînes
+    ne sont décodées qu'à l'accès à une ligne. Le fichier n'est pas modifié :
+    les champs creux renseignés ensuite (empreintes...) restent en mémoire.
+
+    Args:
+        path: Chemin du snapshot
+
+    Returns:
+        Tuple (FileTable, métadonnées : root_path, stats, snapshot_date...)
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, meta_offset, meta_length = HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        mapped.close()
+        raise ValueError(f"Fichier snapshot invalide: {path}")
+
+    meta = json.loads(str(mapped[meta_offset:meta_offset + meta_length], 'utf-8'))
+    if meta['version'] != VERSION:
+        mapped.close()
+        raise ValueError(f"Version de snapshot non supportée: {meta['version']}")
+
+    view = memoryview(mapped)
+    columns = {}
+    for name, (offset, typecode, count) in meta['columns'].items():
+        size = array(typecode).itemsize * count
+        columns[name] = view[offset:offset + size].cast(typecode)
+
+    pool = StringPool(columns['pool_offsets'], columns['pool_blob'])
+    # Un champ creux absent (snapshot antérieur à son ajout) est simplement vide
+    sparse = {
+        field: SparseColumn(pool, columns.get(f'sparse_{field}_rows', array('I')),
+                            columns.get(f'sparse_{field}_ids', array('I')))
+        for field in FileTable.SPARSE_FIELDS
+    }
+
+    table = FileTable.from_columns(
+        meta['root_path'],
+        names=PooledColumn(pool, columns['name_ids']),
+        dirs=pool, extensions=pool, file_types=pool,
+        dir_ids=columns['dir_ids'], ext_ids=columns['ext_ids'], type_ids=columns['type_ids'],
+        sizes=columns['sizes'], ctimes=columns['ctimes'], mtimes=columns['mtimes'],
+        depths=columns['depths'], email_flags=columns['email_flags'],
+        sparse=sparse,
+    )
+    return table, meta
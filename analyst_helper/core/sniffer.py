@@ -0,0 +1,331 @@
+"""
+Module de détection du type réel des fichiers (signatures binaires)
+Lit uniquement l'en-tête des fichiers, par lots, dans un pool de threads
+"""
+
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Taille de la première lecture (octets)
+HEADER_SIZE = 512
+# Lecture bornée du premier secteur de répertoire OLE2 (noms des flux)
+OLE2_DIRECTORY_SIZE = 4096
+# Nombre maximal d'entrées ZIP examinées (en-têtes locaux successifs)
+ZIP_MAX_ENTRIES = 4
+
+OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+ZIP_MAGIC = b'PK\x03\x04'
+ZIP_HEADER = struct.Struct('<4sHHHHHIIIHH')
+
+# Formats génériques : toute extension de la famille est considérée cohérente
+OLE2 = 'ole2'
+OOXML = 'ooxml'
+FAMILIES = {
+    OLE2: ('.doc', {'.doc', '.dot', '.xls', '.xlt', '.ppt', '.pps', '.pot', '.msg',
+                    '.msi', '.vsd', '.pub'}),
+    OOXML: ('.docx', {'.docx', '.docm', '.dotx', '.xlsx', '.xlsm', '.xltx', '.pptx',
+                      '.pptm', '.potx', '.ppsx', '.vsdx'}),
+    '.zip': ('.zip', {'.zip', '.jar', '.apk', '.epub', '.kmz', '.whl', '.xpi', '.odg',
+                      '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp'}),
+}
+# Extensions équivalentes à un format détecté
+ALIASES = {
+    '.jpg': {'.jpg', '.jpeg', '.jpe'},
+    '.tiff': {'.tiff', '.tif'},
+    '.doc': {'.doc', '.dot'},
+    '.xls': {'.xls', '.xlt'},
+    '.ppt': {'.ppt', '.pps', '.pot'},
+    '.docx': {'.docx', '.docm', '.dotx'},
+    '.xlsx': {'.xlsx', '.xlsm', '.xltx'},
+    '.pptx': {'.pptx', '.pptm', '.potx', '.ppsx'},
+}
+
+# Noms de flux OLE2 caractéristiques (préfixe, format)
+OLE2_STREAMS = (
+    ('__substg1.0_', '.msg'),
+    ('__properties_version1.0', '.msg'),
+    ('__nameid_version1.0', '.msg'),
+    ('WordDocument', '.doc'),
+    ('Workbook', '.xls'),
+    ('Book', '.xls'),
+    ('PowerPoint Document', '.ppt'),
+)
+# Premier dossier des entrées OOXML / type MIME OpenDocument
+OOXML_PARTS = ((b'word/', '.docx'), (b'xl/', '.xlsx'), (b'ppt/', '.pptx'))
+ODF_MIMETYPES = (
+    (b'application/vnd.oasis.opendocument.text', '.odt'),
+    (b'application/vnd.oasis.opendocument.spreadsheet', '.ods'),
+    (b'application/vnd.oasis.opendocument.presentation', '.odp'),
+)
+
+
+def _sniff_image(header: bytes) -> Optional[str]:
+    """Reconnaît les signatures d'images courantes"""
+    if header.startswith(b'\xff\xd8\xff'):
+        return '.jpg'
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return '.png'
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        return '.gif'
+    if header.startswith((b'II*\x00', b'MM\x00*')):
+        return '.tiff'
+    if header.startswith(b'BM') and len(header) >= 14 and header[6:10] == b'\x00\x00\x00\x00':
+        return '.bmp'
+    return None
+
+
+def _sniff_ole2(f, header: bytes) -> str:
+    """
+    Précise le type d'un conteneur OLE2 d'après les noms de ses flux
+
+    Args:
+        f: Fichier ouvert en binaire
+        header: En-tête déjà lu
+
+    Returns:
+        '.msg', '.doc', '.xls', '.ppt' ou OLE2 si indéterminé
+    """
+    if len(header) < 52:
+        return OLE2
+    sector_shift, = struct.unpack_from('<H', header, 30)
+    first_directory, = struct.unpack_from('<I', header, 48)
+    if not 7 <= sector_shift <= 12:
+        return OLE2
+
+    f.seek((first_directory + 1) << sector_shift)
+    directory = f.read(OLE2_DIRECTORY_SIZE)
+    for offset in range(0, len(directory) - 127, 128):
+        length, = struct.unpack_from('<H', directory, offset + 64)
+        if not 2 <= length <= 64:
+            continue
+        name = directory[offset:offset + length - 2].decode('utf-16-le', 'replace')
+        for prefix, kind in OLE2_STREAMS:
+            if name.startswith(prefix):
+                return kind
+    return OLE2
+
+
+def _sniff_zip(f, header: bytes) -> str:
+    """
+    Distingue OOXML, OpenDocument et ZIP simple d'après les premières entrées
+
+    Seuls les en-têtes locaux sont lus, d'entrée en entrée, sans décompresser.
+
+    Args:
+        f: Fichier ouvert en binaire
+        header: En-tête déjà lu
+
+    Returns:
+        Extension détectée, OOXML ou '.zip'
+    """
+    ooxml = False
+    offset = 0
+    data = header
+
+    for _ in range(ZIP_MAX_ENTRIES):
+        if len(data) < ZIP_HEADER.size or not data.startswith(ZIP_MAGIC):
+            break
+        fields = ZIP_HEADER.unpack_from(data)
+        flags, compressed_size, name_length, extra_length = fields[2], fields[7], fields[9], fields[10]
+        start = ZIP_HEADER.size
+        name = data[start:start + name_length]
+
+        if name == b'mimetype':
+            content = data[start + name_length + extra_length:][:compressed_size]
+            for mimetype, kind in ODF_MIMETYPES:
+                if content.startswith(mimetype):
+                    return kind
+        if name == b'[Content_Types].xml' or name.startswith(b'_rels/'):
+            ooxml = True
+        for prefix, kind in OOXML_PARTS:
+            if name.startswith(prefix):
+                return kind
+
+        # Taille inconnue (descripteur de données) : impossible de sauter à l'entrée suivante
+        if flags & 0x08:
+            break
+        offset += start + name_length + extra_length + compressed_size
+        f.seek(offset)
+        data = f.read(ZIP_HEADER.size + 64)
+
+    return OOXML if ooxml else '.zip'
+
+
+def sniff_file(path: str) -> str:
+    """
+    Détecte le format d'un fichier d'après ses premiers octets
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        Extension canonique du format, format générique (OLE2, OOXML) ou '' si inconnu
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+
+        if header.startswith(OLE2_MAGIC):
+            return _sniff_ole2(f, header)
+        if header.startswith(ZIP_MAGIC):
+            return _sniff_zip(f, header)
+        if b'%PDF-' in header:
+            return '.pdf'
+        if header[:4] in (b'AC10', b'AC1.', b'AC2.'):
+            return '.dwg'
+        return _sniff_image(header) or ''
+
+
+def resolve_content_type(detected: str, extension: str) -> Optional[str]:
+    """
+    Choisit l'extension à utiliser pour classer un fichier
+
+    L'extension du fichier est conservée si elle est cohérente avec le contenu.
+
+    Args:
+        detected: Résultat de sniff_file()
+        extension: Extension du nom de fichier
+
+    Returns:
+        Extension à utiliser, ou None si le contenu n'est pas reconnu
+    """
+    if not detected:
+        return None
+    if extension == detected or extension in ALIASES.get(detected, ()):
+        return extension
+    family = FAMILIES.get(detected)
+    if family is not None:
+        default, extensions = family
+        return extension if extension in extensions else default
+    return detected
+
+
+class ContentSniffer:
+    """Détecteur de type par signatures binaires, avec cache par (inode, mtime)
+
+    Les lectures sont bornées (quelques centaines d'octets, plus une lecture
+    ciblée pour OLE2 et ZIP) et faites par lots dans un pool de threads. Un
+    fichier dont l'inode et la date de modification n'ont pas changé n'est
+    jamais relu.
+    """
+
+    def __init__(self, workers: int = 8):
+        """
+        Initialise le détecteur
+
+        Args:
+            workers: Nombre de threads de lecture
+        """
+        self.workers = max(1, workers)
+        self.cache: Dict[Tuple[int, int], str] = {}
+        self.stats = {'sniffed': 0, 'cache_hits': 0, 'errors': 0}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def sniff(self, items: Sequence[Tuple[str, Optional[Tuple[int, int]]]]) -> List[str]:
+        """
+        Détecte le format d'un lot de fichiers
+
+        Args:
+            items: Tuples (chemin, clé (inode, mtime_ns) ou None si inconnue)
+
+        Returns:
+            Formats détectés, dans l'ordre des fichiers ('' si inconnu ou illisible)
+        """
+        results = [''] * len(items)
+        pending = []
+
+        for i, (path, key) in enumerate(items):
+            cached = self.cache.get(key) if key is not None else None
+            if cached is not None:
+                results[i] = cached
+                self._count('cache_hits')
+            else:
+                pending.append(i)
+
+        if len(pending) > 1 and self.workers > 1:
+            detected = self._pool().map(lambda i: self._read(*items[i]), pending)
+        else:
+            detected = (self._read(*items[i]) for i in pending)
+
+        for i, value in zip(pending, detected):
+            results[i] = value
+        return results
+
+    def iter_sniffed(self, files: Iterable, batch_size: int = 256) -> Iterator:
+        """
+        Renseigne content_type pour des fichiers déjà scannés, par lots
+
+        Les fichiers dont content_type est déjà renseigné ne sont pas relus.
+
+        Args:
+            files: Fichiers (liste, FileTable ou flux)
+            batch_size: Nombre de fichiers lus par lot
+
+        Returns:
+            Itérateur des mêmes fichiers, dans le même ordre
+        """
+        batch = []
+        for file in files:
+            batch.append(file)
+            if len(batch) >= batch_size:
+                self._apply(batch)
+                yield from batch
+                batch = []
+        if batch:
+            self._apply(batch)
+            yield from batch
+
+    def close(self):
+        """Arrête le pool de threads"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _apply(self, files: List):
+        """Détecte et renseigne content_type pour un lot de fichiers"""
+        todo = [file for file in files
+                if file.content_type is None and file.size_bytes and file.archive_path is None]
+        detected = self.sniff([(file.path, None) for file in todo])
+        for file, value in zip(todo, detected):
+            file.content_type = resolve_content_type(value, file.extension)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='sniffer')
+            return self._executor
+
+    def _read(self, path: str, key: Optional[Tuple[int, int]]) -> str:
+        """
+        Lit l'en-tête d'un fichier et mémorise le résultat
+
+        Args:
+            path: Chemin du fichier
+            key: Clé (inode, mtime_ns), ou None pour la calculer
+
+        Returns:
+            Format détecté ('' si inconnu ou illisible)
+        """
+        try:
+            if key is None:
+                stat = os.stat(path)
+                key = (stat.st_ino, stat.st_mtime_ns)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self._count('cache_hits')
+                    return cached
+            detected = sniff_file(path)
+        except OSError:
+            self._count('errors')
+            return ''
+
+        self.cache[key] = detected
+        self._count('sniffed')
+        return detected
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
@@ -0,0 +1,284 @@
+"""
+Module de stockage en colonnes des résultats de scan
+Réduit fortement la mémoire occupée par de très grands scans
+"""
+
+import os
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .scanner import FileRecord
+
+
+class StringDictionary:
+    """Dictionnaire de chaînes : chaque valeur distincte n'est stockée qu'une fois"""
+
+    __slots__ = ('values', '_codes')
+
+    def __init__(self, values: Optional[List[str]] = None):
+        """
+        Initialise le dictionnaire
+
+        Args:
+            values: Valeurs initiales (l'index de chaque valeur est son code)
+        """
+        self.values: List[str] = list(values or [])
+        self._codes: Dict[str, int] = {value: i for i, value in enumerate(self.values)}
+
+    def encode(self, value: str) -> int:
+        """
+        Retourne le code d'une valeur, en l'ajoutant si nécessaire
+
+        Args:
+            value: Valeur à encoder
+
+        Returns:
+            Code entier
+        """
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._codes[value] = code
+        return code
+
+    def code(self, value: str) -> Optional[int]:
+        """
+        Retourne le code d'une valeur sans l'ajouter
+
+        Args:
+            value: Valeur recherchée
+
+        Returns:
+            Code entier ou None si la valeur est absente
+        """
+        return self._codes.get(value)
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class FileTable:
+    """Table en colonnes des fichiers scannés
+
+    Tailles, timestamps et profondeurs sont stockés dans des tableaux array ;
+    extensions, types et dossiers parents sont encodés par dictionnaire. Les
+    champs rarement renseignés (source email, empreintes) sont stockés de façon
+    creuse. Les lignes sont exposées sous forme de FileRow, des vues légères
+    compatibles avec FileInfo : la table peut être passée telle quelle au
+    reporter, au classificateur et aux exports.
+    """
+
+    # Champs optionnels, stockés uniquement pour les lignes qui les renseignent
+    SPARSE_FIELDS = ('email_source', 'quick_hash', 'content_hash', 'content_type', 'archive_path')
+
+    def __init__(self, root_path: Union[str, os.PathLike]):
+        """
+        Initialise une table vide
+
+        Args:
+            root_path: Dossier racine du scan (les chemins sont stockés relativement)
+        """
+        self.root_path = str(root_path)
+        self.root_name = os.path.basename(self.root_path)
+        self.names: List[str] = []
+        self.dirs = StringDictionary()
+        self.extensions = StringDictionary()
+        self.file_types = StringDictionary()
+        self.dir_ids = array('I')
+        self.ext_ids = array('I')
+        self.type_ids = array('H')
+        self.sizes = array('q')
+        self.ctimes = array('d')
+        self.mtimes = array('d')
+        self.depths = array('H')
+        self.email_flags = bytearray()
+        self.sparse: Dict[str, Dict[int, Any]] = {name: {} for name in self.SPARSE_FIELDS}
+
+    @classmethod
+    def from_columns(cls, root_path: Union[str, os.PathLike], **columns) -> 'FileTable':
+        """
+        Construit une table à partir de colonnes existantes (ex: snapshot mappé en mémoire)
+
+        Args:
+            root_path: Dossier racine du scan
+            **columns: Attributs de colonnes à remplacer (names, sizes, dirs, sparse...)
+
+        Returns:
+            FileTable
+        """
+        table = cls(root_path)
+        for name, column in columns.items():
+            if not hasattr(table, name):
+                raise ValueError(f"Colonne inconnue: {name}")
+            setattr(table, name, column)
+        return table
+
+    @classmethod
+    def from_files(cls, files: Iterable[FileRecord],
+                   root_path: Union[str, os.PathLike]) -> 'FileTable':
+        """
+        Construit une table à partir de fichiers (liste ou flux)
+
+        Args:
+            files: Fichiers à stocker
+            root_path: Dossier racine du scan
+
+        Returns:
+            FileTable
+        """
+        table = cls(root_path)
+        table.extend(files)
+        return table
+
+    def append(self, file: FileRecord):
+        """
+        Ajoute un fichier
+
+        Args:
+            file: Fichier à ajouter (FileInfo ou FileRow)
+        """
+        index = len(self.names)
+        self.names.append(file.name)
+        self.dir_ids.append(self.dirs.encode(os.path.dirname(file.relative_path)))
+        self.ext_ids.append(self.extensions.encode(file.extension))
+        self.type_ids.append(self.file_types.encode(file.file_type))
+        self.sizes.append(file.size_bytes)
+        self.ctimes.append(file.created_ts)
+        self.mtimes.append(file.modified_ts)
+        self.depths.append(file.depth)
+        self.email_flags.append(1 if file.is_email else 0)
+
+        for name in self.SPARSE_FIELDS:
+            value = getattr(file, name)
+            if value is not None:
+                self.sparse[name][index] = value
+
+    def extend(self, files: Iterable[FileRecord]):
+        """
+        Ajoute plusieurs fichiers
+
+        Args:
+            files: Fichiers à ajouter
+        """
+        for file in files:
+            self.append(file)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [FileRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("index de ligne hors limites")
+        return FileRow(self, index)
+
+    def __iter__(self) -> Iterator['FileRow']:
+        for index in range(len(self.names)):
+            yield FileRow(self, index)
+
+    def __bool__(self) -> bool:
+        return bool(self.names)
+
+    def total_bytes(self) -> int:
+        """Taille totale des fichiers (octets), sans parcourir les lignes"""
+        return sum(self.sizes)
+
+    def count_by(self, column: str) -> Dict[str, int]:
+        """
+        Compte les fichiers par valeur d'une colonne encodée
+
+        Args:
+            column: 'extension', 'file_type' ou 'dir'
+
+        Returns:
+            Dictionnaire {valeur: nombre de fichiers}
+        """
+        ids, dictionary = {
+            'extension': (self.ext_ids, self.extensions),
+            'file_type': (self.type_ids, self.file_types),
+            'dir': (self.dir_ids, self.dirs),
+        }[column]
+
+        return {dictionary[code]: count for code, count in sorted(Counter(ids).items())}
+
+
+class FileRow(FileRecord):
+    """Vue légère sur une ligne d'une FileTable, compatible avec FileInfo"""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: FileTable, index: int):
+        object.__setattr__(self, '_table', table)
+        object.__setattr__(self, '_index', index)
+
+    @property
+    def name(self) -> str:
+        return self._table.names[self._index]
+
+    @property
+    def relative_path(self) -> str:
+        table = self._table
+        return os.path.join(table.dirs[table.dir_ids[self._index]], table.names[self._index])
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self._table.root_path, self.relative_path)
+
+    @property
+    def parent_folder(self) -> str:
+        table = self._table
+        directory = table.dirs[table.dir_ids[self._index]]
+        return os.path.basename(directory) if directory else table.root_name
+
+    @property
+    def extension(self) -> str:
+        return self._table.extensions[self._table.ext_ids[self._index]]
+
+    @property
+    def file_type(self) -> str:
+        return self._table.file_types[self._table.type_ids[self._index]]
+
+    @property
+    def size_bytes(self) -> int:
+        return self._table.sizes[self._index]
+
+    @property
+    def created_ts(self) -> float:
+        return self._table.ctimes[self._index]
+
+    @property
+    def modified_ts(self) -> float:
+        return self._table.mtimes[self._index]
+
+    @property
+    def depth(self) -> int:
+        return self._table.depths[self._index]
+
+    @property
+    def is_email(self) -> bool:
+        return bool(self._table.email_flags[self._index])
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        sparse = self._table.sparse.get(name)
+        if sparse is None:
+            raise AttributeError(name)
+        return sparse.get(self._index)
+
+    def __setattr__(self, name: str, value):
+        sparse = self._table.sparse.get(name)
+        if sparse is None:
+            raise AttributeError(f"champ en lecture seule: {name}")
+        if value is None:
+            sparse.pop(self._index, None)
+        else:
+            sparse[self._index] = value
@@ -0,0 +1,271 @@
+"""
+Module de transfert de fichiers
+Copie le contenu par le noyau quand c'est possible (clone, copy_file_range, sendfile)
+"""
+
+import errno
+import os
+import shutil
+import sys
+from typing import Dict, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:             # Windows
+    fcntl = None
+
+# ioctl FICLONE (Linux) : le fichier destination partage les blocs de la source (Btrfs, XFS...)
+FICLONE = 0x40049409
+
+# Méthodes, de la plus économe à la plus générale
+METHODS = ('reflink', 'copy_file_range', 'sendfile', 'buffer')
+
+# Modes de classement : copie, lien physique, lien symbolique, déplacement
+MODES = ('copy', 'hardlink', 'symlink', 'move')
+
+# Taille des blocs des transferts noyau et du tampon de la copie en espace utilisateur
+CHUNK_SIZE = 64 * 1024 * 1024
+BUFFER_SIZE = 8 * 1024 * 1024
+
+# Erreurs signifiant « méthode non prise en charge ici » (et non une erreur d'E/S)
+UNSUPPORTED_ERRNOS = frozenset(
+    code for code in (getattr(errno, name, None) for name in
+                      ('EXDEV', 'ENOTSUP', 'EOPNOTSUPP', 'EINVAL', 'ENOSYS', 'ENOTTY',
+                       'EBADF', 'EPERM', 'ETXTBSY'))
+    if code is not None
+)
+
+# Lien physique impossible (autre système de fichiers, non pris en charge, trop de liens) : copie
+LINK_FALLBACK_ERRNOS = frozenset(
+    code for code in (getattr(errno, name, None) for name in
+                      ('EXDEV', 'EPERM', 'EMLINK', 'ENOTSUP', 'EOPNOTSUPP'))
+    if code is not None
+)
+
+
+def partial_path(destination: str) -> str:
+    """
+    Fichier temporaire d'une écriture atomique (même dossier que la destination)
+
+    Args:
+        destination: Chemin de destination
+
+    Returns:
+        Chemin du fichier temporaire ('.nom.partial')
+    """
+    folder, name = os.path.split(destination)
+    return os.path.join(folder, f".{name}.partial")
+
+
+def available_methods() -> Tuple[str, ...]:
+    """
+    Méthodes utilisables sur ce système
+
+    Returns:
+        Méthodes disponibles, dans l'ordre de préférence
+    """
+    linux = sys.platform.startswith('linux')
+    methods = []
+    if linux and fcntl is not None:
+        methods.append('reflink')
+    if hasattr(os, 'copy_file_range'):
+        methods.append('copy_file_range')
+    # Ailleurs que sous Linux, sendfile n'écrit que vers une socket
+    if linux and hasattr(os, 'sendfile'):
+        methods.append('sendfile')
+    methods.append('buffer')
+    return tuple(methods)
+
+
+class FileTransfer:
+    """Copie de fichiers (contenu et métadonnées, comme shutil.copy2)
+
+    Les méthodes sont essayées dans l'ordre : clone (FICLONE), puis
+    os.copy_file_range, os.sendfile et enfin une copie avec un grand tampon.
+    La première qui réussit pour un couple (système de fichiers source,
+    système de fichiers destination) est mémorisée et utilisée directement
+    pour les copies suivantes entre ces deux systèmes ; si elle échoue
+    ensuite, les méthodes suivantes prennent le relais et remplacent le choix.
+    Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, methods: Optional[Sequence[str]] = None, buffer_size: int = BUFFER_SIZE):
+        """
+        Initialise le transfert
+
+        Args:
+            methods: Méthodes autorisées, dans l'ordre (par défaut : toutes celles disponibles)
+            buffer_size: Taille du tampon de la copie en espace utilisateur
+        """
+        unknown = set(methods or ()) - set(METHODS)
+        if unknown:
+            raise ValueError(f"Méthode de copie inconnue: {', '.join(sorted(unknown))}")
+        available = available_methods()
+        self.methods = tuple(m for m in (methods or available) if m in available) or ('buffer',)
+        self.buffer_size = buffer_size
+        # Méthode retenue par couple (st_dev source, st_dev destination)
+        self._chosen: Dict[Tuple[int, int], str] = {}
+
+    def copy(self, source: str, destination: str) -> str:
+        """
+        Copie un fichier (écrase la destination si elle existe)
+
+        Args:
+            source: Fichier source
+            destination: Chemin de destination
+
+        Returns:
+            Méthode utilisée
+        """
+        with open(source, 'rb', buffering=0) as src, open(destination, 'wb', buffering=0) as dst:
+            src_fd, dst_fd = src.fileno(), dst.fileno()
+            src_stat = os.fstat(src_fd)
+            size = src_stat.st_size
+            key = (src_stat.st_dev, os.fstat(dst_fd).st_dev)
+
+            chosen = self._chosen.get(key)
+            candidates = self.methods if chosen is None else \
+                self.methods[self.methods.index(chosen):]
+            for method in candidates:
+                try:
+                    getattr(self, f'_copy_{method}')(src, dst, size)
+                except OSError as e:
+                    if e.errno not in UNSUPPORTED_ERRNOS:
+                        raise
+                    # Méthode refusée : on repart de zéro avec la suivante
+                    refused = e
+                    os.lseek(src_fd, 0, os.SEEK_SET)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+                    os.ftruncate(dst_fd, 0)
+                    continue
+                if method != chosen:
+                    self._chosen[key] = method
+                break
+            else:
+                raise refused
+
+        shutil.copystat(source, destination)
+        return method
+
+    def transfer(self, source: str, destination: str, mode: str = 'copy',
+                 atomic: bool = False) -> str:
+        """
+        Place un fichier à destination selon un mode de classement
+
+        'hardlink' se replie sur une copie si le lien est impossible (autre
+        système de fichiers...) ; 'move' est un rename() atomique sur un même
+        système de fichiers, sinon une copie suivie de la suppression de la source.
+
+        Args:
+            source: Fichier source
+            destination: Chemin de destination (inexistant, sauf en mode atomique)
+            mode: 'copy', 'hardlink', 'symlink' ou 'move'
+            atomic: Écrire dans un fichier temporaire (voir partial_path) puis le
+                    renommer : la destination est complète ou absente, jamais
+                    tronquée ; une destination existante est remplacée
+
+        Returns:
+            Méthode utilisée : 'hardlink', 'symlink', 'rename' ou méthode de copie
+        """
+        if mode not in MODES:
+            raise ValueError(f"Mode de classement inconnu: {mode} (attendu : {', '.join(MODES)})")
+
+        if mode == 'move':
+            try:
+                (os.replace if atomic else os.rename)(source, destination)
+                return 'rename'
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+            method = self._write(source, destination, 'copy', atomic)
+            os.remove(source)
+            return method
+
+        return self._write(source, destination, mode, atomic)
+
+    def _write(self, source: str, destination: str, mode: str, atomic: bool) -> str:
+        """Copie ou lie un fichier, via un fichier temporaire renommé en mode atomique"""
+        if not atomic:
+            return self._place(source, destination, mode)
+
+        temporary = partial_path(destination)
+        try:
+            if os.path.lexists(temporary):
+                os.remove(temporary)
+            method = self._place(source, temporary, mode)
+            os.replace(temporary, destination)
+        except BaseException:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            raise
+        return method
+
+    def _place(self, source: str, destination: str, mode: str) -> str:
+        """Copie, lien physique ou lien symbolique vers un chemin libre"""
+        if mode == 'symlink':
+            os.symlink(os.path.abspath(source), destination)
+            return 'symlink'
+
+        if mode == 'hardlink':
+            try:
+                os.link(source, destination)
+                return 'hardlink'
+            except OSError as e:
+                if e.errno not in LINK_FALLBACK_ERRNOS:
+                    raise
+
+        return self.copy(source, destination)
+
+    def method_for(self, source: str, destination_dir: str) -> Optional[str]:
+        """
+        Méthode déjà retenue entre deux emplacements
+
+        Args:
+            source: Fichier source
+            destination_dir: Dossier de destination
+
+        Returns:
+            Méthode mémorisée, ou None si aucune copie n'a encore eu lieu entre ces systèmes
+        """
+        return self._chosen.get((os.stat(source).st_dev, os.stat(destination_dir).st_dev))
+
+    @staticmethod
+    def _copy_reflink(src, dst, size: int):
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+    @staticmethod
+    def _copy_copy_file_range(src, dst, size: int):
+        copied = 0
+        while True:
+            sent = os.copy_file_range(src.fileno(), dst.fileno(), CHUNK_SIZE)
+            if sent == 0:
+                break
+            copied += sent
+        if copied < size:
+            # Certains systèmes (procfs, FUSE...) répondent 0 sans rien copier
+            raise OSError(errno.EINVAL, "copy_file_range incomplet")
+
+    @staticmethod
+    def _copy_sendfile(src, dst, size: int):
+        offset = 0
+        while True:
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset, CHUNK_SIZE)
+            if sent == 0:
+                break
+            offset += sent
+        if offset < size:
+            raise OSError(errno.EINVAL, "sendfile incomplet")
+
+    def _copy_buffer(self, src, dst, size: int):
+        # Petit fichier : tampon à sa taille (un tampon de plusieurs Mo coûte à allouer)
+        buffer = bytearray(max(min(self.buffer_size, size), 64 * 1024))
+        view = memoryview(buffer)
+        while True:
+            read = src.readinto(buffer)
+            if not read:
+                break
+            written = 0
+            while written < read:
+                written += dst.write(view[written:read])
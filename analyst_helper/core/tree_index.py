@@ -0,0 +1,243 @@
+"""
+Module d'index des dossiers
+Agrège fichiers et octets par dossier pendant le scan, avec totaux récursifs
+"""
+
+import os
+import heapq
+from typing import Dict, Iterable, List, Optional
+
+
+class DirectoryNode:
+    """Nœud de dossier : totaux propres et totaux du sous-arbre"""
+
+    __slots__ = ('name', 'rel_path', 'parent', 'depth', 'children', 'file_names',
+                 'file_count', 'total_bytes', 'recursive_files', 'recursive_bytes')
+
+    def __init__(self, name: str, rel_path: str, parent: Optional['DirectoryNode'], depth: int):
+        self.name = name
+        self.rel_path = rel_path
+        self.parent = parent
+        self.depth = depth
+        self.children: Dict[str, 'DirectoryNode'] = {}
+        self.file_names: List[str] = []
+        self.file_count = 0
+        self.total_bytes = 0
+        self.recursive_files = 0
+        self.recursive_bytes = 0
+
+    @property
+    def recursive_mb(self) -> float:
+        return round(self.recursive_bytes / (1024 * 1024), 2)
+
+    def __repr__(self) -> str:
+        return (f"DirectoryNode({self.rel_path or '.'!r}, files={self.recursive_files}, "
+                f"bytes={self.recursive_bytes})")
+
+
+class DirectoryIndex:
+    """Index des dossiers d'un scan
+
+    Chaque ajout de fichier met à jour son dossier et tous ses ancêtres : les
+    totaux d'un sous-arbre sont ensuite lus directement sur le nœud, sans
+    reparcourir les fichiers.
+    """
+
+    def __init__(self, root_name: str = '', keep_names: bool = True):
+        """
+        Initialise un index vide
+
+        Args:
+            root_name: Nom du dossier racine
+            keep_names: Conserver les noms de fichiers (nécessaire pour l'affichage
+                        de l'arborescence, coûte une référence par fichier)
+        """
+        self.keep_names = keep_names
+        self.root = DirectoryNode(root_name, '', None, 0)
+        self.nodes: Dict[str, DirectoryNode] = {'': self.root}
+
+    @classmethod
+    def from_files(cls, files: Iterable, root_name: str = '') -> 'DirectoryIndex':
+        """
+        Construit l'index à partir de fichiers déjà scannés (une seule passe)
+
+        Args:
+            files: Fichiers scannés (FileInfo, FileRow...) ; les membres d'archives sont ignorés
+            root_name: Nom du dossier racine
+
+        Returns:
+            DirectoryIndex
+        """
+        index = cls(root_name)
+        for file in files:
+            if file.archive_path is not None:
+                continue
+            index.add_file(os.path.dirname(file.relative_path), file.name, file.size_bytes)
+        return index
+
+    @property
+    def total_files(self) -> int:
+        return self.root.recursive_files
+
+    def add_directory(self, rel_path: str) -> DirectoryNode:
+        """
+        Enregistre un dossier (et ses parents manquants)
+
+        Args:
+            rel_path: Chemin relatif du dossier ('' pour la racine)
+
+        Returns:
+            Nœud du dossier
+        """
+        node = self.nodes.get(rel_path)
+        if node is not None:
+            return node
+
+        parent = self.add_directory(os.path.dirname(rel_path))
+        name = os.path.basename(rel_path)
+        node = DirectoryNode(name, rel_path, parent, parent.depth + 1)
+        parent.children[name] = node
+        self.nodes[rel_path] = node
+        return node
+
+    def add_file(self, rel_dir: str, name: str, size: int):
+        """
+        Comptabilise un fichier dans son dossier et ses ancêtres
+
+        Args:
+            rel_dir: Chemin relatif du dossier du fichier
+            name: Nom du fichier
+            size: Taille en octets
+        """
+        node = self.nodes.get(rel_dir) or self.add_directory(rel_dir)
+        node.file_count += 1
+        node.total_bytes += size
+        if self.keep_names:
+            node.file_names.append(name)
+
+        while node is not None:
+            node.recursive_files += 1
+            node.recursive_bytes += size
+            node = node.parent
+
+    def remove_file(self, rel_dir: str, name: str, size: int):
+        """
+        Retire un fichier de son dossier et de ses ancêtres
+
+        Args:
+            rel_dir: Chemin relatif du dossier du fichier
+            name: Nom du fichier
+            size: Taille en octets comptabilisée à l'ajout
+        """
+        node = self.nodes.get(rel_dir)
+        if node is None:
+            return
+        node.file_count -= 1
+        node.total_bytes -= size
+        if self.keep_names and name in node.file_names:
+            node.file_names.remove(name)
+
+        while node is not None:
+            node.recursive_files -= 1
+            node.recursive_bytes -= size
+            node = node.parent
+
+    def remove_directory(self, rel_path: str) -> int:
+        """
+        Retire un dossier et tout son sous-arbre (fichiers compris)
+
+        Args:
+            rel_path: Chemin relatif du dossier (pas la racine)
+
+        Returns:
+            Nombre de dossiers retirés
+        """
+        node = self.nodes.get(rel_path)
+        if node is None or node.parent is None:
+            return 0
+
+        del node.parent.children[node.name]
+        ancestor = node.parent
+        while ancestor is not None:
+            ancestor.recursive_files -= node.recursive_files
+            ancestor.recursive_bytes -= node.recursive_bytes
+            ancestor = ancestor.parent
+
+        removed = 0
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            del self.nodes[current.rel_path]
+            removed += 1
+            stack.extend(current.children.values())
+        return removed
+
+    def node(self, rel_path: str = '') -> Optional[DirectoryNode]:
+        """
+        Retourne le nœud d'un dossier
+
+        Args:
+            rel_path: Chemin relatif du dossier ('' pour la racine)
+
+        Returns:
+            DirectoryNode ou None si inconnu
+        """
+        return self.nodes.get(os.path.normpath(rel_path) if rel_path not in ('', '.') else '')
+
+    def children(self, rel_path: str = '') -> List[DirectoryNode]:
+        """
+        Sous-dossiers directs d'un dossier, du plus lourd au plus léger
+
+        Args:
+            rel_path: Chemin relatif du dossier
+
+        Returns:
+            Liste de nœuds
+        """
+        node = self.node(rel_path)
+        if node is None:
+            return []
+        return sorted(node.children.values(), key=lambda n: n.recursive_bytes, reverse=True)
+
+    def top_folders(self, n: int = 10, by: str = 'bytes', recursive: bool = True) -> List[DirectoryNode]:
+        """
+        Dossiers les plus lourds
+
+        Args:
+            n: Nombre de dossiers
+            by: 'bytes' ou 'files'
+            recursive: Totaux du sous-arbre (True) ou du dossier seul (False)
+
+        Returns:
+            Liste de nœuds, du plus lourd au plus léger
+        """
+        attribute = {
+            ('bytes', True): 'recursive_bytes', ('bytes', False): 'total_bytes',
+            ('files', True): 'recursive_files', ('files', False): 'file_count',
+        }[(by, recursive)]
+        return heapq.nlargest(n, self.nodes.values(), key=lambda node: getattr(node, attribute))
+
+    def to_nested_dict(self, max_depth: int) -> Dict:
+        """
+        Arborescence imbriquée {dossier: {...}, '_files': [...]} limitée en profondeur
+
+        Seuls les dossiers contenant des fichiers jusqu'à max_depth sont inclus.
+
+        Args:
+            max_depth: Profondeur maximale des fichiers affichés
+
+        Returns:
+            Dictionnaire imbriqué (format de FolderScanner._format_tree)
+        """
+        def _build(node: DirectoryNode) -> Dict:
+            tree = {}
+            for name, child in node.children.items():
+                if child.depth <= max_depth and child.recursive_files:
+                    subtree = _build(child)
+                    if subtree:
+                        tree[name] = subtree
+            if node.file_names:
+                tree['_files'] = list(node.file_names)
+            return tree
+
+        return _build(self.root)
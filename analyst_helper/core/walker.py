@@ -0,0 +1,241 @@
+"""
+Module de parcours parallèle d'arborescence
+Répartit les sous-dossiers sur un pool de threads avec vol de tâches
+"""
+
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+
+class ParallelWalker:
+    """Parcours parallèle d'arborescence par vol de tâches (work stealing)"""
+
+    # Attente maximale d'un worker inactif avant de retenter un vol (secondes)
+    IDLE_WAIT = 0.05
+
+    # Dossiers lus et pas encore consommés au-delà desquels les threads attendent
+    MAX_BUFFERED = 256
+
+    def __init__(self, read_directory: Callable[[Path, int], List[Any]], workers: int = 4,
+                 descend: Optional[Callable[[Path], bool]] = None,
+                 enter: Optional[Callable[[Path], bool]] = None,
+                 max_buffered: int = MAX_BUFFERED):
+        """
+        Initialise le parcours parallèle
+
+        Args:
+            read_directory: Fonction (dossier, profondeur) -> liste d'entrées,
+                            les sous-dossiers étant représentés par des Path
+            workers: Nombre de threads de lecture
+            descend: Appelée par les threads : un sous-dossier peut-il être lu en avance ?
+            enter: Appelée dans l'ordre du parcours : le sous-dossier est-il restitué
+                   et parcouru ? (doit être fausse quand descend l'a été ; un
+                   sous-dossier lu en avance puis refusé est abandonné)
+            max_buffered: Nombre maximal de listings en attente du consommateur
+                          (au-delà, seul le dossier attendu est encore lu)
+        """
+        self.read_directory = read_directory
+        self.workers = max(1, workers)
+        self.descend = descend
+        self.enter = enter
+        self.max_buffered = max(1, max_buffered)
+        self._deques: List[deque] = []
+        self._results: Dict[str, List[Any]] = {}
+        # Sous-dossiers confiés aux threads et pas encore consommés
+        self._scheduled: Set[str] = set()
+        # Dossier dont le consommateur attend le résultat
+        self._waiting: Optional[str] = None
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._stop = False
+
+    def walk(self, root: Path) -> Iterator[Tuple[bool, Any]]:
+        """
+        Parcourt l'arborescence et restitue les entrées dans l'ordre du parcours séquentiel
+
+        Les dossiers sont lus en parallèle, mais les résultats sont réassemblés
+        en profondeur d'abord, dans l'ordre de os.scandir : la sortie est identique
+        à celle d'un parcours récursif mono-thread. Les threads n'ont jamais plus
+        de max_buffered listings d'avance (plus un par thread en cours de lecture) :
+        la mémoire reste bornée quel que soit le rythme du consommateur.
+
+        Args:
+            root: Dossier racine
+
+        Returns:
+            Itérateur de tuples (est_un_dossier, entrée)
+        """
+        self._deques = [deque() for _ in range(self.workers)]
+        self._results = {}
+        self._scheduled = set()
+        self._waiting = None
+        self._pending = 1
+        self._stop = False
+        self._deques[0].append((root, 0))
+
+        threads = [
+            threading.Thread(target=self._worker, args=(i,), daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            stack = [iter(self._wait_result(root))]
+            while stack:
+                item = next(stack[-1], None)
+                if item is None:
+                    stack.pop()
+                elif isinstance(item, Path):
+                    entered = self.enter is None or self.enter(item)
+                    with self._cond:
+                        key = str(item)
+                        scheduled = key in self._scheduled
+                        self._scheduled.discard(key)
+                    if entered:
+                        yield True, item
+                        if scheduled:
+                            stack.append(iter(self._wait_result(item)))
+                    elif scheduled:
+                        self._discard(item)
+                else:
+                    yield False, item
+        finally:
+            with self._cond:
+                self._stop = True
+                self._cond.notify_all()
+            for thread in threads:
+                thread.join()
+
+    def _worker(self, index: int):
+        """
+        Boucle d'un thread : traite sa propre file, puis vole celle des autres
+
+        Quand la file des résultats est pleine, le thread ne lit plus que le
+        dossier attendu par le consommateur (sinon tous les threads pourraient
+        attendre de la place que seul ce dossier permet de libérer).
+
+        Args:
+            index: Index du worker
+        """
+        own = self._deques[index]
+
+        while True:
+            with self._cond:
+                full = len(self._results) >= self.max_buffered
+                task = self._take_waiting() if full else None
+            if not full:
+                task = self._next_task(index)
+
+            if task is None:
+                with self._cond:
+                    if self._stop or self._pending == 0:
+                        return
+                    self._cond.wait(self.IDLE_WAIT)
+                continue
+
+            directory, depth = task
+            try:
+                items = self.read_directory(directory, depth)
+            except Exception as e:
+                print(f"❌ Erreur lors du scan de {directory}: {e}")
+                items = []
+
+            subdirs = [item for item in items if isinstance(item, Path)
+                       and (self.descend is None or self.descend(item))]
+
+            with self._cond:
+                if self._stop:
+                    return
+                self._pending += len(subdirs) - 1
+                self._scheduled.update(str(subdir) for subdir in subdirs)
+                self._results[str(directory)] = items
+                self._cond.notify_all()
+
+            # Le premier sous-dossier est repris en premier (pop à droite)
+            own.extend((subdir, depth + 1) for subdir in reversed(subdirs))
+
+    def _next_task(self, index: int) -> Optional[Tuple[Path, int]]:
+        """
+        Récupère la prochaine tâche : fin de sa propre file, sinon début d'une autre
+
+        Args:
+            index: Index du worker
+
+        Returns:
+            Tuple (dossier, profondeur) ou None si aucune tâche disponible
+        """
+        try:
+            return self._deques[index].pop()
+        except IndexError:
+            pass
+
+        for offset in range(1, self.workers):
+            victim = self._deques[(index + offset) % self.workers]
+            try:
+                return victim.popleft()
+            except IndexError:
+                continue
+
+        return None
+
+    def _take_waiting(self) -> Optional[Tuple[Path, int]]:
+        """
+        Retire des files le dossier attendu par le consommateur (verrou tenu)
+
+        Returns:
+            Tuple (dossier, profondeur) ou None s'il n'est dans aucune file
+        """
+        if self._waiting is None:
+            return None
+        for tasks in self._deques:
+            try:
+                for task in tasks:
+                    if str(task[0]) == self._waiting:
+                        tasks.remove(task)
+                        return task
+            except (RuntimeError, ValueError):
+                # File modifiée par son propriétaire : nouvel essai au prochain réveil
+                return None
+        return None
+
+    def _discard(self, directory: Path):
+        """
+        Abandonne un sous-arbre déjà confié aux threads (ses résultats sont retirés)
+
+        Args:
+            directory: Racine du sous-arbre
+        """
+        pending = [directory]
+        while pending:
+            items = self._wait_result(pending.pop())
+            with self._cond:
+                for item in items:
+                    if isinstance(item, Path) and str(item) in self._scheduled:
+                        self._scheduled.discard(str(item))
+                        pending.append(item)
+
+    def _wait_result(self, directory: Path) -> List[Any]:
+        """
+        Attend puis retire le résultat de lecture d'un dossier
+
+        Args:
+            directory: Dossier attendu
+
+        Returns:
+            Entrées du dossier
+        """
+        key = str(directory)
+        with self._cond:
+            if key not in self._results:
+                self._waiting = key
+                self._cond.notify_all()
+                while key not in self._results:
+                    self._cond.wait()
+                self._waiting = None
+            if len(self._results) >= self.max_buffered:
+                # Place libérée : réveille les threads en attente
+                self._cond.notify_all()
+            return self._results.pop(key)
@@ -0,0 +1,487 @@
+"""
+Module de surveillance en continu d'un dossier scanné
+Applique les événements inotify à l'index en mémoire, par lots
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from .archives import archive_kind
+
+# Événements inotify (voir inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_ONLYDIR | IN_EXCL_UNLINK)
+EVENT_HEADER = struct.Struct('iIII')
+READ_SIZE = 64 * 1024
+
+
+@dataclass
+class ChangeBatch:
+    """Lot de changements appliqués à l'index (chemins relatifs à la racine)"""
+    added: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    modified: Set[str] = field(default_factory=set)
+    # True si le lot provient d'un rescan (débordement de la file d'événements)
+    rescanned: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+class Inotify:
+    """Accès minimal à inotify via ctypes (Linux uniquement, sans dépendance)"""
+
+    def __init__(self):
+        """
+        Ouvre une instance inotify
+
+        Raises:
+            OSError: si inotify n'est pas disponible
+        """
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify n'est disponible que sous Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._libc = libc
+        libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        libc.inotify_rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+
+    def add_watch(self, path: str, mask: int = WATCH_MASK) -> int:
+        """
+        Surveille un dossier
+
+        Args:
+            path: Chemin du dossier
+            mask: Événements surveillés
+
+        Returns:
+            Descripteur de surveillance
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd: int):
+        """Arrête de surveiller un dossier (erreurs ignorées : dossier déjà disparu)"""
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[tuple]:
+        """
+        Lit les événements disponibles sans bloquer
+
+        Returns:
+            Liste de tuples (wd, mask, cookie, nom)
+        """
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                events.append((wd, mask, cookie, os.fsdecode(name)))
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FolderWatcher:
+    """Maintient à jour les fichiers, statistiques et index d'un FolderScanner
+
+    Les événements d'une rafale sont regroupés : un lot est appliqué après
+    `debounce` secondes sans nouvel événement (ou au plus tard `max_delay`
+    secondes après le premier). Chaque chemin touché est réconcilié avec le
+    disque par un seul stat(), quel que soit le nombre d'événements reçus.
+    Si la file du noyau déborde, un rescan incrémental (manifeste, avec un
+    stat() par fichier) remplace les événements perdus. Sans inotify, ce
+    rescan est fait toutes les `poll_interval` secondes.
+
+    Les règles d'exclusion de la racine et le filtre de sélection (filters)
+    s'appliquent aux nouveaux fichiers ; les dossiers exclus au scan ne sont
+    pas surveillés.
+    """
+
+    def __init__(self, scanner, debounce: float = 0.5, max_delay: float = 5.0,
+                 manifest_path: Optional[str] = None, poll_interval: float = 60.0,
+                 **scan_options):
+        """
+        Initialise la surveillance (scan initial compris)
+
+        Args:
+            scanner: FolderScanner à maintenir à jour
+            debounce: Délai de calme avant d'appliquer un lot (secondes)
+            max_delay: Délai maximal entre le premier événement et l'application du lot
+            manifest_path: Manifeste utilisé pour les rescans (fichier temporaire si None)
+            poll_interval: Intervalle des rescans quand inotify n'est pas disponible
+            **scan_options: Options de scan (exclude_folders, ignore, sniff_content...)
+        """
+        self.scanner = scanner
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.scan_options = scan_options
+        self.lock = threading.RLock()
+        self.subscribers: List[Callable[[ChangeBatch], None]] = []
+
+        self._tmpdir = None
+        if manifest_path is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix='analyst_watch_')
+            manifest_path = os.path.join(self._tmpdir.name, 'manifest.pkl')
+        self.manifest_path = manifest_path
+
+        self._root = str(scanner.root_path)
+        self._paths: Dict[int, str] = {}            # wd -> dossier relatif
+        self._index: Dict[str, object] = {}         # chemin relatif -> FileInfo
+        self._members: Dict[str, List[str]] = {}    # archive -> membres virtuels
+        self._dirty_files: Set[str] = set()
+        self._dirty_dirs: Set[str] = set()
+        self._overflow = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        try:
+            self._inotify: Optional[Inotify] = Inotify()
+        except OSError as e:
+            print(f"⚠️  inotify indisponible ({e}), rescan toutes les {poll_interval:.0f} s")
+            self._inotify = None
+
+        self._rescan()
+
+    def subscribe(self, callback: Callable[[ChangeBatch], None]) -> Callable[[ChangeBatch], None]:
+        """
+        Abonne une fonction aux lots de changements (utilisable en décorateur)
+
+        Args:
+            callback: Fonction appelée avec chaque ChangeBatch non vide
+
+        Returns:
+            La fonction abonnée
+        """
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[ChangeBatch], None]):
+        """Désabonne une fonction"""
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def poll(self, timeout: Optional[float] = None) -> Optional[ChangeBatch]:
+        """
+        Attend une rafale d'événements, l'applique et notifie les abonnés
+
+        Args:
+            timeout: Attente maximale du premier événement (None = illimitée)
+
+        Returns:
+            ChangeBatch appliqué, ou None si aucun changement
+        """
+        if self._inotify is None:
+            self._stop.wait(self.poll_interval if timeout is None
+                            else min(timeout, self.poll_interval))
+            with self.lock:
+                batch = self._rescan()
+            return self._notify(batch)
+
+        if not self._wait(timeout):
+            return None
+        first = last = time.monotonic()
+        self._read()
+
+        # Rafale : attendre le calme, sans dépasser max_delay
+        while True:
+            remaining = min(last + self.debounce, first + self.max_delay) - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._wait(remaining):
+                self._read()
+                last = time.monotonic()
+
+        with self.lock:
+            batch = self._rescan() if self._overflow else self._flush()
+        return self._notify(batch)
+
+    def start(self) -> 'FolderWatcher':
+        """Lance la surveillance dans un thread d'arrière-plan"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='folder-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Arrête la surveillance et libère les ressources"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+    def __enter__(self) -> 'FolderWatcher':
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll(timeout=0.5)
+            except Exception as e:
+                print(f"❌ Erreur de surveillance: {e}")
+
+    def _notify(self, batch: ChangeBatch) -> Optional[ChangeBatch]:
+        if not batch:
+            return None
+        for callback in list(self.subscribers):
+            try:
+                callback(batch)
+            except Exception as e:
+                print(f"⚠️  Erreur d'un abonné: {e}")
+        return batch
+
+    def _wait(self, timeout: Optional[float]) -> bool:
+        readable, _, _ = select.select([self._inotify.fd], [], [], timeout)
+        return bool(readable)
+
+    def _read(self):
+        """Enregistre les chemins touchés par les événements disponibles"""
+        for wd, mask, _cookie, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                self._overflow = True
+                continue
+            if mask & IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+            rel_dir = self._paths.get(wd)
+            if rel_dir is None or not name:
+                continue
+            rel = os.path.join(rel_dir, name) if rel_dir else name
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO | IN_DELETE | IN_MOVED_FROM):
+                    self._dirty_dirs.add(rel)
+            else:
+                self._dirty_files.add(rel)
+
+    def _flush(self) -> ChangeBatch:
+        """Réconcilie les chemins touchés avec le disque"""
+        scanner = self.scanner
+        before: Dict[str, tuple] = {}
+        after: Dict[str, tuple] = {}
+
+        dirty_dirs = sorted(self._dirty_dirs, key=lambda rel: rel.count(os.sep))
+        dirty_files = self._dirty_files
+        self._dirty_dirs, self._dirty_files = set(), set()
+        done: List[str] = []
+
+        for rel in dirty_dirs:
+            if any(rel.startswith(parent + os.sep) for parent in done):
+                continue
+            done.append(rel)
+            self._remove_subtree(rel, before)
+            self._add_subtree(rel, after)
+
+        for rel in dirty_files:
+            if any(rel.startswith(parent + os.sep) for parent in done):
+                continue
+            self._reconcile_file(rel, before, after)
+
+        if before:
+            scanner.files = list(self._index.values())
+        return self._diff(before, after)
+
+    @staticmethod
+    def _diff(before: Dict[str, tuple], after: Dict[str, tuple], rescanned: bool = False) -> ChangeBatch:
+        """Compare deux états {chemin: (taille, mtime)}"""
+        batch = ChangeBatch(rescanned=rescanned)
+        for rel in before.keys() | after.keys():
+            if rel not in after:
+                batch.removed.add(rel)
+            elif rel not in before:
+                batch.added.add(rel)
+            elif before[rel] != after[rel]:
+                batch.modified.add(rel)
+        return batch
+
+    def _reconcile_file(self, rel: str, before: Dict[str, tuple], after: Dict[str, tuple]):
+        """Met à jour un fichier d'après un stat()"""
+        scanner = self.scanner
+        old = self._index.get(rel)
+        try:
+            stat = os.stat(os.path.join(self._root, rel))
+            exists = os.path.isfile(os.path.join(self._root, rel))
+        except OSError:
+            exists = False
+
+        if old is not None:
+            if exists and (old.size_bytes, old.modified_ts) == (stat.st_size, stat.st_mtime):
+                return
+            self._drop(rel, before)
+        if not exists or self._excluded(rel, False):
+            return
+
+        rel_dir, name = os.path.split(rel)
+        directory = Path(self._root, rel_dir) if rel_dir else scanner.root_path
+        file_info = scanner._file_info_from_values(
+            directory, name, rel.count(os.sep), stat.st_size, stat.st_ctime, stat.st_mtime
+        )
+        if scanner._sniff_content:
+            scanner._sniff_items(directory, [file_info], {name: (stat.st_ino, stat.st_mtime_ns)})
+        if scanner._filter is not None and not scanner._filter.match(file_info):
+            return
+        self._insert(file_info, after)
+        if scanner._archives is not None and archive_kind(name):
+            members = scanner._list_archive(file_info)
+            self._members[rel] = [member.relative_path for member in members]
+            for member in members:
+                self._insert(member, after)
+
+    def _add_subtree(self, rel: str, after: Dict[str, tuple]):
+        """Scanne un dossier apparu (création ou déplacement) et le surveille"""
+        scanner = self.scanner
+        path = os.path.join(self._root, rel)
+        if not os.path.isdir(path) or os.path.islink(path) or self._excluded(rel, True):
+            return
+
+        directory = Path(path)
+        scanner._register_folder(directory)
+        # Un dossier déplacé garde son inode : il ne doit pas passer pour une boucle
+        scanner._seen_dirs.clear()
+        scanner._dir_keys.clear()
+        scanner._key_paths.clear()
+        for file_info in scanner._scan_directory(directory, rel.count(os.sep) + 1):
+            self._insert(file_info, after)
+            if file_info.archive_path is not None:
+                archive = os.path.relpath(file_info.archive_path, self._root)
+                self._members.setdefault(archive, []).append(file_info.relative_path)
+
+        prefix = rel + os.sep
+        for rel_dir in [d for d in scanner.tree_index.nodes if d == rel or d.startswith(prefix)]:
+            self._watch(rel_dir)
+
+    def _remove_subtree(self, rel: str, before: Dict[str, tuple]):
+        """Retire un dossier disparu (suppression ou déplacement) et ses fichiers"""
+        scanner = self.scanner
+        prefix = rel + os.sep
+        for key in [k for k in self._index if k.startswith(prefix)]:
+            file_info = self._index.pop(key)
+            before[key] = (file_info.size_bytes, file_info.modified_ts)
+            scanner._remove_stats(file_info, update_index=False)
+        for key in [k for k in self._members if k.startswith(prefix)]:
+            del self._members[key]
+
+        scanner.stats['total_folders'] -= scanner.tree_index.remove_directory(rel)
+        for wd, rel_dir in list(self._paths.items()):
+            if rel_dir == rel or rel_dir.startswith(prefix):
+                self._inotify.rm_watch(wd)
+                del self._paths[wd]
+
+    def _insert(self, file_info, after: Dict[str, tuple]):
+        self._index[file_info.relative_path] = file_info
+        self.scanner.files.append(file_info)
+        self.scanner._update_stats(file_info)
+        after[file_info.relative_path] = (file_info.size_bytes, file_info.modified_ts)
+
+    def _drop(self, rel: str, before: Dict[str, tuple]):
+        file_info = self._index.pop(rel)
+        before[rel] = (file_info.size_bytes, file_info.modified_ts)
+        self.scanner._remove_stats(file_info)
+        for member in self._members.pop(rel, ()):
+            member_info = self._index.pop(member, None)
+            if member_info is not None:
+                before[member] = (member_info.size_bytes, member_info.modified_ts)
+                self.scanner._remove_stats(member_info)
+
+    def _excluded(self, rel: str, is_dir: bool) -> bool:
+        scanner = self.scanner
+        if os.path.basename(rel) in scanner._exclude:
+            return True
+        matcher = scanner._ignore_root
+        return bool(matcher) and matcher.is_ignored(rel.replace(os.sep, '/'), is_dir)
+
+    def _watch(self, rel_dir: str):
+        if self._inotify is None:
+            return
+        try:
+            wd = self._inotify.add_watch(os.path.join(self._root, rel_dir) if rel_dir else self._root)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                print("⚠️  Limite inotify atteinte (fs.inotify.max_user_watches)")
+            return
+        self._paths[wd] = rel_dir
+
+    def _rescan(self) -> ChangeBatch:
+        """Rescan incrémental complet : état initial, débordement ou absence d'inotify
+
+        Chaque fichier est revérifié (verify_files) : le manifeste ne contient
+        pas les changements appliqués depuis les événements, et une modification
+        sur place ne change pas la date du dossier.
+        """
+        scanner = self.scanner
+        before = {rel: (f.size_bytes, f.modified_ts) for rel, f in self._index.items()}
+        options = dict(self.scan_options, verify_files=True)
+        result = scanner.rescan(self.manifest_path, **options)
+
+        # Changements par rapport à l'index en mémoire (le manifeste ignore les
+        # changements déjà appliqués depuis les événements)
+        self._index = {f.relative_path: f for f in result.files}
+        self._members = {}
+        for f in result.files:
+            if f.archive_path is not None:
+                archive = os.path.relpath(f.archive_path, self._root)
+                self._members.setdefault(archive, []).append(f.relative_path)
+        self._dirty_files, self._dirty_dirs = set(), set()
+        self._overflow = False
+
+        if self._inotify is not None:
+            # Réenregistrer les dossiers : inotify_add_watch est idempotent
+            self._paths = {}
+            for rel_dir in list(scanner.tree_index.nodes):
+                self._watch(rel_dir)
+
+        if not before:
+            return ChangeBatch(rescanned=True)
+        after = {rel: (f.size_bytes, f.modified_ts) for rel, f in self._index.items()}
+        return self._diff(before, after, rescanned=True)
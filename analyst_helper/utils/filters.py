@@ -0,0 +1,153 @@
+"""
+Filtres de sélection des fichiers appliqués pendant le scan
+Extension, type, taille et date de modification, vérifiés avant la création des FileInfo
+"""
+
+from datetime import date, datetime
+from typing import Iterable, Optional, Union
+
+# Date acceptée par les bornes : datetime, date, timestamp ou chaîne ISO ('2024-01-31')
+DateLike = Union[datetime, date, float, int, str]
+
+
+def _normalize_extension(extension: str) -> str:
+    extension = extension.strip().lower()
+    if extension and not extension.startswith('.'):
+        extension = '.' + extension
+    return extension
+
+
+def _timestamp(value: Optional[DateLike]) -> Optional[float]:
+    """
+    Convertit une borne de date en timestamp
+
+    Args:
+        value: datetime, date (minuit, heure locale), timestamp ou chaîne ISO
+
+    Returns:
+        Timestamp, ou None si aucune borne
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).timestamp()
+    return float(value)
+
+
+class ScanFilter:
+    """Critères de sélection des fichiers, vérifiés au fil du parcours
+
+    Les critères sur le nom (extension, type déduit de l'extension) sont testés
+    avant tout stat() ; la taille et la date ne sont lues que pour les fichiers
+    qui les passent. Aucun FileInfo n'est créé pour un fichier rejeté.
+
+    Tous les critères fournis doivent être satisfaits. Bornes : min_size,
+    max_size et modified_after incluses, modified_before exclue.
+    """
+
+    def __init__(self, extensions: Optional[Iterable[str]] = None,
+                 file_types: Optional[Iterable[str]] = None,
+                 min_size: Optional[int] = None, max_size: Optional[int] = None,
+                 modified_after: Optional[DateLike] = None,
+                 modified_before: Optional[DateLike] = None):
+        """
+        Compile les critères
+
+        Args:
+            extensions: Extensions retenues ('.pdf', 'msg'...), insensibles à la casse
+            file_types: Types retenus ('Correspondance', 'Image'...)
+            min_size: Taille minimale (octets)
+            max_size: Taille maximale (octets)
+            modified_after: Date de modification minimale
+            modified_before: Date de modification maximale (exclue)
+        """
+        self.extensions = frozenset(_normalize_extension(e) for e in extensions) \
+            if extensions is not None else None
+        self.file_types = frozenset(file_types) if file_types is not None else None
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = _timestamp(modified_after)
+        self.modified_before = _timestamp(modified_before)
+
+    @property
+    def needs_stat(self) -> bool:
+        """Le filtre porte sur la taille ou la date (un stat() est nécessaire)"""
+        return (self.min_size is not None or self.max_size is not None
+                or self.modified_after is not None or self.modified_before is not None)
+
+    def match_extension(self, extension: str) -> bool:
+        """
+        Teste l'extension d'un fichier
+
+        Args:
+            extension: Extension en minuscules ('' si aucune)
+
+        Returns:
+            True si l'extension est retenue
+        """
+        return self.extensions is None or extension in self.extensions
+
+    def match_type(self, file_type: str) -> bool:
+        """
+        Teste le type d'un fichier
+
+        Args:
+            file_type: Type de fichier (voir FolderScanner._classify_file)
+
+        Returns:
+            True si le type est retenu
+        """
+        return self.file_types is None or file_type in self.file_types
+
+    def match_stat(self, size: int, mtime: float) -> bool:
+        """
+        Teste la taille et la date de modification
+
+        Args:
+            size: Taille en octets
+            mtime: Date de modification (timestamp)
+
+        Returns:
+            True si les bornes sont respectées
+        """
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        if self.modified_after is not None and mtime < self.modified_after:
+            return False
+        if self.modified_before is not None and mtime >= self.modified_before:
+            return False
+        return True
+
+    def match(self, file) -> bool:
+        """
+        Teste un fichier déjà construit (FileInfo ou FileRecord)
+
+        Args:
+            file: Fichier
+
+        Returns:
+            True si tous les critères sont satisfaits
+        """
+        return (self.match_extension(file.extension) and self.match_type(file.file_type)
+                and (not self.needs_stat or self.match_stat(file.size_bytes, file.modified_ts)))
+
+    def __bool__(self) -> bool:
+        return self.extensions is not None or self.file_types is not None or self.needs_stat
+
+    def __repr__(self) -> str:
+        criteria = {
+            'extensions': sorted(self.extensions) if self.extensions is not None else None,
+            'file_types': sorted(self.file_types) if self.file_types is not None else None,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'modified_after': self.modified_after,
+            'modified_before': self.modified_before,
+        }
+        return "ScanFilter(" + ", ".join(f"{k}={v!r}" for k, v in criteria.items()
+                                          if v is not None) + ")"
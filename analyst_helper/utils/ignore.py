@@ -0,0 +1,211 @@
+"""
+Règles d'exclusion au format gitignore
+Motifs glob, '**', négation '!' et fichiers .analystignore rencontrés pendant le scan
+"""
+
+import re
+from typing import Iterable, List, Optional, Tuple
+
+# Nom des fichiers de règles lus pendant le parcours
+IGNORE_FILENAME = '.analystignore'
+
+
+def _translate(pattern: str) -> str:
+    """
+    Traduit un motif glob (sans '!' ni '/' final) en expression régulière
+
+    Args:
+        pattern: Motif glob ('*', '?', '[...]', '**')
+
+    Returns:
+        Expression régulière (sans ancres)
+    """
+    result = []
+    i, n = 0, len(pattern)
+
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                at_start = i == 0 or pattern[i - 1] == '/'
+                if at_start and pattern.startswith('**/', i):
+                    result.append('(?:.*/)?')     # '**/' : zéro ou plusieurs dossiers
+                    i += 3
+                    continue
+                result.append('.*')               # '/**' final ou '**' isolé
+                i += 2
+                continue
+            result.append('[^/]*')
+        elif c == '?':
+            result.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                result.append(re.escape(c))
+            else:
+                content = pattern[i + 1:end]
+                if content.startswith('!'):
+                    content = '^' + content[1:]
+                result.append(f"[{content.replace(chr(92), chr(92) * 2)}]")
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(c))
+        i += 1
+
+    return ''.join(result)
+
+
+class IgnoreRules:
+    """Ensemble de règles d'exclusion, compilées en une seule expression régulière
+
+    Comme pour .gitignore : la dernière règle qui correspond l'emporte, '!'
+    réintègre un chemin, un '/' final limite la règle aux dossiers, et un motif
+    contenant un '/' est ancré au dossier des règles (base).
+    """
+
+    def __init__(self, patterns: Iterable[str] = (), base: str = ''):
+        """
+        Compile les règles
+
+        Args:
+            patterns: Motifs (une règle par élément, '#' pour les commentaires)
+            base: Dossier des règles, relatif à la racine du scan ('' pour la racine)
+        """
+        self.base = base.strip('/')
+        self.patterns: List[str] = []
+        self._negated: List[bool] = []
+        file_rules, dir_rules = [], []
+
+        for raw in patterns:
+            pattern = raw.rstrip('\n').rstrip()
+            if not pattern or pattern.startswith('#'):
+                continue
+            self.patterns.append(pattern)
+
+            negated = pattern.startswith('!')
+            if negated:
+                pattern = pattern[1:]
+            elif pattern.startswith('\\'):
+                pattern = pattern[1:]
+
+            dir_only = pattern.endswith('/')
+            pattern = pattern.rstrip('/')
+            if not pattern:
+                continue
+
+            anchored = '/' in pattern
+            regex = _translate(pattern.lstrip('/'))
+            if not anchored:
+                regex = '(?:.*/)?' + regex
+
+            index = len(self._negated)
+            self._negated.append(negated)
+            group = f"(?P<r{index}>{regex})"
+            dir_rules.append(group)
+            if not dir_only:
+                file_rules.append(group)
+
+        # Alternatives en ordre inverse : la première qui correspond est la dernière règle
+        self._file_regex = self._compile(file_rules)
+        self._dir_regex = self._compile(dir_rules)
+
+    @staticmethod
+    def _compile(groups: List[str]) -> Optional['re.Pattern']:
+        if not groups:
+            return None
+        return re.compile('|'.join(reversed(groups)), re.DOTALL)
+
+    @classmethod
+    def from_file(cls, path: str, base: str = '') -> 'IgnoreRules':
+        """
+        Lit un fichier de règles (.analystignore)
+
+        Args:
+            path: Chemin du fichier
+            base: Dossier du fichier, relatif à la racine du scan
+
+        Returns:
+            IgnoreRules (vide si le fichier est illisible)
+        """
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return cls(f.readlines(), base)
+        except OSError as e:
+            print(f"⚠️  Règles illisibles {path}: {e}")
+            return cls((), base)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Teste un chemin relatif à la base des règles
+
+        Args:
+            rel_path: Chemin relatif (séparateur '/')
+            is_dir: Le chemin est un dossier
+
+        Returns:
+            True si exclu, False si réintégré par '!', None si aucune règle ne correspond
+        """
+        regex = self._dir_regex if is_dir else self._file_regex
+        if regex is None:
+            return None
+        match = regex.fullmatch(rel_path)
+        if match is None:
+            return None
+        return not self._negated[int(match.lastgroup[1:])]
+
+    def __bool__(self) -> bool:
+        return self._dir_regex is not None
+
+    def __repr__(self) -> str:
+        return f"IgnoreRules({self.patterns!r}, base={self.base!r})"
+
+
+class IgnoreMatcher:
+    """Chaîne de règles applicables à un dossier : racine, puis .analystignore successifs"""
+
+    __slots__ = ('rules',)
+
+    def __init__(self, rules: Tuple[IgnoreRules, ...] = ()):
+        self.rules = tuple(r for r in rules if r)
+
+    def child(self, rules: IgnoreRules) -> 'IgnoreMatcher':
+        """
+        Ajoute des règles plus spécifiques (sous-dossier)
+
+        Args:
+            rules: Règles du sous-dossier
+
+        Returns:
+            Nouvelle chaîne (self si les règles sont vides)
+        """
+        return IgnoreMatcher(self.rules + (rules,)) if rules else self
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Indique si un chemin doit être exclu
+
+        Les règles les plus proches du chemin sont prioritaires.
+
+        Args:
+            rel_path: Chemin relatif à la racine du scan (séparateur '/')
+            is_dir: Le chemin est un dossier
+
+        Returns:
+            True si le chemin est exclu
+        """
+        for rules in reversed(self.rules):
+            if rules.base:
+                if not rel_path.startswith(rules.base + '/'):
+                    continue
+                result = rules.match(rel_path[len(rules.base) + 1:], is_dir)
+            else:
+                result = rules.match(rel_path, is_dir)
+            if result is not None:
+                return result
+        return False
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
@@ -0,0 +1,126 @@
+"""
+Module d'attribution de noms de fichiers uniques
+Registre en mémoire des noms déjà pris dans chaque dossier de destination
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+
+class _DirectoryNames:
+    """Noms pris dans un dossier, noms attribués par le registre et prochain suffixe par nom"""
+
+    __slots__ = ('taken', 'allocated', 'next_suffix')
+
+    def __init__(self, taken: Set[str]):
+        self.taken = taken
+        self.allocated: Set[str] = set()
+        self.next_suffix: Dict[Tuple[str, str], int] = {}
+
+
+class NameRegistry:
+    """Registre des noms attribués par dossier de destination
+
+    Le contenu d'un dossier est lu une seule fois (un scandir), à la première
+    attribution dans ce dossier ; ensuite, tout se fait en mémoire. Pour
+    chaque nom, le prochain suffixe _N à essayer est mémorisé : attribuer le
+    millième « scan.pdf » ne teste pas les 999 noms précédents. Utilisable
+    depuis plusieurs threads ; un registre peut être partagé entre le
+    classificateur et l'extracteur d'une même session.
+
+    Les fichiers créés dans ces dossiers hors du registre (par un autre
+    programme) pendant la session ne sont pas vus.
+    """
+
+    def __init__(self):
+        self._dirs: Dict[str, _DirectoryNames] = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, path: Path) -> Path:
+        """
+        Attribue un chemin libre : le chemin demandé, ou nom_1, nom_2... s'il est pris
+
+        Args:
+            path: Chemin souhaité
+
+        Returns:
+            Chemin unique, réservé (les appels suivants ne le retournent plus)
+        """
+        path = Path(path)
+        parent = path.parent
+        with self._lock:
+            names = self._directory(parent)
+            name = path.name
+            if self._key(name) not in names.taken:
+                names.taken.add(self._key(name))
+                names.allocated.add(self._key(name))
+                return path
+
+            stem, suffix = path.stem, path.suffix
+            counter = names.next_suffix.get((stem, suffix), 1)
+            candidate = f"{stem}_{counter}{suffix}"
+            while self._key(candidate) in names.taken:
+                counter += 1
+                candidate = f"{stem}_{counter}{suffix}"
+            names.taken.add(self._key(candidate))
+            names.allocated.add(self._key(candidate))
+            names.next_suffix[(stem, suffix)] = counter + 1
+            return parent / candidate
+
+    def reserve(self, path: Path):
+        """
+        Marque un chemin comme pris (fichier créé sans passer par allocate)
+
+        Args:
+            path: Chemin pris
+        """
+        path = Path(path)
+        with self._lock:
+            names = self._directory(path.parent)
+            names.taken.add(self._key(path.name))
+            names.allocated.add(self._key(path.name))
+
+    def claim(self, path: Path) -> bool:
+        """
+        Réserve un chemin précis, même s'il existe déjà sur disque
+
+        Sert à réécrire une destination choisie lors d'une session précédente
+        (reprise d'un classement) : le chemin est refusé seulement s'il a déjà
+        été attribué pendant cette session.
+
+        Args:
+            path: Chemin souhaité
+
+        Returns:
+            True si le chemin est réservé, False s'il a déjà été attribué
+        """
+        path = Path(path)
+        with self._lock:
+            names = self._directory(path.parent)
+            key = self._key(path.name)
+            if key in names.allocated:
+                return False
+            names.taken.add(key)
+            names.allocated.add(key)
+            return True
+
+    def _directory(self, parent: Path) -> _DirectoryNames:
+        """Noms d'un dossier, lus au premier appel (appelé sous verrou)"""
+        # Un même dossier peut être désigné par un chemin relatif ou absolu
+        key = os.path.normcase(os.path.abspath(parent))
+        names = self._dirs.get(key)
+        if names is None:
+            try:
+                with os.scandir(parent) as entries:
+                    taken = {self._key(entry.name) for entry in entries}
+            except (FileNotFoundError, NotADirectoryError):
+                taken = set()
+            names = self._dirs[key] = _DirectoryNames(taken)
+        return names
+
+    @staticmethod
+    def _key(name: str) -> str:
+        """Nom normalisé (insensible à la casse sous Windows, comme le système de fichiers)"""
+        return os.path.normcase(name)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark du catalogue SQLite : débit d'insertion (lignes/s), relecture et recherche
+
+Les enregistrements sont synthétiques (aucun fichier n'est créé). L'insertion
+du catalogue (executemany en une transaction, WAL, index FTS5 rempli en une
+requête) est comparée à une insertion ligne par ligne avec un commit par
+ligne, mesurée sur un échantillon.
+
+Usage:
+    python benchmarks/bench_catalog.py            # 500 000 fichiers
+    python benchmarks/bench_catalog.py 100000
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper import ScanCatalog
+from analyst_helper.core.catalog import FILE_COLUMNS
+from analyst_helper.core.scanner import FileInfo, FolderScanner
+
+ROOT = "/data/affaire"
+EXTENSIONS = ['.pdf', '.msg', '.docx', '.xlsx', '.jpg', '.dwg', '.txt', '.zip']
+WORDS = ['plan', 'devis', 'facture', 'compte-rendu', 'réunion', 'chantier', 'lot', 'avenant']
+# Lignes insérées une par une (commit à chaque ligne) pour la comparaison
+ROW_BY_ROW_SAMPLE = 2000
+
+
+def synthetic_files(count: int):
+    """Fichiers synthétiques répartis sur count/50 dossiers"""
+    classify = FolderScanner(ROOT)._classify_file
+    for i in range(count):
+        folder = f"dossier_{i // 5000}/{WORDS[(i // 50) % len(WORDS)]}_{i // 50}"
+        extension = EXTENSIONS[i % len(EXTENSIONS)]
+        name = f"{WORDS[i % len(WORDS)]}_{i}{extension}"
+        yield FileInfo(name, f"{ROOT}/{folder}/{name}", f"{folder}/{name}", extension,
+                       (i * 7919) % 50_000_000, 1.6e9 + i, 1.7e9 + i, classify(extension), 2,
+                       folder.rsplit('/', 1)[-1], extension == '.msg')
+
+
+def row_by_row(db_path: str, count: int) -> float:
+    """Insertion naïve : une requête et un commit par ligne (mode de journal par défaut)"""
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"CREATE TABLE files ({', '.join(FILE_COLUMNS)})")
+    start = time.perf_counter()
+    for file in synthetic_files(count):
+        conn.execute(f"INSERT INTO files VALUES ({', '.join('?' * len(FILE_COLUMNS))})",
+                     tuple(getattr(file, name) for name in FILE_COLUMNS))
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return count / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "catalogue.db")
+        with ScanCatalog(db_path) as catalog:
+            start = time.perf_counter()
+            scan_id = catalog.add_scan(synthetic_files(count), ROOT)
+            ingest = time.perf_counter() - start
+
+            start = time.perf_counter()
+            read = sum(1 for _ in catalog.iter_files(scan_id))
+            reading = time.perf_counter() - start
+
+            start = time.perf_counter()
+            found = catalog.search_files("réunion dwg", limit=1000)
+            search = time.perf_counter() - start
+            fts = catalog.fts
+
+        size_mb = sum(os.path.getsize(os.path.join(tmpdir, name))
+                      for name in os.listdir(tmpdir)) / (1024 * 1024)
+        naive = row_by_row(os.path.join(tmpdir, "naif.db"), ROW_BY_ROW_SAMPLE)
+
+    print(f"Fichiers : {count:,}  (FTS5 : {'oui' if fts else 'non'}, base : {size_mb:.0f} MB)")
+    print(f"{'opération':<36} {'durée (s)':>10} {'lignes/s':>12}")
+    print(f"{'insertion catalogue (+ index FTS)':<36} {ingest:>10.2f} {count / ingest:>12,.0f}")
+    print(f"{'insertion ligne à ligne (commit)':<36} {ROW_BY_ROW_SAMPLE / naive:>10.2f} "
+          f"{naive:>12,.0f}  (sur {ROW_BY_ROW_SAMPLE} lignes)")
+    print(f"{'relecture (FileInfo)':<36} {reading:>10.2f} {read / reading:>12,.0f}")
+    print(f"Recherche 'réunion dwg' : {len(found)} résultats en {search * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
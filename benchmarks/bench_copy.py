@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la copie de classify_all : copie séquentielle, copie parallèle et liens
+
+Deux jeux de fichiers sont créés : beaucoup de petits fichiers (coût dominé
+par les ouvertures et métadonnées) et quelques gros fichiers (coût dominé
+par le débit). Chaque jeu est classé avec 1, 4 et 8 threads de copie, puis
+par liens physiques et symboliques (mode). Les fichiers sources restent en
+cache : sur un stockage réseau ou des disques multiples, l'écart est en
+général plus marqué qu'ici.
+
+Usage:
+    python benchmarks/bench_copy.py                     # 20 000 petits, 3 x 512 Mo
+    python benchmarks/bench_copy.py 50000 4 2048        # 50 000 petits, 4 x 2 Go
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper import FileClassifier, FolderScanner
+
+# (mode, threads)
+RUNS = [('copy', 1), ('copy', 4), ('copy', 8), ('hardlink', 1), ('symlink', 1)]
+SMALL_FILE_SIZE = 4096
+CHUNK = 16 * 1024 * 1024
+
+
+def make_small_files(root: Path, count: int):
+    """count fichiers de 4 Ko répartis sur des dossiers de 500 fichiers"""
+    payload = os.urandom(SMALL_FILE_SIZE)
+    for i in range(count):
+        folder = root / f"dossier_{i // 500}"
+        if i % 500 == 0:
+            folder.mkdir(parents=True)
+        (folder / f"doc_{i}.pdf").write_bytes(payload)
+
+
+def make_large_files(root: Path, count: int, size_mb: int):
+    """count fichiers de size_mb Mo"""
+    root.mkdir(parents=True)
+    chunk = os.urandom(CHUNK)
+    for i in range(count):
+        with open(root / f"maquette_{i}.dwg", 'wb') as f:
+            remaining = size_mb * 1024 * 1024
+            while remaining > 0:
+                f.write(chunk[:remaining])
+                remaining -= CHUNK
+
+
+def run(files, output: Path, mode: str, workers: int) -> float:
+    """Classe les fichiers et retourne la durée"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        classifier = FileClassifier(str(output))
+        start = time.perf_counter()
+        classifier.classify_all(files, show_progress=False, workers=workers, mode=mode)
+        elapsed = time.perf_counter() - start
+    shutil.rmtree(output)
+    return elapsed
+
+
+def main():
+    small_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    large_count = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    large_mb = int(sys.argv[3]) if len(sys.argv) > 3 else 512
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        make_small_files(Path(tmpdir) / "petits", small_count)
+        make_large_files(Path(tmpdir) / "gros", large_count, large_mb)
+
+        print(f"{'jeu':<20} {'mode':<9} {'threads':>7} {'durée (s)':>10} {'fichiers/s':>11} "
+              f"{'Mo/s':>8}")
+        for label, folder, total_mb in (
+                (f"{small_count} x 4 Ko", "petits", small_count * SMALL_FILE_SIZE / 1024 / 1024),
+                (f"{large_count} x {large_mb} Mo", "gros", large_count * large_mb)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                files = FolderScanner(os.path.join(tmpdir, folder)).scan()
+            for mode, workers in RUNS:
+                elapsed = run(files, Path(tmpdir) / "sortie", mode, workers)
+                print(f"{label:<20} {mode:<9} {workers:>7} {elapsed:>10.2f} "
+                      f"{len(files) / elapsed:>11,.0f} {total_mb / elapsed:>8,.0f}")
+
+
+if __name__ == "__main__":
+    main()
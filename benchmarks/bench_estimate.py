@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'estimation : précision et durée contre un scan complet
+
+Crée une arborescence irrégulière (profondeurs et nombres de fichiers
+variables), puis compare l'estimation obtenue avec différents nombres de
+descentes au résultat exact du scan.
+
+Usage:
+    python benchmarks/bench_estimate.py            # 30 000 fichiers
+    python benchmarks/bench_estimate.py 100000
+"""
+
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper import FolderScanner
+
+EXTENSIONS = ['.pdf', '.msg', '.docx', '.xlsx', '.jpg', '.dwg']
+PROBES = [20, 100, 200, 1000]
+
+
+def build_tree(root: Path, count: int):
+    """Fichiers répartis dans des dossiers de profondeur 1 à 4 tirés au hasard"""
+    rng = random.Random(7)
+    folders = []
+    for i in range(max(1, count // 40)):
+        parts = [f"niveau_{depth}_{rng.randrange(4 + depth * 3)}" for depth in range(rng.randint(1, 4))]
+        folders.append(root.joinpath(*parts))
+    for i in range(count):
+        folder = folders[min(len(folders) - 1, int(rng.paretovariate(1.2)) - 1 + i % 5)]
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"doc_{i}{EXTENSIONS[i % len(EXTENSIONS)]}").write_bytes(b"x" * (i % 4096))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30_000
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / "racine"
+        build_tree(root, count)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            scanner = FolderScanner(str(root))
+            start = time.perf_counter()
+            scanner.scan()
+            full = time.perf_counter() - start
+        exact_files = scanner.stats['total_files']
+        exact_mb = sum(f.size_bytes for f in scanner.files) / (1024 * 1024)
+
+        print(f"Scan complet : {exact_files:,} fichiers, {exact_mb:.1f} MB en {full:.2f} s\n")
+        print(f"{'descentes':>9} {'dossiers lus':>12} {'durée (s)':>10} {'fichiers estimés':>30} "
+              f"{'erreur':>7} {'MB estimés':>10}")
+        for probes in PROBES:
+            with contextlib.redirect_stdout(io.StringIO()):
+                estimation = FolderScanner(str(root)).estimate(probes=probes, seed=0)
+            error = (estimation.files.value - exact_files) / exact_files
+            inside = estimation.files.low <= exact_files <= estimation.files.high
+            print(f"{probes:>9} {estimation.directories_read:>12} {estimation.duration:>10.3f} "
+                  f"{str(estimation.files):>30} {error:>+6.0%}{'' if inside else '*'} "
+                  f"{estimation.size_mb.value:>10.1f}")
+        print("\n* valeur exacte hors de l'intervalle de confiance")
+
+
+if __name__ == "__main__":
+    main()
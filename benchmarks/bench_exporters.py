@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark des exports : export_to_json / export_to_csv contre les exports en flux
+
+Mesure la durée et le pic mémoire de chaque export sur N fichiers synthétiques.
+
+Usage:
+    python benchmarks/bench_exporters.py            # 200 000 fichiers
+    python benchmarks/bench_exporters.py 1000000
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper.core.scanner import FileInfo, FolderScanner
+
+ROOT = "/data/affaire"
+EXTENSIONS = ['.pdf', '.msg', '.docx', '.xlsx', '.jpg', '.dwg', '.txt', '.zip']
+
+
+def synthetic_scanner(count: int) -> FolderScanner:
+    """Crée un scanner rempli de fichiers synthétiques"""
+    scanner = FolderScanner(ROOT)
+    for i in range(count):
+        folder = f"dossier_{i // 5000}/sous_dossier_{i // 50}"
+        extension = EXTENSIONS[i % len(EXTENSIONS)]
+        name = f"document_{i}{extension}"
+        file = FileInfo(name, f"{ROOT}/{folder}/{name}", f"{folder}/{name}", extension,
+                        (i * 7919) % 50_000_000, 1.6e9 + i, 1.7e9 + i,
+                        scanner._classify_file(extension), 2, f"sous_dossier_{i // 50}",
+                        extension == '.msg')
+        scanner.files.append(file)
+        scanner._update_stats(file)
+    return scanner
+
+
+def measure(label: str, export, output_path: str):
+    """Mesure durée, pic mémoire et taille du fichier produit"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        export(output_path)
+        elapsed = time.perf_counter() - start
+
+        # Deuxième passage pour le pic mémoire (tracemalloc fausse les durées)
+        tracemalloc.start()
+        export(output_path)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    size = os.path.getsize(output_path)
+    print(f"{label:<32} {elapsed:>8.2f} s {peak / 1e6:>10.1f} MB {size / 1e6:>10.1f} MB")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Création de {count} fichiers synthétiques...")
+    scanner = synthetic_scanner(count)
+
+    print(f"\n{'export':<32} {'durée':>10} {'pic mémoire':>13} {'fichier':>13}")
+    with tempfile.TemporaryDirectory() as outdir:
+        out = Path(outdir)
+        measure("export_to_json (indent=2)", scanner.export_to_json, str(out / "old.json"))
+        measure("export_to_csv (DictWriter)", scanner.export_to_csv, str(out / "old.csv"))
+        measure("export_stream json", scanner.export_stream, str(out / "new.json"))
+        measure("export_stream csv", scanner.export_stream, str(out / "new.csv"))
+        measure("export_stream ndjson", scanner.export_stream, str(out / "new.ndjson"))
+        measure("export_stream ndjson.gz", scanner.export_stream, str(out / "new.ndjson.gz"))
+        measure("export_stream csv.xz", scanner.export_stream, str(out / "new.csv.xz"))
+
+
+if __name__ == "__main__":
+    main()
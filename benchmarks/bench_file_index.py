@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark des requêtes : parcours linéaire de scanner.files contre FileIndex
+
+Les enregistrements sont synthétiques (aucun fichier n'est créé) et stockés
+dans une FileTable. Chaque requête est faite une fois par un filtrage Python
+sur toutes les lignes, puis par l'index ; les résultats sont comparés.
+
+Usage:
+    python benchmarks/bench_file_index.py            # 1 000 000 fichiers
+    python benchmarks/bench_file_index.py 200000
+"""
+
+import heapq
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper import FileIndex, FileTable, ScanFilter
+from analyst_helper.core.scanner import FileInfo, FolderScanner
+
+ROOT = "/data/affaire"
+EXTENSIONS = ['.pdf', '.msg', '.docx', '.xlsx', '.jpg', '.dwg', '.txt', '.zip']
+START_TS = 1.5e9
+SPAN_TS = 2e8
+
+QUERIES = [
+    ("20 plus gros", {'order_by': 'size', 'descending': True, 'limit': 20}),
+    ("modifiés sur 1 jour", {'modified_after': START_TS + 1e8, 'modified_before': START_TS + 1e8 + 86400}),
+    (".dwg sous dossier_7", {'extensions': ['.dwg'], 'under': 'dossier_7'}),
+    ("courriels > 40 Mo", {'file_types': ['Correspondance'], 'min_size': 40_000_000}),
+    ("10 .pdf les plus récents", {'extensions': ['.pdf'], 'order_by': 'mtime',
+                                  'descending': True, 'limit': 10}),
+]
+
+
+def build_table(count: int) -> FileTable:
+    """Table synthétique de count fichiers répartis sur count/50 dossiers"""
+    classify = FolderScanner(ROOT)._classify_file
+    rng = random.Random(42)
+    table = FileTable(ROOT)
+    for i in range(count):
+        folder = f"dossier_{i // 5000}/sous_dossier_{i // 50}"
+        extension = EXTENSIONS[i % len(EXTENSIONS)]
+        name = f"document_{i}{extension}"
+        table.append(FileInfo(name, f"{ROOT}/{folder}/{name}", f"{folder}/{name}", extension,
+                              rng.randrange(50_000_000), START_TS, START_TS + rng.random() * SPAN_TS,
+                              classify(extension), 2, f"sous_dossier_{i // 50}",
+                              extension == '.msg'))
+    return table
+
+
+def linear(files, criteria: dict):
+    """Requête par parcours de toutes les lignes (référence)"""
+    options = dict(criteria)
+    under = options.pop('under', None)
+    order_by = options.pop('order_by', None)
+    descending = options.pop('descending', False)
+    limit = options.pop('limit', None)
+    spec = ScanFilter(**options)
+
+    selected = [f for f in files
+                if spec.match(f) and (under is None or f.relative_path.startswith(under + '/'))]
+    if order_by is not None:
+        key = (lambda f: f.size_bytes) if order_by == 'size' else (lambda f: f.modified_ts)
+        select = heapq.nlargest if descending else heapq.nsmallest
+        selected = select(limit, selected, key=key) if limit else sorted(selected, key=key,
+                                                                          reverse=descending)
+    return selected
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"Génération de {count:,} fichiers synthétiques...")
+    table = build_table(count)
+
+    start = time.perf_counter()
+    index = FileIndex(table)
+    print(f"Construction de l'index : {time.perf_counter() - start:.2f} s\n")
+
+    print(f"{'requête':<26} {'résultats':>9} {'linéaire (ms)':>14} {'index (ms)':>11} {'gain':>8}")
+    for label, criteria in QUERIES:
+        start = time.perf_counter()
+        expected = linear(table, criteria)
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        found = index.query(**criteria)
+        index_time = time.perf_counter() - start
+
+        same = [f.relative_path for f in expected] == [f.relative_path for f in found]
+        flag = "" if same else "  ❌ résultats différents"
+        print(f"{label:<26} {len(found):>9} {scan_time * 1000:>14.1f} {index_time * 1000:>11.2f} "
+              f"{scan_time / index_time:>7.0f}x{flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark mémoire : liste de FileInfo contre FileTable en colonnes
+
+Les enregistrements sont synthétiques (aucun fichier n'est créé) : on simule une
+arborescence de N fichiers répartis sur N/50 dossiers. L'ancien FileInfo
+(dataclass à 14 champs, tailles et dates pré-formatées) est reproduit ici pour
+servir de référence.
+
+Usage:
+    python benchmarks/bench_file_table.py            # 1 000 000 fichiers
+    python benchmarks/bench_file_table.py 200000
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper.core.scanner import FileInfo, FolderScanner
+from analyst_helper.core.table import FileTable
+
+ROOT = "/data/affaire"
+EXTENSIONS = ['.pdf', '.msg', '.docx', '.xlsx', '.jpg', '.dwg', '.txt', '.zip']
+
+
+@dataclass
+class LegacyFileInfo:
+    """Ancien FileInfo (dataclass avec __dict__), pour comparaison"""
+    name: str
+    path: str
+    relative_path: str
+    extension: str
+    size_bytes: int
+    size_kb: float
+    size_mb: float
+    created_date: str
+    modified_date: str
+    file_type: str
+    depth: int
+    parent_folder: str
+    is_email: bool = False
+    email_source: Optional[str] = None
+
+
+def synthetic_records(count: int):
+    """Génère les valeurs brutes d'une arborescence synthétique"""
+    classify = FolderScanner(ROOT)._classify_file
+    for i in range(count):
+        folder = f"dossier_{i // 5000}/sous_dossier_{i // 50}"
+        extension = EXTENSIONS[i % len(EXTENSIONS)]
+        name = f"document_{i}{extension}"
+        yield (name, f"{ROOT}/{folder}/{name}", f"{folder}/{name}", extension,
+               (i * 7919) % 50_000_000, 1.6e9 + i, 1.7e9 + i, classify(extension),
+               2, f"sous_dossier_{i // 50}", extension == '.msg')
+
+
+def build_legacy(count: int):
+    files = []
+    for (name, path, rel, ext, size, ctime, mtime, ftype, depth, parent, email) in synthetic_records(count):
+        files.append(LegacyFileInfo(
+            name, path, rel, ext, size, round(size / 1024, 2), round(size / (1024 * 1024), 2),
+            datetime.fromtimestamp(ctime).strftime('%Y-%m-%d %H:%M:%S'),
+            datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S'),
+            ftype, depth, parent, email
+        ))
+    return files
+
+
+def build_slots(count: int):
+    return [FileInfo(*values) for values in synthetic_records(count)]
+
+
+def build_table(count: int):
+    # Les FileInfo ne vivent que le temps de leur ajout : la table est alimentée en flux
+    return FileTable.from_files((FileInfo(*values) for values in synthetic_records(count)), ROOT)
+
+
+def measure(label: str, builder, count: int, reference: Optional[int] = None) -> int:
+    """Mesure la mémoire retenue par la structure construite"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = builder(count)
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ratio = f"{reference / current:>6.1f}x" if reference else "   réf."
+    print(f"{label:<28} {current / 1e6:>10.1f} MB {current / count:>8.0f} o/fichier "
+          f"{ratio} {elapsed:>7.2f} s")
+    del result
+    gc.collect()
+    return current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Arborescence synthétique de {count} fichiers\n")
+    print(f"{'structure':<28} {'mémoire':>13} {'':>19} {'gain':>6} {'durée':>9}")
+
+    reference = measure("liste de dataclass (1.0)", build_legacy, count)
+    measure("liste de FileInfo __slots__", build_slots, count, reference)
+    measure("FileTable (colonnes)", build_table, count, reference)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark des filtres de sélection : durée de scan selon la proportion de fichiers retenus
+
+Compare un scan complet suivi d'un filtrage, et un scan avec filters= où les
+fichiers rejetés sont écartés sur leur nom (sans stat() ni FileInfo). La durée
+du second dépend surtout du nombre de fichiers retenus ; seule la lecture des
+dossiers (scandir) reste proportionnelle à la taille de l'arborescence.
+
+Usage:
+    python benchmarks/bench_filters.py                 # arborescence synthétique
+    python benchmarks/bench_filters.py /chemin/dossier # dossier réel (filtre .msg/.eml)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper import FolderScanner, ScanFilter
+
+# Proportion de courriels dans chaque arborescence synthétique
+MATCH_RATIOS = (0.001, 0.01, 0.1, 0.5)
+
+
+def build_tree(root: Path, ratio: float, folders: int = 100, files_per_folder: int = 200):
+    """Crée une arborescence dont une proportion `ratio` des fichiers sont des courriels"""
+    period = max(1, round(1 / ratio))
+    count = 0
+    for d in range(folders):
+        folder = root / f"dossier_{d}"
+        folder.mkdir()
+        for i in range(files_per_folder):
+            extension = ".msg" if count % period == 0 else ".pdf"
+            (folder / f"fichier_{i}{extension}").write_bytes(b"")
+            count += 1
+
+
+def bare_walk(root: str) -> int:
+    """Parcours minimal (scandir seul) : coût incompressible de l'arborescence"""
+    count = 0
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    count += 1
+    return count
+
+
+def run(root: str, spec: ScanFilter, label: str = ""):
+    """Mesure les deux stratégies sur un dossier"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        total = bare_walk(root)
+        walk = time.perf_counter() - start
+
+        start = time.perf_counter()
+        files = FolderScanner(root).scan()
+        kept = [f for f in files if spec.match(f)]
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        filtered = FolderScanner(root).scan(filters=spec)
+        pushed = time.perf_counter() - start
+
+    if sorted(f.path for f in kept) != sorted(f.path for f in filtered):
+        print("❌ Résultats différents entre les deux stratégies")
+
+    print(f"{label:<10} {total:>9} {len(filtered):>9} {walk:>11.3f} {full:>11.3f} "
+          f"{pushed:>11.3f} {full / pushed:>7.1f}x")
+
+
+def header():
+    print(f"{'proportion':<10} {'fichiers':>9} {'retenus':>9} {'scandir (s)':>11} "
+          f"{'filtre (s)':>11} {'filters= (s)':>11} {'gain':>8}")
+
+
+def main():
+    spec = ScanFilter(extensions=['.msg', '.eml'])
+    if len(sys.argv) > 1:
+        header()
+        run(sys.argv[1], spec, "réel")
+        return
+
+    print("Filtre : extensions .msg/.eml ; 'filtre' = scan complet puis filtrage")
+    header()
+    for ratio in MATCH_RATIOS:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            build_tree(Path(tmpdir), ratio)
+            run(tmpdir, spec, f"{ratio:.1%}")
+
+
+if __name__ == "__main__":
+    main()
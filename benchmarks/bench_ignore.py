@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark des règles d'exclusion : durée de scan d'une arborescence majoritairement exclue
+
+Compare un scan complet suivi d'un filtrage, et un scan avec élagage des
+dossiers exclus (node_modules/, .git/, build/...) qui ne sont jamais lus.
+
+Usage:
+    python benchmarks/bench_ignore.py                 # arborescence synthétique
+    python benchmarks/bench_ignore.py /chemin/projet  # dossier réel
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper import FolderScanner, IgnoreRules
+
+RULES = ["node_modules/", ".git/", "build/", "*.pyc", "!important.pyc"]
+
+
+def build_tree(root: Path, projects: int = 4, packages: int = 60, files_per_package: int = 40):
+    """Crée des projets dont l'essentiel du volume est dans node_modules et .git"""
+    for p in range(projects):
+        project = root / f"projet_{p}"
+        (project / "src").mkdir(parents=True)
+        for i in range(20):
+            (project / "src" / f"module_{i}.py").write_text("x")
+        for excluded in ("node_modules", ".git/objects"):
+            for k in range(packages):
+                package = project / excluded / f"paquet_{k}"
+                package.mkdir(parents=True)
+                for i in range(files_per_package):
+                    (package / f"f_{i}.js").write_text("x")
+
+
+def is_excluded(rules: IgnoreRules, rel_path: str) -> bool:
+    """Filtrage après coup : un fichier est exclu si lui-même ou un de ses dossiers l'est"""
+    parts = rel_path.replace('\\', '/').split('/')
+    for i in range(1, len(parts)):
+        if rules.match('/'.join(parts[:i]), is_dir=True):
+            return True
+    return bool(rules.match(rel_path, is_dir=False))
+
+
+def run(root: str):
+    """Mesure les deux stratégies"""
+    import contextlib
+    import io
+
+    rules = IgnoreRules(RULES)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        files = FolderScanner(root).scan()
+        kept = [f for f in files if not is_excluded(rules, f.relative_path)]
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pruned_files = FolderScanner(root).scan(ignore=rules)
+        pruned = time.perf_counter() - start
+
+    if sorted(f.path for f in kept) != sorted(f.path for f in pruned_files):
+        print("❌ Résultats différents entre les deux stratégies")
+
+    print(f"Règles : {', '.join(RULES)}")
+    print(f"{'stratégie':<22} {'fichiers lus':>12} {'conservés':>10} {'durée (s)':>10}")
+    print(f"{'scan puis filtrage':<22} {len(files):>12} {len(kept):>10} {full:>10.3f}")
+    print(f"{'élagage':<22} {len(pruned_files):>12} {len(pruned_files):>10} {pruned:>10.3f}")
+    print(f"Gain : {full / pruned:.1f}x")
+
+
+def main():
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print("Création de l'arborescence synthétique...")
+        build_tree(Path(tmpdir))
+        run(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
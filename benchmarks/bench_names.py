@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'attribution de noms uniques : essais exists() successifs contre registre
+
+L'ancienne méthode essaie nom_1, nom_2... avec un exists() par essai :
+le n-ième homonyme coûte n appels système, soit O(n²) au total pour un
+dossier de fichiers « scan.pdf ». Le registre lit le dossier une fois et
+mémorise le prochain suffixe.
+
+Usage:
+    python benchmarks/bench_names.py              # 5 000 homonymes
+    python benchmarks/bench_names.py 20000
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper import NameRegistry
+
+
+def probe_unique_path(path: Path) -> Path:
+    """Ancienne méthode : essais exists() jusqu'à un nom libre"""
+    if not path.exists():
+        return path
+    counter = 1
+    while True:
+        candidate = path.parent / f"{path.stem}_{counter}{path.suffix}"
+        if not candidate.exists():
+            return candidate
+        counter += 1
+
+
+def run(allocate, folder: Path, count: int) -> float:
+    """Crée count fichiers homonymes et retourne la durée"""
+    folder.mkdir()
+    start = time.perf_counter()
+    for _ in range(count):
+        allocate(folder / "scan.pdf").touch()
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print(f"{'méthode':<12} {'homonymes':>10} {'durée (s)':>10} {'noms/s':>10}")
+        for label, allocate in (("exists()", probe_unique_path),
+                                ("registre", NameRegistry().allocate)):
+            elapsed = run(allocate, Path(tmpdir) / label.strip("()"), count)
+            print(f"{label:<12} {count:>10} {elapsed:>10.2f} {count / elapsed:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark du scan parallèle : débit (fichiers/s) en fonction du nombre de threads
+
+Sur un disque local, le GIL limite le gain : le parallélisme paie surtout
+lorsque chaque os.scandir/stat coûte un aller-retour réseau (NFS/SMB).
+
+Usage:
+    python benchmarks/bench_parallel_scan.py                 # arborescence synthétique
+    python benchmarks/bench_parallel_scan.py /mnt/partage    # dossier réel (NFS/SMB)
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper import FolderScanner
+
+WORKER_COUNTS = [1, 2, 4, 8, 16]
+
+
+def build_tree(root: Path, branches: int = 8, depth: int = 3, files_per_dir: int = 40):
+    """Crée une arborescence synthétique de test"""
+    def _build(directory: Path, level: int):
+        for i in range(files_per_dir):
+            (directory / f"fichier_{i}.pdf").write_bytes(b"x" * (i * 10))
+        if level < depth:
+            for b in range(branches):
+                sub = directory / f"dossier_{b}"
+                sub.mkdir()
+                _build(sub, level + 1)
+
+    _build(root, 0)
+
+
+def run(root: str):
+    """Mesure le débit pour chaque nombre de threads"""
+    import contextlib
+    import io
+
+    print(f"{'threads':>8} {'fichiers':>10} {'durée (s)':>10} {'fichiers/s':>12} {'speedup':>8}")
+    baseline = None
+    reference = None
+
+    for workers in WORKER_COUNTS:
+        scanner = FolderScanner(root)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            files = scanner.scan(workers=workers)
+            elapsed = time.perf_counter() - start
+
+        paths = [f.path for f in files]
+        if reference is None:
+            reference = paths
+        elif paths != reference:
+            print(f"❌ Résultat différent avec {workers} threads")
+
+        baseline = baseline or elapsed
+        rate = len(files) / elapsed if elapsed else 0
+        print(f"{workers:>8} {len(files):>10} {elapsed:>10.3f} {rate:>12.0f} {baseline / elapsed:>7.2f}x")
+
+
+def main():
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print("Création de l'arborescence synthétique...")
+        build_tree(Path(tmpdir))
+        run(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
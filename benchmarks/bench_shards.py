@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark du scan en shards : équilibre des shards et durée contre un scan séquentiel
+
+Crée une arborescence volontairement déséquilibrée (un gros sous-arbre et
+beaucoup de petits), puis compare pour chaque shard le nombre d'entrées
+estimé par la planification au nombre réellement scanné. Le gain de durée
+dépend du nombre de CPU et du stockage (disques, montages réseau distincts).
+
+Usage:
+    python benchmarks/bench_shards.py                 # 4 shards, 20 000 fichiers
+    python benchmarks/bench_shards.py 8 100000
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper import FolderScanner
+from analyst_helper.core.shards import plan_shards, scan_sharded
+
+
+def build_tree(root: Path, count: int):
+    """Moitié des fichiers dans un seul sous-arbre profond, le reste dans de petits dossiers"""
+    for i in range(count):
+        if i % 2:
+            folder = root / "archives" / f"annee_{i % 7}" / f"mois_{i % 12}" / f"jour_{i % 28}"
+        else:
+            folder = root / f"projet_{i % 200}" / f"lot_{i % 3}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"doc_{i}.pdf").write_bytes(b"")
+
+
+def main():
+    shards = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / "racine"
+        build_tree(root, count)
+
+        start = time.perf_counter()
+        plan = plan_shards([root], shards, seed=0)
+        planning = time.perf_counter() - start
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            FolderScanner(str(root)).scan()
+            sequential = time.perf_counter() - start
+
+            start = time.perf_counter()
+            merged = scan_sharded([root], shards, processes=os.cpu_count())
+            sharded = time.perf_counter() - start
+
+        print(f"Fichiers : {count:,}  CPU : {os.cpu_count()}  planification : {planning * 1000:.0f} ms")
+        print(f"{'shard':<6} {'unités':>7} {'estimé':>8} {'réel':>8}")
+        for shard in plan:
+            scanner = FolderScanner(str(root))
+            with contextlib.redirect_stdout(io.StringIO()):
+                scanner.scan_shard(shard)
+            actual = scanner.stats['total_files'] + scanner.stats['total_folders']
+            print(f"{shard.index:<6} {len(shard.units):>7} {shard.estimated_entries:>8} {actual:>8}")
+        print(f"\nScan séquentiel : {sequential:.2f} s   scan en {shards} shards : {sharded:.2f} s "
+              f"({len(merged.files):,} fichiers)")
+
+
+if __name__ == "__main__":
+    main()
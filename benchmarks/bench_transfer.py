@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark des méthodes de transfert : clone, copy_file_range, sendfile, tampon, shutil.copy2
+
+Chaque méthode copie les mêmes fichiers (forcée seule, sans repli) ; une
+méthode refusée par le système de fichiers est signalée. Le premier
+argument choisit le dossier de test, pour comparer des systèmes de
+fichiers (Btrfs/XFS pour le clone, montage réseau...).
+
+Usage:
+    python benchmarks/bench_transfer.py                   # dossier temporaire, 4 x 256 Mo
+    python benchmarks/bench_transfer.py /mnt/btrfs 4 1024
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analyst_helper.core.transfer import FileTransfer, available_methods
+
+CHUNK = 16 * 1024 * 1024
+
+
+def make_files(folder: Path, count: int, size_mb: int):
+    """count fichiers aléatoires de size_mb Mo"""
+    chunk = os.urandom(CHUNK)
+    paths = []
+    for i in range(count):
+        path = folder / f"source_{i}.bin"
+        with open(path, 'wb') as f:
+            remaining = size_mb * 1024 * 1024
+            while remaining > 0:
+                f.write(chunk[:remaining])
+                remaining -= CHUNK
+        paths.append(path)
+    return paths
+
+
+def measure(copy, paths, output: Path) -> float:
+    """Durée de la copie de tous les fichiers"""
+    output.mkdir()
+    start = time.perf_counter()
+    for path in paths:
+        copy(str(path), str(output / path.name))
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(output)
+    return elapsed
+
+
+def main():
+    base = sys.argv[1] if len(sys.argv) > 1 else None
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    size_mb = int(sys.argv[3]) if len(sys.argv) > 3 else 256
+
+    with tempfile.TemporaryDirectory(dir=base) as tmpdir:
+        paths = make_files(Path(tmpdir), count, size_mb)
+        total_mb = count * size_mb
+
+        automatic = FileTransfer()
+        automatic.copy(str(paths[0]), os.path.join(tmpdir, "essai.bin"))
+        print(f"Dossier : {tmpdir}  ({count} x {size_mb} Mo)")
+        print(f"Méthode retenue automatiquement : {automatic.method_for(str(paths[0]), tmpdir)}\n")
+
+        print(f"{'méthode':<18} {'durée (s)':>10} {'Mo/s':>10}")
+        candidates = [(method, FileTransfer([method]).copy) for method in available_methods()]
+        candidates.append(('shutil.copy2', shutil.copy2))
+        for label, copy in candidates:
+            try:
+                elapsed = measure(copy, paths, Path(tmpdir) / "sortie")
+            except OSError as e:
+                shutil.rmtree(Path(tmpdir) / "sortie", ignore_errors=True)
+                print(f"{label:<18} {'refusée':>10}  ({e.strerror})")
+                continue
+            print(f"{label:<18} {elapsed:>10.2f} {total_mb / elapsed:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
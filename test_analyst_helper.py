@@ -5,6 +5,7 @@ Tests rapides pour vérifier que AnalystHelper fonctionne
 
 import os
 import tempfile
+import time
 from pathlib import Path
 
 
@@ -125,6 +126,1195 @@ def test_extractor():
         return False
 
 
+def test_parallel_scan():
+    """Test 6 : Scan parallèle identique au scan séquentiel"""
+    print("\nTest 6 : Scan parallèle...")
+    try:
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for folder in ["a", "a/b", "a/b/c", "d"]:
+                (Path(tmpdir) / folder).mkdir()
+                for i in range(3):
+                    (Path(tmpdir) / folder / f"f{i}.pdf").write_text("test" * i)
+
+            serial = FolderScanner(tmpdir)
+            parallel = FolderScanner(tmpdir)
+            serial_files = serial.scan()
+            parallel_files = parallel.scan(workers=4)
+
+            # Consommateur lent : les threads n'ont que max_buffered listings d'avance
+            from analyst_helper.core.walker import ParallelWalker
+            wide = Path(tmpdir) / "wide"
+            for i in range(40):
+                (wide / f"s{i:02d}").mkdir(parents=True)
+            buffered = []
+
+            def read(directory, depth):
+                buffered.append(len(walker._results))
+                return sorted(directory.iterdir())
+
+            walker = ParallelWalker(read, workers=4, max_buffered=2)
+            walked = []
+            for is_dir, item in walker.walk(wide):
+                walked.append(item)
+                time.sleep(0.002)
+
+            if [f.path for f in serial_files] == [f.path for f in parallel_files] \
+                    and serial.stats == parallel.stats \
+                    and walked == sorted(wide.iterdir()) and max(buffered) <= 2 + 4:
+                print(f"   ✅ Scan parallèle OK - {len(parallel_files)} fichiers")
+                return True
+            else:
+                print("   ❌ Scan parallèle : résultat différent du scan séquentiel")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur scan parallèle : {e}")
+        return False
+
+
+def test_iter_scan():
+    """Test 7 : Scan en flux"""
+    print("\nTest 7 : Scan en flux (iter_scan)...")
+    try:
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as outdir:
+            (Path(tmpdir) / "sub").mkdir()
+            for name in ["a.pdf", "b.msg", "sub/c.txt"]:
+                (Path(tmpdir) / name).write_text("test")
+
+            reference = FolderScanner(tmpdir)
+            reference.scan()
+
+            scanner = FolderScanner(tmpdir)
+            csv_path = Path(outdir) / "export.csv"
+            scanner.export_to_csv(str(csv_path), files=scanner.iter_scan())
+            batches = list(FolderScanner(tmpdir).iter_scan(batch_size=2))
+
+            lines = csv_path.read_text(encoding='utf-8-sig').strip().splitlines()
+            if len(lines) == 4 and scanner.stats == reference.stats and not scanner.files \
+                    and [len(b) for b in batches] == [2, 1]:
+                print(f"   ✅ iter_scan OK - {scanner.stats['total_files']} fichiers en flux")
+                return True
+            else:
+                print("   ❌ iter_scan : export ou statistiques incorrects")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur iter_scan : {e}")
+        return False
+
+
+def test_rescan():
+    """Test 8 : Rescan incrémental avec manifeste"""
+    print("\nTest 8 : Rescan incrémental...")
+    try:
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as outdir:
+            (Path(tmpdir) / "sub").mkdir()
+            for name in ["a.pdf", "sub/b.txt", "sub/c.txt"]:
+                (Path(tmpdir) / name).write_text("test")
+
+            manifest = str(Path(outdir) / "manifest.bin")
+            first = FolderScanner(tmpdir).rescan(manifest)
+            unchanged = FolderScanner(tmpdir).rescan(manifest)
+
+            (Path(tmpdir) / "sub" / "c.txt").unlink()
+            (Path(tmpdir) / "d.msg").write_text("test")
+            changed = FolderScanner(tmpdir).rescan(manifest)
+
+            if len(first.added) == 3 and not (unchanged.added or unchanged.removed) \
+                    and len(unchanged.files) == 3 \
+                    and changed.added == {"d.msg"} and changed.removed == {os.path.join("sub", "c.txt")}:
+                print(f"   ✅ Rescan OK - {len(changed.files)} fichiers, 1 ajouté, 1 supprimé")
+                return True
+            else:
+                print("   ❌ Rescan : changements détectés incorrects")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur rescan : {e}")
+        return False
+
+
+def test_duplicates():
+    """Test 9 : Détection de doublons"""
+    print("\nTest 9 : Détection de doublons...")
+    try:
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            big = b"A" * 300000
+            (Path(tmpdir) / "a.pdf").write_bytes(big)
+            (Path(tmpdir) / "b.pdf").write_bytes(big)
+            # Même taille, même début et même fin, mais contenu différent au milieu
+            (Path(tmpdir) / "c.pdf").write_bytes(big[:150000] + b"B" + big[150001:])
+            (Path(tmpdir) / "d.txt").write_text("unique")
+            # Liens physiques : même fichier, aucun espace récupérable
+            os.link(Path(tmpdir) / "a.pdf", Path(tmpdir) / "e.pdf")
+            (Path(tmpdir) / "f.dwg").write_bytes(b"F" * 5000)
+            os.link(Path(tmpdir) / "f.dwg", Path(tmpdir) / "g.dwg")
+
+            scanner = FolderScanner(tmpdir)
+            scanner.scan()
+            groups = scanner.find_duplicates(workers=1)
+
+            names = [sorted(f.name for f in group) for group in groups]
+            if names == [["a.pdf", "b.pdf", "e.pdf"]] and scanner.stats['wasted_bytes'] == len(big) \
+                    and all(f.content_hash for f in groups[0]):
+                print(f"   ✅ Doublons OK - {scanner.stats['wasted_bytes']} octets récupérables")
+                return True
+            else:
+                print(f"   ❌ Doublons : groupes incorrects {names}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur doublons : {e}")
+        return False
+
+
+def test_file_table():
+    """Test 10 : Table en colonnes"""
+    print("\nTest 10 : Table en colonnes (FileTable)...")
+    try:
+        from analyst_helper import FolderScanner, HTMLReporter
+
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as outdir:
+            (Path(tmpdir) / "sub").mkdir()
+            for name in ["a.pdf", "b.msg", "sub/c.txt"]:
+                (Path(tmpdir) / name).write_text("test")
+
+            files = FolderScanner(tmpdir).scan()
+            scanner = FolderScanner(tmpdir)
+            table = scanner.scan_table()
+
+            report_path = Path(outdir) / "report.html"
+            HTMLReporter(str(report_path)).generate_report(files=table)
+
+            if [row.to_dict() for row in table] == [f.to_dict() for f in files] \
+                    and table.count_by('extension') == {'.pdf': 1, '.msg': 1, '.txt': 1} \
+                    and report_path.exists():
+                print(f"   ✅ FileTable OK - {len(table)} lignes")
+                return True
+            else:
+                print("   ❌ FileTable : lignes différentes des FileInfo")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur FileTable : {e}")
+        return False
+
+
+def test_stream_exporters():
+    """Test 11 : Exports en flux compressés"""
+    print("\nTest 11 : Exports en flux (NDJSON/JSON/CSV)...")
+    try:
+        import gzip
+        import json
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as outdir:
+            for name in ["a.pdf", "b.msg"]:
+                (Path(tmpdir) / name).write_text("test")
+
+            scanner = FolderScanner(tmpdir)
+            scanner.scan()
+            scanner.export_to_json(str(Path(outdir) / "ref.json"))
+            scanner.export_stream(str(Path(outdir) / "files.json"))
+            scanner.export_stream(str(Path(outdir) / "files.ndjson.gz"))
+
+            reference = json.loads((Path(outdir) / "ref.json").read_text(encoding='utf-8'))
+            streamed = json.loads((Path(outdir) / "files.json").read_text(encoding='utf-8'))
+            with gzip.open(Path(outdir) / "files.ndjson.gz", 'rt', encoding='utf-8') as f:
+                rows = [json.loads(line) for line in f]
+
+            if streamed['files'] == reference['files'] == rows and streamed['stats'] == reference['stats']:
+                print(f"   ✅ Exports en flux OK - {len(rows)} lignes")
+                return True
+            else:
+                print("   ❌ Exports en flux : contenu différent de export_to_json")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur exports en flux : {e}")
+        return False
+
+
+def test_snapshot():
+    """Test 12 : Snapshot binaire"""
+    print("\nTest 12 : Snapshot binaire (mmap)...")
+    try:
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as outdir:
+            (Path(tmpdir) / "sub").mkdir()
+            for name in ["a.pdf", "b.msg", "sub/é c.txt"]:
+                (Path(tmpdir) / name).write_text("test")
+
+            scanner = FolderScanner(tmpdir)
+            scanner.scan()
+            snapshot_path = str(Path(outdir) / "scan.snap")
+            scanner.save_snapshot(snapshot_path)
+            loaded = FolderScanner.load_snapshot(snapshot_path)
+            same = [f.to_dict() for f in loaded.files] == [f.to_dict() for f in scanner.files] \
+                and loaded.stats == scanner.stats
+
+            # Doublons sur le snapshot : empreintes écrites en mémoire
+            groups = loaded.find_duplicates(workers=1)
+            hashes_ok = len(groups) == 1 and len(groups[0]) == 3 \
+                and all(f.content_hash for f in loaded.files)
+            reloaded = FolderScanner.load_snapshot(snapshot_path)
+            untouched = all(f.content_hash is None for f in reloaded.files)
+
+            if same and hashes_ok and untouched:
+                print(f"   ✅ Snapshot OK - {len(loaded.files)} fichiers rechargés")
+                return True
+            else:
+                print(f"   ❌ Snapshot : contenu={same}, doublons={hashes_ok}, fichier={untouched}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur snapshot : {e}")
+        return False
+
+
+def test_directory_index():
+    """Test 13 : Index des dossiers"""
+    print("\nTest 13 : Index des dossiers...")
+    try:
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "a" / "b").mkdir(parents=True)
+            (Path(tmpdir) / "c").mkdir()
+            (Path(tmpdir) / "a" / "x.pdf").write_bytes(b"1" * 100)
+            (Path(tmpdir) / "a" / "b" / "y.pdf").write_bytes(b"1" * 300)
+            (Path(tmpdir) / "c" / "z.pdf").write_bytes(b"1" * 50)
+
+            scanner = FolderScanner(tmpdir)
+            scanner.scan()
+            index = scanner.get_directory_index()
+            node = index.node("a")
+            top = scanner.top_folders(1)
+
+            if (node.recursive_files, node.recursive_bytes, node.file_count) == (2, 400, 1) \
+                    and index.root.recursive_bytes == 450 and top[0].rel_path == "" \
+                    and "y.pdf" in scanner.get_tree_structure():
+                print(f"   ✅ Index des dossiers OK - {len(index.nodes)} dossiers")
+                return True
+            else:
+                print("   ❌ Index des dossiers : totaux incorrects")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur index des dossiers : {e}")
+        return False
+
+
+def test_ignore_rules():
+    """Test 14 : Règles d'exclusion (gitignore)"""
+    print("\nTest 14 : Règles d'exclusion...")
+    try:
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "node_modules" / "pkg").mkdir(parents=True)
+            (root / "docs" / "brouillons").mkdir(parents=True)
+            (root / "node_modules" / "pkg" / "index.js").write_text("x")
+            (root / "docs" / "brouillons" / "v1.docx").write_text("x")
+            (root / "docs" / "rapport.pdf").write_text("x")
+            (root / "docs" / "debug.log").write_text("x")
+            (root / "docs" / "garder.log").write_text("x")
+            (root / "docs" / ".analystignore").write_text("*.tmp\n")
+            (root / "docs" / "cache.tmp").write_text("x")
+            (root / "cache.tmp").write_text("x")
+
+            scanner = FolderScanner(tmpdir)
+            files = scanner.scan(ignore=["node_modules/", "*.log", "!garder.log",
+                                         "docs/**/brouillons", ".analystignore"],
+                                 ignore_files=True)
+            names = sorted(f.name for f in files)
+
+            if names == ["cache.tmp", "garder.log", "rapport.pdf"] \
+                    and scanner.stats['total_folders'] == 1:
+                print(f"   ✅ Règles d'exclusion OK - {len(files)} fichiers conservés")
+                return True
+            else:
+                print(f"   ❌ Règles d'exclusion : fichiers inattendus {names}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur règles d'exclusion : {e}")
+        return False
+
+
+def test_content_sniffing():
+    """Test 15 : Détection du type par le contenu"""
+    print("\nTest 15 : Détection du type par le contenu...")
+    try:
+        import struct
+        import zipfile
+        from analyst_helper import FolderScanner, FileClassifier
+
+        # Conteneur OLE2 minimal : en-tête + secteur de répertoire d'un .msg
+        header = bytearray(512)
+        header[:8] = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+        struct.pack_into('<H', header, 30, 9)
+        directory = bytearray()
+        for name in ('Root Entry', '__substg1.0_0037001F'):
+            entry = bytearray(128)
+            raw = name.encode('utf-16-le')
+            entry[:len(raw)] = raw
+            struct.pack_into('<H', entry, 64, len(raw) + 2)
+            directory += entry
+
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as outdir:
+            root = Path(tmpdir)
+            (root / "rapport").write_bytes(b"%PDF-1.7\n")
+            (root / "courrier.tmp").write_bytes(bytes(header + directory))
+            (root / "photo.dat").write_bytes(b"\x89PNG\r\n\x1a\n" + b"\0" * 16)
+            with zipfile.ZipFile(root / "tableau.bin", "w") as archive:
+                archive.writestr("[Content_Types].xml", "<Types/>")
+                archive.writestr("xl/workbook.xml", "<workbook/>")
+
+            manifest = str(Path(outdir) / "manifest.pkl")
+            scanner = FolderScanner(tmpdir)
+            files = {f.name: f for f in scanner.rescan(manifest, sniff_content=True).files}
+            rescanner = FolderScanner(tmpdir)
+            rescanner.rescan(manifest, sniff_content=True)
+
+            classifier = FileClassifier(str(Path(outdir) / "classement"))
+            category = classifier.classify_file(files["tableau.bin"], copy=False)
+
+            types = {name: f.content_type for name, f in files.items()}
+            if types == {"rapport": ".pdf", "courrier.tmp": ".msg", "photo.dat": ".png",
+                         "tableau.bin": ".xlsx"} \
+                    and files["courrier.tmp"].is_email and files["photo.dat"].file_type == "Image" \
+                    and category == "Dossier technique" \
+                    and rescanner.sniffer.stats['sniffed'] == 0:
+                print(f"   ✅ Détection du type OK - {len(files)} fichiers reconnus")
+                return True
+            else:
+                print(f"   ❌ Détection du type : résultats inattendus {types}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur détection du type : {e}")
+        return False
+
+
+def test_archive_listing():
+    """Test 16 : Contenu des archives"""
+    print("\nTest 16 : Contenu des archives...")
+    try:
+        import io
+        import tarfile
+        import zipfile
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            inner = io.BytesIO()
+            with zipfile.ZipFile(inner, "w") as archive:
+                archive.writestr("plans/plan.pdf", b"x" * 100)
+            with zipfile.ZipFile(root / "lot.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr("mails/a.msg", b"y" * 50)
+                archive.writestr("inner.zip", inner.getvalue())
+            with tarfile.open(root / "photos.tar", "w") as archive:
+                info = tarfile.TarInfo("img.png")
+                info.size = 30
+                archive.addfile(info, io.BytesIO(b"p" * 30))
+
+            scanner = FolderScanner(tmpdir)
+            files = scanner.scan(archive_depth=2)
+            virtual = {f.relative_path.replace(os.sep, "/"): f for f in files if f.is_virtual}
+            nested = virtual.get("lot.zip/inner.zip/plans/plan.pdf")
+
+            shallow = FolderScanner(tmpdir)
+            shallow.scan(archive_depth=1)
+
+            if len(virtual) == 4 and nested is not None and nested.depth == 3 \
+                    and nested.parent_folder == "plans" and nested.size_bytes == 100 \
+                    and virtual["lot.zip/mails/a.msg"].is_email \
+                    and scanner.stats['total_files'] == 2 \
+                    and shallow.stats['archive_members'] == 3:
+                print(f"   ✅ Contenu des archives OK - {len(virtual)} membres listés")
+                return True
+            else:
+                print(f"   ❌ Contenu des archives : membres inattendus {sorted(virtual)}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur contenu des archives : {e}")
+        return False
+
+
+def test_watch():
+    """Test 17 : Surveillance en continu"""
+    print("\nTest 17 : Surveillance en continu...")
+    try:
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "dossier").mkdir()
+            (root / "dossier" / "a.pdf").write_text("a")
+            (root / "b.msg").write_text("b")
+
+            scanner = FolderScanner(tmpdir)
+            batches = []
+            with scanner.watch(callback=batches.append, background=False, debounce=0.1) as watcher:
+                for i in range(20):
+                    (root / "dossier" / f"nouveau_{i}.pdf").write_text("x" * i)
+                (root / "b.msg").unlink()
+                batch = watcher.poll(timeout=5)
+
+                # Modification sur place : le rescan (débordement, sans inotify)
+                # ne doit pas rejouer une taille périmée du manifeste
+                (root / "dossier" / "a.pdf").write_text("a" * 20)
+                grown = watcher.poll(timeout=5)
+                with watcher.lock:
+                    watcher._overflow = True
+                    overflow = watcher._rescan()
+                size_after_overflow = watcher._index["dossier/a.pdf"].size_bytes
+
+                watcher._inotify.close()
+                watcher._inotify = None
+                with open(root / "dossier" / "a.pdf", "a") as f:
+                    f.write("a" * 10)
+                polled = watcher.poll(timeout=0)
+                size_after_poll = watcher._index["dossier/a.pdf"].size_bytes
+
+            rescans_ok = grown is not None and grown.modified == {"dossier/a.pdf"} \
+                and not overflow and size_after_overflow == 20 \
+                and polled is not None and polled.modified == {"dossier/a.pdf"} \
+                and size_after_poll == 30
+            emails = scanner.stats['total_emails']
+            if batch is not None and len(batch.added) == 20 and batch.removed == {"b.msg"} \
+                    and batches[0] == batch and scanner.stats['total_files'] == 21 \
+                    and len(scanner.files) == 21 and emails == 0 and rescans_ok:
+                print(f"   ✅ Surveillance OK - {len(batch.added)} ajouts appliqués en un lot")
+                return True
+            else:
+                print(f"   ❌ Surveillance : lot inattendu {batch} (rescans={rescans_ok})")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur surveillance : {e}")
+        return False
+
+
+def test_profiler():
+    """Test 18 : Profilage du scan"""
+    print("\nTest 18 : Profilage du scan...")
+    try:
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(3):
+                folder = Path(tmpdir) / f"dossier_{i}"
+                folder.mkdir()
+                for j in range(10):
+                    (folder / f"fichier_{j}.pdf").write_text("x")
+
+            scanner = FolderScanner(tmpdir)
+            scanner.scan(profile=True)
+            profiler = scanner.profiler
+            slowest = profiler.slowest_directories(1)
+            report = profiler.report()
+
+            # Sans profilage, les méthodes d'origine sont rétablies
+            scanner.scan()
+            restored = "_create_file_info" not in vars(scanner) and scanner.profiler is None
+
+            # 30 fichiers + 4 dossiers (détection des boucles)
+            if profiler.files == 30 and profiler.syscalls['stat'] == 34 \
+                    and profiler.directories == 4 and sum(profiler.histogram.values()) == 4 \
+                    and len(slowest) == 1 and "Dossiers les plus lents" in report and restored:
+                print(f"   ✅ Profilage OK - {profiler.directories} dossiers mesurés")
+                return True
+            else:
+                print(f"   ❌ Profilage : mesures inattendues {profiler.to_dict()}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur profilage : {e}")
+        return False
+
+
+def test_light_scan():
+    """Test 19 : Scan léger (sans stat)"""
+    print("\nTest 19 : Scan léger...")
+    try:
+        from analyst_helper import FolderScanner, LazyFileInfo
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(3):
+                folder = Path(tmpdir) / f"dossier_{i}"
+                folder.mkdir()
+                for j in range(5):
+                    (folder / f"fichier_{j}.pdf").write_text("x" * (j + 1))
+
+            full = FolderScanner(tmpdir).scan()
+            scanner = FolderScanner(tmpdir)
+            light = scanner.scan(light=True, profile=True)
+
+            same_listing = sorted(f.relative_path for f in full) == sorted(f.relative_path for f in light)
+            unloaded = all(isinstance(f, LazyFileInfo) and not f.stat_loaded for f in light)
+            # Un stat() par dossier (détection des boucles), aucun par fichier
+            no_stat = scanner.profiler.syscalls['stat'] == 4
+
+            # La taille est lue à la demande, une seule fois
+            sizes = {f.relative_path: f.size_bytes for f in full}
+            lazy_ok = all(f.size_bytes == sizes[f.relative_path] and f.stat_loaded for f in light)
+
+            if same_listing and unloaded and no_stat and lazy_ok and scanner.stats['total_files'] == 15:
+                print(f"   ✅ Scan léger OK - {len(light)} fichiers sans stat()")
+                return True
+            else:
+                print(f"   ❌ Scan léger : listing={same_listing} différé={unloaded} "
+                      f"stat={scanner.profiler.syscalls['stat']} tailles={lazy_ok}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur scan léger : {e}")
+        return False
+
+
+def test_scan_filters():
+    """Test 20 : Filtres de sélection pendant le scan"""
+    print("\nTest 20 : Filtres de sélection...")
+    try:
+        from analyst_helper import FolderScanner, ScanFilter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir) / "dossier"
+            folder.mkdir()
+            for j in range(10):
+                (folder / f"rapport_{j}.pdf").write_bytes(b"x" * (j * 100))
+                (folder / f"mail_{j}.msg").write_bytes(b"y" * (j * 100))
+            old = folder / "rapport_9.pdf"
+            os.utime(old, (0, 0))
+
+            scanner = FolderScanner(tmpdir)
+            large_pdfs = scanner.scan(filters={'extensions': ['PDF'], 'min_size': 500},
+                                      profile=True)
+            # Les .msg sont écartés sur leur nom : seuls les .pdf (et les 2 dossiers)
+            # sont lus par stat()
+            stat_calls = scanner.profiler.syscalls['stat'] - 2
+
+            recent = ScanFilter(file_types=['Correspondance'], modified_after='2000-01-01')
+            emails = FolderScanner(tmpdir).scan(filters=recent)
+            recent_pdfs = FolderScanner(tmpdir).scan(
+                filters={'extensions': ['.pdf'], 'modified_after': '2000-01-01'})
+
+            names = sorted(f.name for f in large_pdfs)
+            expected = [f"rapport_{j}.pdf" for j in range(5, 10)]
+            if names == expected and stat_calls == 10 and scanner.stats['total_files'] == 5 \
+                    and len(emails) == 10 and len(recent_pdfs) == 9:
+                print(f"   ✅ Filtres OK - {len(large_pdfs)} fichiers retenus, {stat_calls} stat()")
+                return True
+            else:
+                print(f"   ❌ Filtres : {names}, stat={stat_calls}, "
+                      f"courriels={len(emails)}, récents={len(recent_pdfs)}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur filtres : {e}")
+        return False
+
+
+def test_file_index():
+    """Test 21 : Index de requêtes sur les fichiers scannés"""
+    print("\nTest 21 : Index de requêtes...")
+    try:
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for project in ("Projets/Lot 1", "Projets/Lot 2", "Projets/Lot 2b"):
+                folder = Path(tmpdir) / project
+                folder.mkdir(parents=True)
+                for j in range(5):
+                    (folder / f"plan_{j}.dwg").write_bytes(b"x" * (j * 10))
+                    (folder / f"note_{j}.pdf").write_bytes(b"y" * (j * 100))
+            os.utime(Path(tmpdir) / "Projets/Lot 1/note_4.pdf", (1e9, 1e9))
+
+            scanner = FolderScanner(tmpdir)
+            scanner.scan()
+            index = scanner.build_file_index()
+
+            largest = index.query(order_by='size', descending=True, limit=3)
+            lot2_plans = index.query(extensions=['.dwg'], under='Projets/Lot 2')
+            old = index.query(modified_before='2010-01-01')
+            mid_size = index.count(min_size=100, max_size=300)
+
+            # Même index sur un snapshot rechargé (chaînes dans une StringPool)
+            snapshot_path = os.path.join(tmpdir, "scan.snap")
+            scanner.save_snapshot(snapshot_path)
+            loaded = FolderScanner.load_snapshot(snapshot_path).build_file_index()
+            snapshot_ok = (sorted(f.name for f in loaded.query(extensions=['.dwg'],
+                                                                under='Projets/Lot 2'))
+                           == sorted(f.name for f in lot2_plans)
+                           and [f.name for f in loaded.query(modified_before='2010-01-01')]
+                           == ["note_4.pdf"]
+                           and loaded.count(file_types=[lot2_plans[0].file_type]) == 30
+                           and loaded.count(extensions=[".pdf"], min_size=100) == 12)
+
+            ok = ([f.size_bytes for f in largest] == [400, 400, 400]
+                  and sorted(f.name for f in lot2_plans) == [f"plan_{j}.dwg" for j in range(5)]
+                  and [f.name for f in old] == ["note_4.pdf"]
+                  and mid_size == 9 and len(index) == 30 and snapshot_ok)
+            if ok:
+                print(f"   ✅ Index OK - {len(index)} fichiers indexés")
+                return True
+            else:
+                print(f"   ❌ Index : plus gros={[f.size_bytes for f in largest]}, "
+                      f"lot 2={len(lot2_plans)}, anciens={[f.name for f in old]}, tailles={mid_size}, "
+                      f"snapshot={snapshot_ok}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur index : {e}")
+        return False
+
+
+def test_catalog():
+    """Test 22 : Catalogue SQLite et recherche plein texte"""
+    print("\nTest 22 : Catalogue SQLite...")
+    try:
+        from analyst_helper import FolderScanner, ScanCatalog, HTMLReporter
+        from analyst_helper.core.extractor import AttachmentInfo
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir) / "affaire"
+            (root / "Lot 2").mkdir(parents=True)
+            (root / "Lot 2" / "plan_étage.dwg").write_bytes(b"x" * 10)
+            (root / "devis.pdf").write_bytes(b"x" * 100)
+            db_path = os.path.join(tmpdir, "catalogue.db")
+
+            scanner = FolderScanner(str(root))
+            scanner.scan()
+            scan_id = scanner.save_catalog(db_path)
+
+            attachment = AttachmentInfo("offre.pdf", "offre.pdf", "/sortie/offre.pdf", 1.5,
+                                        "mail.msg", "2024-03-01", "Réunion de chantier",
+                                        "2024-03-02")
+            with ScanCatalog(db_path) as catalog:
+                catalog.add_attachments([attachment], scan_id)
+                plans = catalog.search_files("plan_etage.dwg")
+                subjects = catalog.search_attachments("reunion")
+                attachments = catalog.load_attachments(scan_id)
+
+            # Relecture sans nouveau scan, puis rapport
+            reloaded = FolderScanner.load_catalog(db_path)
+            report_path = os.path.join(tmpdir, "rapport.html")
+            HTMLReporter(report_path).generate_report(reloaded.files, attachments, reloaded.stats)
+
+            same = sorted(f.relative_path for f in reloaded.files) == \
+                sorted(f.relative_path for f in scanner.files)
+            if same and reloaded.stats['total_files'] == 2 and len(plans) == 1 \
+                    and subjects == [attachment] and os.path.exists(report_path):
+                print(f"   ✅ Catalogue OK - scan #{scan_id}, {len(reloaded.files)} fichiers relus")
+                return True
+            else:
+                print(f"   ❌ Catalogue : relu={same}, recherche={len(plans)}, sujets={subjects}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur catalogue : {e}")
+        return False
+
+
+def test_sharded_scan():
+    """Test 23 : Scan en shards et multi-racines"""
+    print("\nTest 23 : Scan en shards...")
+    try:
+        from analyst_helper import FolderScanner, ScanShard
+        from analyst_helper.core.shards import plan_shards, scan_sharded
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir) / "affaire"
+            for lot in range(4):
+                for sub in range(3):
+                    folder = root / f"Lot {lot}" / f"dossier_{sub}"
+                    folder.mkdir(parents=True)
+                    for i in range(lot + 2):
+                        (folder / f"doc_{i}.pdf").write_bytes(b"x" * (i + 1))
+            (root / "lisez-moi.txt").write_text("racine")
+
+            reference = FolderScanner(str(root))
+            reference.scan()
+
+            sharded = FolderScanner(str(root))
+            sharded.scan_sharded(shards=3, processes=2)
+            same = sorted(f.relative_path for f in sharded.files) == \
+                sorted(f.relative_path for f in reference.files)
+            same_stats = all(sharded.stats[key] == reference.stats[key]
+                             for key in ('total_files', 'total_folders', 'by_extension'))
+
+            # Description de shard rechargeable (scan sur une autre machine)
+            plan = plan_shards([root], 3, seed=1)
+            plan[0].save(os.path.join(tmpdir, "shard.json"))
+            reloaded = ScanShard.load(os.path.join(tmpdir, "shard.json"))
+
+            # Deux racines : chemins relatifs au dossier parent commun
+            multi = scan_sharded([root / "Lot 1", root / "Lot 3"], shards=2, processes=1)
+            expected = sum(1 for f in reference.files if f.relative_path.startswith(("Lot 1", "Lot 3")))
+            multi_ok = len(multi.files) == expected and \
+                all(f.relative_path.startswith(("Lot 1", "Lot 3")) for f in multi.files)
+
+            # Lien physique dont les deux noms tombent dans des shards différents
+            linked = Path(tmpdir) / "liens"
+            for d in range(4):
+                (linked / f"d{d}").mkdir(parents=True)
+                for i in range(3):
+                    (linked / f"d{d}" / f"f{i}.pdf").write_bytes(b"x" * 100 * 1024)
+            os.link(linked / "d0" / "f0.pdf", linked / "d3" / "lien.pdf")
+            serial = FolderScanner(str(linked))
+            serial.scan()
+            linked_sharded = FolderScanner(str(linked))
+            linked_sharded.scan_sharded(shards=4, processes=1)
+            links_ok = all(round(serial.stats[key], 2) == linked_sharded.stats[key]
+                           for key in ('total_size_mb', 'unique_size_mb'))
+
+            if same and same_stats and reloaded == plan[0] and multi_ok and links_ok:
+                print(f"   ✅ Shards OK - {len(sharded.files)} fichiers, multi-racines {len(multi.files)}")
+                return True
+            else:
+                print(f"   ❌ Shards : fichiers={same}, stats={same_stats}, multi={multi_ok}, "
+                      f"liens={links_ok}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur shards : {e}")
+        return False
+
+
+def test_estimate():
+    """Test 24 : Estimation par échantillonnage avant le scan"""
+    print("\nTest 24 : Estimation...")
+    try:
+        from analyst_helper import FolderScanner
+        from analyst_helper.core.estimator import ScanProgress, TreeEstimator
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Arborescence régulière : l'estimation doit être exacte
+            for a in range(4):
+                for b in range(3):
+                    folder = Path(tmpdir) / f"dossier_{a}" / f"sous_dossier_{b}"
+                    folder.mkdir(parents=True)
+                    for i in range(5):
+                        extension = '.pdf' if i < 4 else '.msg'
+                        (folder / f"doc_{i}{extension}").write_bytes(b"x" * 1024)
+
+            scanner = FolderScanner(tmpdir)
+            estimation = scanner.estimate(probes=20, seed=1)
+            exact = estimation.files.value == 60 and estimation.folders.value == 16 \
+                and estimation.files.low == estimation.files.high \
+                and abs(estimation.extension_share()['.pdf'] - 0.8) < 1e-9
+
+            # Budget de lectures épuisé : seules les descentes complètes comptent
+            limited = TreeEstimator(scanner, probes=50, max_reads=4, seed=1).run()
+            exact = exact and limited.files.value == 60 and limited.folders.value == 16 \
+                and limited.directories_read <= 6
+
+            # Le scan réutilise l'estimation pour l'avancement
+            files = scanner.scan(progress=True)
+
+            reports = []
+            tracker = ScanProgress(1000, lambda done, expected, eta: reports.append((done, eta)),
+                                   interval=0)
+            tracker.advance(300)
+
+            if exact and len(files) == 60 and scanner.estimation is estimation \
+                    and reports and reports[0][0] == 300 and reports[0][1] > 0:
+                print(f"   ✅ Estimation OK - {estimation.files} fichiers, "
+                      f"{estimation.directories_read} dossiers lus")
+                return True
+            else:
+                print(f"   ❌ Estimation : {estimation}, rapports={reports}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur estimation : {e}")
+        return False
+
+
+def test_loops_and_hard_links():
+    """Test 25 : Parcours itératif, boucles et liens physiques"""
+    print("\nTest 25 : Boucles et liens physiques...")
+    try:
+        import sys
+        from analyst_helper import FolderScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir) / "racine"
+            (root / "a" / "b").mkdir(parents=True)
+            (root / "a" / "b" / "plan.pdf").write_bytes(b"x" * 1024 * 1024)
+            os.link(root / "a" / "b" / "plan.pdf", root / "a" / "copie_plan.pdf")
+            # Boucle : a/b/retour -> a
+            os.symlink(root / "a", root / "a" / "b" / "retour")
+
+            # Arborescence plus profonde que la limite de récursion de Python
+            deep = root / "profond"
+            deep_levels = sys.getrecursionlimit() + 100
+            current = str(deep)
+            os.mkdir(current)
+            for _ in range(deep_levels):
+                current = os.path.join(current, "d")
+                os.mkdir(current)
+            Path(current, "fond.txt").write_text("fond")
+
+            scanner = FolderScanner(str(root), max_depth=deep_levels + 10)
+            files = scanner.scan()
+            names = sorted(f.name for f in files)
+            stats = scanner.stats
+
+            parallel = FolderScanner(str(root), max_depth=deep_levels + 10)
+            parallel_files = parallel.scan(workers=2)
+
+            # Dossier atteint par deux chemins : en parallèle, le chemin retenu est
+            # celui du parcours séquentiel, quel que soit le thread arrivé en premier
+            aliases = Path(tmpdir) / "alias"
+            for i in range(6):
+                folder = aliases / f"lot_{i}" / "cible"
+                folder.mkdir(parents=True)
+                for j in range(20 * i):
+                    (folder.parent / f"note_{j}.txt").write_text("n")
+                (folder / "doc.pdf").write_text("doc")
+                os.symlink(folder, aliases / f"lien_{i}")
+            expected = [f.relative_path for f in FolderScanner(str(aliases)).scan()]
+            deterministic = all(
+                [f.relative_path for f in FolderScanner(str(aliases)).scan(workers=4)] == expected
+                for _ in range(5))
+
+            # shutil.rmtree est récursif : l'arborescence profonde est supprimée à la main
+            os.remove(os.path.join(current, "fond.txt"))
+            while current != str(root):
+                os.rmdir(current)
+                current = os.path.dirname(current)
+
+            if names == ['copie_plan.pdf', 'fond.txt', 'plan.pdf'] \
+                    and stats['skipped_loops'] == 1 \
+                    and abs(stats['total_size_mb'] - 2.0) < 0.01 \
+                    and abs(stats['unique_size_mb'] - 1.0) < 0.01 \
+                    and sorted(f.name for f in parallel_files) == names \
+                    and parallel.stats['skipped_loops'] == 1 and deterministic:
+                print(f"   ✅ Parcours OK - boucle ignorée, {stats['unique_size_mb']:.1f} MB uniques "
+                      f"sur {stats['total_size_mb']:.1f} MB, {deep_levels} niveaux")
+                return True
+            else:
+                print(f"   ❌ Parcours : fichiers={names}, stats={stats}, "
+                      f"alias déterministes={deterministic}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur parcours : {e}")
+        return False
+
+
+def test_parallel_copy():
+    """Test 26 : Copie parallèle dans classify_all"""
+    print("\nTest 26 : Copie parallèle...")
+    try:
+        from analyst_helper import FolderScanner, FileClassifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "source"
+            for i in range(6):
+                folder = source / f"dossier_{i}"
+                folder.mkdir(parents=True)
+                # Mêmes noms dans chaque dossier : destinations à dédoublonner
+                for j in range(10):
+                    (folder / f"doc_{j}.pdf").write_text(f"{i}-{j}")
+                (folder / "courrier.msg").write_bytes(b"m" * 100)
+            (source / "gros.dwg").write_bytes(b"g" * (9 * 1024 * 1024))
+
+            files = FolderScanner(str(source)).scan()
+            sequential = FileClassifier(str(Path(tmpdir) / "sequentiel"))
+            expected = sequential.classify_all(files, show_progress=False)
+
+            classifier = FileClassifier(str(Path(tmpdir) / "parallele"))
+            results = classifier.classify_all(files, show_progress=False, workers=4,
+                                              max_bytes_in_flight=1024 * 1024)
+
+            contents_ok = all(Path(dest).read_bytes() == Path(src).read_bytes()
+                              for src, dest in results.items())
+            unique = len(set(results.values())) == len(results)
+            same_stats = all(classifier.stats[key] == sequential.stats[key] for key in
+                             ('total_copied', 'total_size_mb', 'by_category', 'errors', 'copy_bytes'))
+
+            if len(results) == len(expected) == 67 and contents_ok and unique and same_stats:
+                print(f"   ✅ Copie parallèle OK - {len(results)} fichiers, "
+                      f"{classifier.stats['total_size_mb']:.1f} MB")
+                return True
+            else:
+                print(f"   ❌ Copie parallèle : {len(results)}/{len(expected)} fichiers, "
+                      f"contenu={contents_ok}, uniques={unique}, stats={classifier.stats}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur copie parallèle : {e}")
+        return False
+
+
+def test_file_transfer():
+    """Test 27 : Transfert par le noyau (clone, copy_file_range, sendfile)"""
+    print("\nTest 27 : Transfert de fichiers...")
+    try:
+        from analyst_helper import FolderScanner, FileClassifier
+        from analyst_helper.core.transfer import FileTransfer, available_methods
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "source.dwg"
+            source.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+            os.utime(source, (1_600_000_000, 1_600_000_000))
+
+            copies_ok = True
+            for method in available_methods():
+                # Chaque méthode, avec la copie en espace utilisateur en dernier recours
+                transfer = FileTransfer([method, 'buffer'])
+                destination = Path(tmpdir) / f"copie_{method}.dwg"
+                used = transfer.copy(str(source), str(destination))
+                copies_ok &= used in (method, 'buffer') \
+                    and destination.read_bytes() == source.read_bytes() \
+                    and destination.stat().st_mtime == source.stat().st_mtime \
+                    and transfer.method_for(str(source), tmpdir) == used
+
+            classifier = FileClassifier(str(Path(tmpdir) / "sortie"))
+            classifier.classify_all(FolderScanner(str(source.parent)).scan(), show_progress=False)
+            stats = classifier.stats
+
+            if copies_ok and sum(stats['copy_methods'].values()) == stats['total_copied'] \
+                    and stats['copy_bytes'] > 0 and stats['copy_mb_per_s'] > 0:
+                print(f"   ✅ Transfert OK - méthodes {', '.join(available_methods())}, "
+                      f"classement : {stats['copy_methods']}")
+                return True
+            else:
+                print(f"   ❌ Transfert : copies={copies_ok}, stats={stats}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur transfert : {e}")
+        return False
+
+
+def test_classification_modes():
+    """Test 28 : Classement par liens physiques, liens symboliques ou déplacement"""
+    print("\nTest 28 : Modes de classement...")
+    try:
+        from analyst_helper import FolderScanner, FileClassifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "source"
+            source.mkdir()
+            (source / "plan.pdf").write_bytes(b"p" * 2048)
+            (source / "courrier.msg").write_bytes(b"m" * 512)
+            files = FolderScanner(str(source)).scan()
+
+            linked = FileClassifier(str(Path(tmpdir) / "liens"))
+            hard = linked.classify_all(files, show_progress=False, mode='hardlink')
+            hard_ok = all(os.path.samefile(src, dest) for src, dest in hard.items()) \
+                and linked.stats['copy_methods'] == {'hardlink': 2} and linked.stats['copy_bytes'] == 0
+
+            symbolic = FileClassifier(str(Path(tmpdir) / "symboliques"))
+            sym = symbolic.classify_all(files, show_progress=False, mode='symlink')
+            sym_ok = all(os.path.islink(dest) and os.path.realpath(dest) == os.path.realpath(src)
+                         for src, dest in sym.items())
+
+            # Lien physique vers un autre système de fichiers : copie
+            cross_ok = True
+            shm = Path("/dev/shm")
+            if shm.is_dir() and os.access(shm, os.W_OK) and shm.stat().st_dev != source.stat().st_dev:
+                with tempfile.TemporaryDirectory(dir=str(shm)) as other:
+                    cross = FileClassifier(other)
+                    copied = cross.classify_all(files, show_progress=False, mode='hardlink')
+                    cross_ok = len(copied) == 2 and 'hardlink' not in cross.stats['copy_methods'] \
+                        and all(not os.path.samefile(src, dest) for src, dest in copied.items())
+
+            mover = FileClassifier(str(Path(tmpdir) / "deplaces"))
+            moved = mover.classify_all(files, show_progress=False, mode='move')
+            move_ok = mover.stats['copy_methods'] == {'rename': 2} \
+                and all(not os.path.exists(src) and os.path.isfile(dest) for src, dest in moved.items())
+
+            if hard_ok and sym_ok and cross_ok and move_ok:
+                print("   ✅ Modes OK - liens physiques, symboliques, repli en copie, déplacement")
+                return True
+            else:
+                print(f"   ❌ Modes : hardlink={hard_ok}, symlink={sym_ok}, "
+                      f"autre système={cross_ok}, move={move_ok}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur modes de classement : {e}")
+        return False
+
+
+def test_name_registry():
+    """Test 29 : Registre des noms de destination"""
+    print("\nTest 29 : Registre des noms...")
+    try:
+        import threading
+        from analyst_helper import FolderScanner, FileClassifier, NameRegistry
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target = Path(tmpdir) / "sortie"
+            target.mkdir()
+            for name in ("scan.pdf", "scan_1.pdf", "scan_3.pdf"):
+                (target / name).write_text("existant")
+
+            registry = NameRegistry()
+            allocated = [registry.allocate(target / "scan.pdf").name for _ in range(3)]
+            sequence_ok = allocated == ["scan_2.pdf", "scan_4.pdf", "scan_5.pdf"] \
+                and registry.allocate(target / "autre.pdf").name == "autre.pdf"
+
+            # Attributions concurrentes : aucun doublon
+            names = []
+
+            def allocate_many():
+                for _ in range(200):
+                    names.append(registry.allocate(target / "image001.jpg"))
+
+            threads = [threading.Thread(target=allocate_many) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            threads_ok = len(set(names)) == 800
+
+            # Un même dossier désigné par un chemin relatif puis absolu
+            cwd = os.getcwd()
+            os.chdir(tmpdir)
+            try:
+                relative = registry.allocate(Path("sortie") / "rapport.pdf")
+                absolute = registry.allocate(target / "rapport.pdf")
+            finally:
+                os.chdir(cwd)
+            alias_ok = relative.name == "rapport.pdf" and absolute.name == "rapport_1.pdf"
+
+            # Classement parallèle de fichiers homonymes
+            source = Path(tmpdir) / "source"
+            for i in range(30):
+                folder = source / f"dossier_{i}"
+                folder.mkdir(parents=True)
+                (folder / "scan.pdf").write_text(str(i))
+            files = FolderScanner(str(source)).scan()
+            classifier = FileClassifier(str(Path(tmpdir) / "classes"), names=registry)
+            results = classifier.classify_all(files, show_progress=False, workers=4)
+            classify_ok = len(set(results.values())) == 30 and \
+                all(Path(dest).read_text() == Path(src).read_text() for src, dest in results.items())
+
+            if sequence_ok and threads_ok and alias_ok and classify_ok:
+                print(f"   ✅ Registre OK - {allocated}, {len(names)} noms concurrents")
+                return True
+            else:
+                print(f"   ❌ Registre : suite={allocated}, threads={threads_ok}, "
+                      f"chemins={alias_ok}, classement={classify_ok}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur registre des noms : {e}")
+        return False
+
+
+def test_resumable_classification():
+    """Test 30 : Reprise d'un classement interrompu"""
+    print("\nTest 30 : Reprise d'un classement...")
+    try:
+        from analyst_helper import FolderScanner, FileClassifier
+        from analyst_helper.core.journal import JOURNAL_NAME
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "source"
+            for i in range(20):
+                folder = source / f"dossier_{i % 4}"
+                folder.mkdir(parents=True, exist_ok=True)
+                (folder / f"doc{i}.pdf").write_text(f"contenu {i}")
+            files = FolderScanner(str(source)).scan()
+            output = Path(tmpdir) / "classes"
+
+            # Premier classement arrêté brutalement après 8 fichiers
+            classifier = FileClassifier(str(output))
+            transfer = classifier.transfer.transfer
+            calls = []
+
+            def interrupted(*args, **kwargs):
+                if len(calls) == 8:
+                    raise KeyboardInterrupt
+                calls.append(args[0])
+                return transfer(*args, **kwargs)
+
+            classifier.transfer.transfer = interrupted
+            try:
+                classifier.classify_all(files, show_progress=False, resume=True)
+            except KeyboardInterrupt:
+                pass
+
+            journal = output / JOURNAL_NAME
+            with open(journal, 'a', encoding='utf-8') as f:
+                f.write('{"op": "plan", "source": "tronq')
+            # Une source déjà copiée est modifiée avant la reprise
+            Path(calls[0]).write_text("contenu modifié, plus long")
+            files = FolderScanner(str(source)).scan()
+
+            classifier = FileClassifier(str(output))
+            results = classifier.classify_all(files, show_progress=False, workers=4, resume=True)
+
+            report = classifier.get_report()
+            copied = [p for p in output.rglob("*") if p.is_file() and p.name != JOURNAL_NAME]
+            resume_ok = classifier.stats['resumed'] == 7 and classifier.stats['total_copied'] == 13 \
+                and "(100.0%)" in report
+            unique_ok = len(copied) == 20 and not any("_" in p.stem or p.name.endswith(".partial")
+                                                     for p in copied)
+            content_ok = len(results) == 20 and \
+                all(Path(dest).read_text() == Path(src).read_text() for src, dest in results.items())
+
+            # Copie prévue mais pas faite, homonyme nouveau classé avant elle
+            from analyst_helper.core.journal import CopyJournal
+            for name in ("a", "b"):
+                (Path(tmpdir) / name).mkdir()
+                (Path(tmpdir) / name / "scan.pdf").write_text(f"scan {name}")
+            planned, newcomer = FolderScanner(str(Path(tmpdir) / "a")).scan()[0], \
+                FolderScanner(str(Path(tmpdir) / "b")).scan()[0]
+            output2 = Path(tmpdir) / "classes2"
+            with CopyJournal(output2 / JOURNAL_NAME) as journal:
+                journal.plan(planned.path, str(output2 / "Dossier technique" / "scan.pdf"),
+                             planned.size_bytes, planned.modified_ts)
+            homonyms = FileClassifier(str(output2)).classify_all(
+                [newcomer, planned], show_progress=False, resume=True)
+            collision_ok = len(set(homonyms.values())) == 2 and \
+                all(Path(dest).read_text() == Path(src).read_text() for src, dest in homonyms.items())
+
+            # Déplacement terminé avant l'arrêt : la source n'existe plus
+            (Path(tmpdir) / "c").mkdir()
+            (Path(tmpdir) / "c" / "plan.pdf").write_text("plan")
+            moved = FolderScanner(str(Path(tmpdir) / "c")).scan()
+            output3 = Path(tmpdir) / "classes3"
+            FileClassifier(str(output3)).classify_all(moved, show_progress=False, mode='move',
+                                                      resume=True)
+            mover = FileClassifier(str(output3))
+            mover.classify_all(moved, show_progress=False, mode='move', resume=True)
+            move_ok = mover.stats['resumed'] == 1 and mover.stats['errors'] == 0
+
+            if resume_ok and unique_ok and content_ok and collision_ok and move_ok:
+                print(f"   ✅ Reprise OK - {classifier.stats['resumed']} déjà classés, "
+                      f"{classifier.stats['total_copied']} copiés")
+                return True
+            else:
+                print(f"   ❌ Reprise : stats={classifier.stats['resumed']}/"
+                      f"{classifier.stats['total_copied']}, fichiers={len(copied)}, "
+                      f"contenu={content_ok}, homonymes={collision_ok}, déplacement={move_ok}")
+                return False
+
+    except Exception as e:
+        print(f"   ❌ Erreur reprise du classement : {e}")
+        return False
+
+
 def main():
     """Exécute tous les tests"""
     print("=" * 60)
@@ -137,6 +1327,31 @@ def main():
     results.append(("Classificateur", test_classifier()))
     results.append(("Reporter", test_reporter()))
     results.append(("Extracteur", test_extractor()))
+    results.append(("Scan parallèle", test_parallel_scan()))
+    results.append(("Scan en flux", test_iter_scan()))
+    results.append(("Rescan incrémental", test_rescan()))
+    results.append(("Doublons", test_duplicates()))
+    results.append(("Table en colonnes", test_file_table()))
+    results.append(("Exports en flux", test_stream_exporters()))
+    results.append(("Snapshot binaire", test_snapshot()))
+    results.append(("Index des dossiers", test_directory_index()))
+    results.append(("Règles d'exclusion", test_ignore_rules()))
+    results.append(("Détection du type", test_content_sniffing()))
+    results.append(("Contenu des archives", test_archive_listing()))
+    results.append(("Surveillance en continu", test_watch()))
+    results.append(("Profilage", test_profiler()))
+    results.append(("Scan léger", test_light_scan()))
+    results.append(("Filtres de sélection", test_scan_filters()))
+    results.append(("Index de requêtes", test_file_index()))
+    results.append(("Catalogue SQLite", test_catalog()))
+    results.append(("Scan en shards", test_sharded_scan()))
+    results.append(("Estimation", test_estimate()))
+    results.append(("Boucles et liens physiques", test_loops_and_hard_links()))
+    results.append(("Copie parallèle", test_parallel_copy()))
+    results.append(("Transfert de fichiers", test_file_transfer()))
+    results.append(("Modes de classement", test_classification_modes()))
+    results.append(("Registre des noms", test_name_registry()))
+    results.append(("Reprise du classement", test_resumable_classification()))
 
     # Résumé
     print("\n" + "=" * 60)